@@ -0,0 +1,4 @@
+"""Reproducible throughput benchmarks for the Voicebrief pipeline.
+
+Run with ``python -m benchmarks --help``.
+"""
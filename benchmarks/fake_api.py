@@ -0,0 +1,213 @@
+"""Local OpenAI-compatible stub server for benchmarks and offline tests.
+
+Implements just enough of ``/v1/audio/transcriptions`` and
+``/v1/chat/completions`` for Voicebrief, with configurable latency and
+failure rate. Responses are deterministic for a given seed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+_WORDS = (
+    "the quarterly numbers look good and we agree to ship the release next week "
+    "after the review of open issues with the platform team"
+).split()
+
+
+@dataclass
+class FakeApiConfig:
+    """Behaviour of the stub server."""
+
+    latency_seconds: float = 0.0
+    latency_per_mb: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    bytes_per_word: int = 6400
+    seed: int = 0
+
+
+@dataclass
+class FakeApiStats:
+    """Counters updated by the stub server."""
+
+    requests: int = 0
+    failures: int = 0
+    bytes_received: int = 0
+    by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "bytes_received": self.bytes_received,
+            "by_endpoint": dict(self.by_endpoint),
+        }
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server speaking a subset of the OpenAI REST API."""
+
+    def __init__(self, config: Optional[FakeApiConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeApiConfig()
+        self.stats = FakeApiStats()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-openai", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def _account(self, endpoint: str, size: int) -> tuple[float, bool]:
+        """Record a request and decide its latency and whether it fails."""
+        config = self.config
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bytes_received += size
+            self.stats.by_endpoint[endpoint] = self.stats.by_endpoint.get(endpoint, 0) + 1
+            jitter = 1 + self._random.uniform(-config.jitter, config.jitter) if config.jitter else 1
+            fail = self._random.random() < config.failure_rate
+            if fail:
+                self.stats.failures += 1
+        delay = (config.latency_seconds + config.latency_per_mb * size / (1024 * 1024)) * jitter
+        return max(0.0, delay), fail
+
+    def transcript_text(self, size: int) -> str:
+        words = max(1, size // max(1, self.config.bytes_per_word))
+        return " ".join(_WORDS[i % len(_WORDS)] for i in range(words))
+
+
+def _make_handler(server: FakeOpenAIServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            pass
+
+        def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+            length = int(self.headers.get("Content-Length", "0"))
+            body = self.rfile.read(length)
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path.endswith("/audio/transcriptions"):
+                endpoint = "transcriptions"
+            elif path.endswith("/chat/completions"):
+                endpoint = "chat"
+            else:
+                self._send(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+                return
+
+            delay, fail = server._account(endpoint, length)
+            if delay:
+                time.sleep(delay)
+            if fail:
+                self._send(500, {"error": {"message": "Injected failure", "type": "server_error"}})
+                return
+
+            if endpoint == "transcriptions":
+                self._send(200, {"text": server.transcript_text(length)})
+            else:
+                self._send(200, _chat_response(json.loads(body or b"{}")))
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def _chat_response(request: Dict[str, Any]) -> Dict[str, Any]:
+    messages = request.get("messages", [])
+    prompt = " ".join(str(message.get("content", "")) for message in messages)
+    user_text = next(
+        (str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), ""
+    )
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(user_text) // 4)
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "fake"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": user_text},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the fake OpenAI-compatible server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed latency per request (s)")
+    parser.add_argument("--latency-per-mb", type=float, default=0.0, help="Extra latency per uploaded MB (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative latency jitter (0-1)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeApiConfig(
+        latency_seconds=args.latency,
+        latency_per_mb=args.latency_per_mb,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    server = FakeOpenAIServer(config, args.host, args.port)
+    print(f"Fake OpenAI API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Synthetic audio/video generation with ffmpeg ``lavfi`` sources."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+
+def generate_media(
+    path: Path,
+    seconds: float,
+    video: bool = False,
+    audio_bitrate: str = "128k",
+    sample_rate: int = 44100,
+) -> Path:
+    """Create a deterministic test recording of ``seconds`` length at ``path``.
+
+    Audio is a tone modulated with pink noise so the encoder does real work.
+    With ``video=True`` a small test pattern is muxed in (use a video
+    extension such as ``.mp4``). Existing files are reused.
+    """
+    path = Path(path)
+    if path.exists() and path.stat().st_size > 0:
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    audio_source = (
+        f"sine=frequency=220:sample_rate={sample_rate}:duration={seconds}[tone];"
+        f"anoisesrc=color=pink:amplitude=0.05:sample_rate={sample_rate}:duration={seconds}:seed=42[noise];"
+        "[tone][noise]amix=inputs=2:duration=shortest[aout]"
+    )
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+    if video:
+        command += [
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size=320x240:rate=10:duration={seconds}",
+        ]
+    command += ["-filter_complex", audio_source]
+    if video:
+        command += ["-map", "0:v", "-map", "[aout]", "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac"]
+    else:
+        command += ["-map", "[aout]"]
+    command += ["-ac", "1", "-b:a", audio_bitrate, "-t", str(seconds), str(path)]
+
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to generate {path}: {result.stderr.strip()}")
+    return path
@@ -0,0 +1,305 @@
+"""Benchmark runner: synthetic media -> ``run_voicebrief`` -> fake API.
+
+Each scenario runs in a fresh child process so peak RSS is measured per
+scenario. Disk usage counts the outputs plus the peak size of the run's
+scratch workspace, which is placed in the scenario's work directory and
+removed when the run ends. Results can be saved as a baseline and compared
+against later; baselines are machine-specific and not committed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_api import FakeApiConfig, FakeOpenAIServer
+from benchmarks.media import generate_media
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+# Result keys where a higher value is a regression.
+_COMPARED_METRICS = ("wall_seconds", "peak_rss_mb", "disk_bytes")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One benchmark configuration."""
+
+    seconds: int
+    video: bool = False
+    optimized: bool = False
+    markdown: bool = False
+    speed: float = 1.0
+
+    @property
+    def name(self) -> str:
+        name = f"{'video' if self.video else 'audio'}-{self.seconds}s"
+        if self.speed != 1.0:
+            name += f"-x{self.speed:g}"
+        if self.optimized:
+            name += "-opt"
+        if self.markdown:
+            name += "-md"
+        return name
+
+
+def _peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _directory_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+class _PeakDirectorySize:
+    """Sample the size of a directory on a background thread and keep the maximum."""
+
+    def __init__(self, path: Path, interval_seconds: float = 0.05):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="bench-disk-sampler", daemon=True)
+
+    def _sample(self) -> None:
+        while True:
+            try:
+                self.peak = max(self.peak, _directory_bytes(self.path))
+            except OSError:  # files vanish while the run cleans up
+                pass
+            if self._stop.wait(self.interval_seconds):
+                return
+
+    def __enter__(self) -> "_PeakDirectorySize":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _run_scenario_in_child(scenario: Scenario, media_path: str, work_dir: str, base_url: str) -> Dict[str, Any]:
+    """Executed in a child process: run the pipeline and collect figures."""
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    from voicebrief.app import run_voicebrief
+    from voicebrief.logging_utils import configure_logging
+    from voicebrief.workspace import WorkspaceConfig
+
+    configure_logging(os.environ.get("VOICEBRIEF_LOG_LEVEL", "WARNING"))
+
+    work = Path(work_dir)
+    source = work / Path(media_path).name
+    shutil.copy2(media_path, source)
+    output = work / "out"
+    scratch = work / "scratch"
+    scratch.mkdir()
+
+    start = time.perf_counter()
+    with _PeakDirectorySize(scratch) as scratch_usage:
+        result = run_voicebrief(
+            source,
+            destination=output,
+            generate_optimized=scenario.optimized,
+            generate_markdown=scenario.markdown,
+            speed=scenario.speed,
+            workspace=WorkspaceConfig(root=scratch),
+        )
+    wall = time.perf_counter() - start
+    metrics = result.metrics
+
+    return {
+        "scenario": scenario.name,
+        "wall_seconds": wall,
+        "audio_seconds": metrics.audio_seconds,
+        "speed": scenario.speed,
+        "processed_audio_seconds": metrics.processed_audio_seconds,
+        "realtime_factor": (metrics.audio_seconds / wall) if metrics.audio_seconds else None,
+        "chunks": len(result.transcripts),
+        "bytes_uploaded": metrics.bytes_uploaded,
+        "tokens_in": metrics.tokens_in,
+        "tokens_out": metrics.tokens_out,
+        "stages": {stage.name: round(stage.seconds, 4) for stage in metrics.stages},
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_child_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "output_bytes": _directory_bytes(output),
+        "scratch_peak_bytes": scratch_usage.peak,
+        "disk_bytes": _directory_bytes(output) + scratch_usage.peak,
+    }
+
+
+def run_benchmarks(
+    scenarios: List[Scenario],
+    work_root: Path,
+    api_config: FakeApiConfig,
+    repeat: int = 1,
+) -> List[Dict[str, Any]]:
+    """Run every scenario ``repeat`` times and return the best run of each."""
+    media_dir = work_root / "media"
+    results: List[Dict[str, Any]] = []
+    context = multiprocessing.get_context("spawn")
+
+    with FakeOpenAIServer(api_config) as server:
+        for scenario in scenarios:
+            suffix = ".mp4" if scenario.video else ".mp3"
+            media = generate_media(
+                media_dir / f"synthetic_{scenario.seconds}s{suffix}", scenario.seconds, scenario.video
+            )
+            runs = []
+            for attempt in range(repeat):
+                work_dir = work_root / "runs" / f"{scenario.name}-{attempt}"
+                shutil.rmtree(work_dir, ignore_errors=True)
+                work_dir.mkdir(parents=True)
+                before = server.stats.to_dict()
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    run = pool.submit(
+                        _run_scenario_in_child, scenario, str(media), str(work_dir), server.base_url
+                    ).result()
+                after = server.stats.to_dict()
+                run["api_requests"] = after["requests"] - before["requests"]
+                run["api_failures"] = after["failures"] - before["failures"]
+                runs.append(run)
+            best = min(runs, key=lambda r: r["wall_seconds"])
+            best["runs"] = len(runs)
+            results.append(best)
+    return results
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Return human-readable regressions beyond ``tolerance`` (relative)."""
+    regressions = []
+    previous = baseline.get("results", {})
+    for result in results:
+        reference = previous.get(result["scenario"])
+        if not reference:
+            continue
+        for key in _COMPARED_METRICS:
+            old, new = reference.get(key), result.get(key)
+            if not old or new is None:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{result['scenario']}: {key} {new:.3f} vs baseline {old:.3f} (+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _format_table(results: List[Dict[str, Any]]) -> str:
+    header = (
+        f"{'scenario':<24}{'wall s':>9}{'audio s':>9}{'RTF':>8}{'chunks':>8}"
+        f"{'up MB':>8}{'RSS MB':>9}{'disk MB':>9}{'req':>6}{'fail':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        rtf = f"{r['realtime_factor']:.1f}" if r["realtime_factor"] else "-"
+        audio = f"{r['audio_seconds']:.0f}" if r["audio_seconds"] else "-"
+        lines.append(
+            f"{r['scenario']:<24}{r['wall_seconds']:>9.2f}{audio:>9}{rtf:>8}{r['chunks']:>8}"
+            f"{r['bytes_uploaded'] / 1e6:>8.1f}{r['peak_rss_mb']:>9.1f}{r['disk_bytes'] / 1e6:>9.1f}"
+            f"{r['api_requests']:>6}{r['api_failures']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the Voicebrief pipeline against a local fake OpenAI API.",
+    )
+    parser.add_argument(
+        "--durations", type=int, nargs="+", default=[60, 600], help="Recording lengths in seconds"
+    )
+    parser.add_argument("--video", action="store_true", help="Use synthetic video (exercises extraction)")
+    parser.add_argument("--optimized", action="store_true", help="Also run the optimize post-processing step")
+    parser.add_argument("--markdown", action="store_true", help="Also run the markdown post-processing step")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        nargs="+",
+        default=[1.0],
+        help="Tempo factors to benchmark, e.g. --speed 1.0 1.25 1.5 (default: 1.0)",
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API latency per request (s)")
+    parser.add_argument("--latency-per-mb", type=float, default=0.2, help="Extra fake latency per uploaded MB (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Relative latency jitter (0-1)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of fake API requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the fastest is reported")
+    parser.add_argument("--workdir", type=str, default=None, help="Working directory (default: ./.bench)")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help=f"Baseline JSON file; it must exist unless --save-baseline is given (default: {DEFAULT_BASELINE}, "
+        "where a missing file skips the comparison)",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression (default 0.15)")
+    args = parser.parse_args(argv)
+    baseline_path = Path(args.baseline) if args.baseline else DEFAULT_BASELINE
+    if args.baseline and not args.save_baseline and not baseline_path.exists():
+        parser.error(f"baseline file not found: {baseline_path}")
+
+    work_root = Path(args.workdir or ".bench").resolve()
+    scenarios = [
+        Scenario(seconds, video=args.video, optimized=args.optimized, markdown=args.markdown, speed=speed)
+        for seconds in args.durations
+        for speed in args.speed
+    ]
+    api_config = FakeApiConfig(
+        latency_seconds=args.latency,
+        latency_per_mb=args.latency_per_mb,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    results = run_benchmarks(scenarios, work_root, api_config, repeat=args.repeat)
+    print(_format_table(results))
+
+    document = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "api": asdict(api_config),
+        "results": {r["scenario"]: r for r in results},
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(
+            f"Regression check skipped: no baseline at {baseline_path}. "
+            "Record one on this machine with --save-baseline."
+        )
+        return 0
+
+    regressions = compare_to_baseline(
+        results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance
+    )
+    if regressions:
+        print("Regressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%}).")
+    return 0
@@ -1,5 +1,6 @@
 from pathlib import Path
 import logging
+import subprocess
 
 import pytest
 
@@ -43,7 +44,7 @@ def test_resplit_oversized_chunks_only_reprocesses_large_files(
 
     calls: list[Path] = []
 
-    def fake_partition(path: Path, max_chunk_size_bytes: int):
+    def fake_partition(path: Path, max_chunk_size_bytes: int, cancel_token=None):
         calls.append(path)
         assert max_chunk_size_bytes == 20
         return [part_a, part_b]
@@ -58,3 +59,57 @@ def test_resplit_oversized_chunks_only_reprocesses_large_files(
 
     assert result == [small, part_a, part_b]
     assert calls == [large]
+
+
+def test_plan_segments_covers_the_duration():
+    assert audio.plan_segments(25.0, 10.0) == [(0.0, 10.0), (10.0, 10.0), (20.0, 5.0)]
+    assert audio.plan_segments(20.0, 10.0) == [(0.0, 10.0), (10.0, 10.0)]
+
+
+def test_partition_by_ranges_encodes_each_range_in_its_own_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source = tmp_path / "talk.wav"
+    source.write_bytes(b"x")
+    commands: list[list[str]] = []
+
+    def fake_run_process(command, text=False, cancel_token=None):
+        commands.append(command)
+        Path(command[-1]).write_bytes(b"mp3")
+        return subprocess.CompletedProcess(command, 0, b"", b"")
+
+    monkeypatch.setattr(audio, "run_process", fake_run_process)
+
+    # 1 MB limit at 128 kbit/s with the 0.85 safety factor -> 55 s ranges
+    chunks = audio.partition_by_ranges(source, 120.0, max_chunk_size_mb=1, output_dir=tmp_path / "out", workers=3)
+
+    assert [(c.path.name, c.start, c.duration) for c in chunks] == [
+        ("talk_000.mp3", 0.0, 55.0),
+        ("talk_001.mp3", 55.0, 55.0),
+        ("talk_002.mp3", 110.0, 10.0),
+    ]
+    seeks = sorted((c[c.index("-ss") + 1], c[c.index("-t") + 1]) for c in commands)
+    assert seeks == [("0.000", "55.000"), ("110.000", "10.000"), ("55.000", "55.000")]
+
+
+def test_partition_by_ranges_removes_chunks_when_a_range_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source = tmp_path / "talk.wav"
+    source.write_bytes(b"x")
+
+    def fake_run_process(command, text=False, cancel_token=None):
+        Path(command[-1]).write_bytes(b"mp3")
+        code = 1 if command[-1].endswith("_001.mp3") else 0
+        return subprocess.CompletedProcess(command, code, b"", b"decoder error")
+
+    monkeypatch.setattr(audio, "run_process", fake_run_process)
+
+    with pytest.raises(RuntimeError, match="decoder error"):
+        audio.partition_by_ranges(source, 120.0, max_chunk_size_mb=1, workers=2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["talk.wav"]
+
+
+def test_plan_segments_with_overlap_extend_all_but_the_last_range():
+    assert audio.plan_segments(25.0, 10.0, overlap_seconds=2.0) == [(0.0, 12.0), (10.0, 12.0), (20.0, 5.0)]
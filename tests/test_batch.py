@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from voicebrief import gptapi
+from voicebrief.batch import LocalBatchBackend, discover_transcripts, load_groups, run_bulk
+
+
+class WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def offline_chat(monkeypatch):
+    monkeypatch.setattr(gptapi, "_get_model", lambda: "test-model")
+    monkeypatch.setattr(gptapi, "_get_encoding", lambda model: WordEncoding())
+
+
+def test_discover_groups_chunk_transcripts_by_recording(tmp_path: Path):
+    for name in ("transcription_a_001.txt", "transcription_a_000.txt", "transcription_a.txt", "transcription_b.txt"):
+        (tmp_path / name).write_text("x")
+    (tmp_path / "optimized_transcription_b.txt").write_text("x")
+
+    groups = discover_transcripts([tmp_path])
+
+    assert [[p.name for p in group] for group in groups] == [
+        ["transcription_a_000.txt", "transcription_a_001.txt"],
+        ["transcription_b.txt"],
+    ]
+
+
+def test_discover_keeps_recordings_named_like_chunks_apart(tmp_path: Path):
+    # meeting_001.mp3 and meeting_002.mp3 were each transcribed in one chunk.
+    for name in ("transcription_meeting_001.txt", "transcription_meeting_002.txt"):
+        (tmp_path / name).write_text("x")
+
+    groups = discover_transcripts([tmp_path])
+
+    assert [[p.name for p in group] for group in groups] == [
+        ["transcription_meeting_001.txt"],
+        ["transcription_meeting_002.txt"],
+    ]
+
+
+def test_discover_groups_preprocessed_chunks_under_the_recording(tmp_path: Path):
+    for name in (
+        "transcription_talk_preprocessed_000.txt",
+        "transcription_talk_preprocessed_001.txt",
+        "transcription_talk.txt",
+    ):
+        (tmp_path / name).write_text("x")
+
+    groups = discover_transcripts([tmp_path])
+
+    assert [[p.name for p in group] for group in groups] == [
+        ["transcription_talk_preprocessed_000.txt", "transcription_talk_preprocessed_001.txt"],
+    ]
+
+
+def test_bulk_writes_the_usual_outputs_from_one_batch(offline_chat, tmp_path: Path):
+    words = " ".join(["word"] * 3000)
+    chunks = [tmp_path / f"transcription_talk_{i:03d}.txt" for i in range(2)]
+    for chunk in chunks:
+        chunk.write_text(words)
+    other = tmp_path / "transcription_other.txt"
+    other.write_text("short talk")
+    replies = []
+
+    def respond(system_prompt, text, model):
+        replies.append(system_prompt)
+        return f"reply {len(replies)}"
+
+    result = run_bulk(
+        load_groups([chunks, [other]]),
+        ["optimize", "markdown", "summary"],
+        tmp_path / "work",
+        backend=LocalBatchBackend(respond),
+    )
+
+    assert result.status == "completed" and not result.failed
+    assert {p.name for p in result.written} == {
+        "optimized_transcription_talk_000.txt",
+        "full_md_transcription_talk_000.md",
+        "summary_transcription_talk_000.md",
+        "optimized_transcription_other.txt",
+        "full_md_transcription_other.md",
+        "summary_transcription_other.md",
+    }
+    # The two 3000-word chunks exceed one request, as in interactive mode.
+    assert (tmp_path / "optimized_transcription_talk_000.txt").read_text() == "reply 1\n\nreply 2"
+    requests = (tmp_path / "work" / "requests.jsonl").read_text().splitlines()
+    assert len(requests) == len(replies) == 8
+    assert json.loads(requests[0])["body"]["messages"][0]["content"] == gptapi.OPTIMIZE_PROMPT
+
+
+def test_bulk_resumes_from_the_manifest_and_refuses_a_finished_batch(offline_chat, tmp_path: Path):
+    transcript = tmp_path / "transcription_talk.txt"
+    transcript.write_text("hello there")
+
+    class SlowBackend(LocalBatchBackend):
+        name = "local"
+        checks = 0
+
+        def status(self, batch_id):
+            SlowBackend.checks += 1
+            return "in_progress" if SlowBackend.checks < 3 else super().status(batch_id)
+
+    with pytest.raises(TimeoutError):
+        run_bulk(load_groups([[transcript]]), ["summary"], tmp_path / "work", SlowBackend(), timeout_seconds=0)
+
+    result = run_bulk([], [], tmp_path / "work", SlowBackend(), poll_seconds=0)
+
+    assert result.written == [(tmp_path / "summary_transcription_talk.md").resolve()]
+    assert result.written[0].read_text() == "hello there"
+    with pytest.raises(ValueError):
+        run_bulk([], [], tmp_path / "work", SlowBackend())
@@ -0,0 +1,90 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_api import FakeApiConfig, FakeOpenAIServer
+from benchmarks.run import Scenario, _PeakDirectorySize, compare_to_baseline, main
+
+
+def _post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_fake_server_echoes_chat_and_counts_requests():
+    with FakeOpenAIServer() as server:
+        reply = _post(
+            server.base_url + "/chat/completions",
+            {"model": "gpt-4o", "messages": [{"role": "system", "content": "x"}, {"role": "user", "content": "hello"}]},
+        )
+
+    assert reply["choices"][0]["message"]["content"] == "hello"
+    assert reply["usage"]["completion_tokens"] >= 1
+    assert server.stats.requests == 1
+    assert server.stats.by_endpoint == {"chat": 1}
+
+
+def test_fake_server_injects_failures():
+    with FakeOpenAIServer(FakeApiConfig(failure_rate=1.0)) as server:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server.base_url + "/chat/completions", {"messages": []})
+
+    assert exc.value.code == 500
+    assert server.stats.failures == 1
+
+
+def test_speech_to_text_against_fake_server(monkeypatch, tmp_path: Path):
+    pytest.importorskip("openai")
+    from voicebrief import gptapi
+
+    audio = tmp_path / "clip.mp3"
+    audio.write_bytes(b"\0" * 20000)
+    with FakeOpenAIServer(FakeApiConfig(bytes_per_word=10000)) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        text = gptapi.speech_to_text(audio)
+
+    assert len(text.split()) == 2
+    assert server.stats.by_endpoint == {"transcriptions": 1}
+
+
+def test_compare_to_baseline_flags_only_regressions():
+    baseline = {"results": {"audio-60s": {"wall_seconds": 10.0, "peak_rss_mb": 100.0, "disk_bytes": 0}}}
+    results = [
+        {"scenario": "audio-60s", "wall_seconds": 12.5, "peak_rss_mb": 101.0, "disk_bytes": 10},
+        {"scenario": "audio-600s", "wall_seconds": 99.0, "peak_rss_mb": 1.0, "disk_bytes": 0},
+    ]
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("audio-60s: wall_seconds")
+
+
+def test_scenario_names_describe_configuration():
+    assert Scenario(60).name == "audio-60s"
+    assert Scenario(600, video=True, optimized=True, markdown=True).name == "video-600s-opt-md"
+
+
+def test_peak_directory_size_outlives_the_files(tmp_path: Path):
+    with _PeakDirectorySize(tmp_path, interval_seconds=0.01) as usage:
+        chunk = tmp_path / "chunk_000.mp3"
+        chunk.write_bytes(b"x" * 1000)
+        time.sleep(0.1)
+        chunk.unlink()
+
+    assert usage.peak == 1000
+
+
+def test_missing_explicit_baseline_is_an_error(tmp_path: Path, capsys):
+    with pytest.raises(SystemExit):
+        main(["--baseline", str(tmp_path / "missing.json")])
+
+    assert "baseline file not found" in capsys.readouterr().err
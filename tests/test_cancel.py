@@ -0,0 +1,105 @@
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from voicebrief import audio
+from voicebrief.cancel import CancellableReader, CancellationToken, ProcessingCancelled, call_cancellable
+from voicebrief.process import run_process
+
+
+def test_register_runs_callbacks_once_and_immediately_after_cancel():
+    token = CancellationToken()
+    calls: list[str] = []
+    token.register(lambda: calls.append("first"))
+    unregister = token.register(lambda: calls.append("removed"))
+    unregister()
+
+    token.cancel()
+    token.cancel()
+    token.register(lambda: calls.append("late"))
+
+    assert calls == ["first", "late"]
+    with pytest.raises(ProcessingCancelled):
+        token.raise_if_cancelled()
+
+
+def test_call_cancellable_returns_result_without_token():
+    assert call_cancellable(None, lambda x: x * 2, 21) == 42
+
+
+def test_call_cancellable_releases_caller_when_cancelled():
+    token = CancellationToken()
+    release = threading.Event()
+    threading.Timer(0.05, token.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(ProcessingCancelled):
+        call_cancellable(token, release.wait, 10)
+    release.set()
+
+    assert time.monotonic() - start < 5
+
+
+def test_call_cancellable_propagates_errors():
+    def boom() -> None:
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        call_cancellable(CancellationToken(), boom)
+
+
+def test_errors_of_a_cancelled_call_are_reported_as_cancellation():
+    token = CancellationToken()
+
+    def upload() -> None:
+        token.cancel()
+        raise ConnectionError("connection closed")
+
+    with pytest.raises(ProcessingCancelled):
+        call_cancellable(token, upload)
+
+
+def test_cancellable_reader_stops_reads_after_cancel(tmp_path: Path):
+    path = tmp_path / "chunk.mp3"
+    path.write_bytes(b"abcdef")
+    token = CancellationToken()
+
+    with path.open("rb") as raw:
+        reader = CancellableReader(raw, token)
+        assert reader.name == str(path)
+        assert reader.read(2) == b"ab"
+        reader.seek(0, io.SEEK_END)
+        assert reader.tell() == 6
+        token.cancel()
+        with pytest.raises(ProcessingCancelled):
+            reader.read(2)
+
+
+def test_run_process_kills_child_on_cancel():
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(ProcessingCancelled):
+        run_process([sys.executable, "-c", "import time; time.sleep(30)"], cancel_token=token)
+
+    assert time.monotonic() - start < 10
+
+
+def test_remove_chunk_files_keeps_source_and_removes_empty_chunk_dir(tmp_path: Path):
+    source = tmp_path / "talk.mp3"
+    source.write_bytes(b"x")
+    chunk_dir = tmp_path / "talk_chunks"
+    chunk_dir.mkdir()
+    chunks = [chunk_dir / "talk_000.mp3", chunk_dir / "talk_001.mp3"]
+    for chunk in chunks:
+        chunk.write_bytes(b"x")
+
+    audio.remove_chunk_files(chunks + [source], source)
+
+    assert source.exists()
+    assert not chunk_dir.exists()
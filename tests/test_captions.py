@@ -0,0 +1,84 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from voicebrief import app, gptapi
+from voicebrief.captions import (
+    Segment,
+    merge_chunk_segments,
+    read_sidecar,
+    remap_segments,
+    segments_from_response,
+    to_markdown,
+    to_srt,
+    to_vtt,
+    write_captions,
+    write_sidecar,
+)
+from voicebrief.data import Transcript
+from voicebrief.timeline import TimeMap
+
+
+def test_segments_from_response_reads_objects_and_dicts():
+    response = SimpleNamespace(
+        text="Hello there. Bye.",
+        segments=[
+            SimpleNamespace(start=0.0, end=1.5, text=" Hello there."),
+            {"start": 1.5, "end": 2.0, "text": "Bye."},
+        ],
+    )
+
+    assert segments_from_response(response) == [Segment(0.0, 1.5, "Hello there."), Segment(1.5, 2.0, "Bye.")]
+    assert segments_from_response(SimpleNamespace(text="plain")) is None
+
+
+def test_merge_offsets_chunks_and_drops_overlap_duplicates():
+    # Chunk 2 starts at 10s and repeats the last 2s of chunk 1; the cut is at 11s.
+    first = [Segment(0.0, 5.0, "a"), Segment(5.0, 10.5, "b"), Segment(10.5, 12.0, "c")]
+    second = [Segment(0.0, 0.5, "b"), Segment(0.5, 2.0, "c"), Segment(2.0, 4.0, "d")]
+
+    merged = merge_chunk_segments([(0.0, first), (10.0, second)], overlap_seconds=2.0)
+
+    assert [s.text for s in merged] == ["a", "b", "c", "d"]
+    assert merged[-2:] == [Segment(10.5, 12.0, "c"), Segment(12.0, 14.0, "d")]
+
+
+def test_remap_applies_the_time_map():
+    segments = [Segment(10.0, 20.0, "x")]
+
+    assert remap_segments(segments, TimeMap.tempo(2.0)) == [Segment(20.0, 40.0, "x")]
+    assert remap_segments(segments, TimeMap.identity()) == segments
+
+
+def test_sidecar_round_trip_and_caption_formats(tmp_path: Path):
+    segments = [Segment(0.0, 1.25, "Hello."), Segment(3661.5, 3663.0, "Later.")]
+    sidecar = write_sidecar(segments, tmp_path / "segments_talk.json", source="talk.mp3")
+
+    assert read_sidecar(sidecar) == ("talk.mp3", segments)
+    assert to_srt(segments).startswith("1\n00:00:00,000 --> 00:00:01,250\nHello.\n\n2\n01:01:01,500")
+    assert to_vtt(segments).startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.250\nHello.\n")
+    assert "**[01:01:01]** Later." in to_markdown(segments, "talk.mp3")
+
+    written = write_captions(sidecar, ["srt", "vtt", "md"])
+    assert [p.name for p in written] == ["talk.srt", "talk.vtt", "timestamped_talk.md"]
+    with pytest.raises(ValueError):
+        write_captions(sidecar, ["ass"])
+
+
+def test_run_writes_remapped_sidecar_and_captions(monkeypatch, tmp_path: Path):
+    source = tmp_path / "talk.mp3"
+    source.write_bytes(b"x" * 64)
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        transcript = Transcript.to_file("Hello. Bye.", gptapi.transcription_output_path(chunk, destination))
+        return transcript, [Segment(0.0, 1.0, "Hello."), Segment(1.0, 2.0, "Bye.")]
+
+    monkeypatch.setattr(gptapi, "transcribe_audio_segments", fake_transcribe)
+
+    result = app.run_voicebrief(source, captions=["srt"])
+
+    assert result.segments_path == tmp_path / "segments_talk.json"
+    assert read_sidecar(result.segments_path)[1][1] == Segment(1.0, 2.0, "Bye.")
+    assert result.caption_paths == [tmp_path / "talk.srt"]
+    assert "00:00:01,000 --> 00:00:02,000\nBye." in result.caption_paths[0].read_text()
@@ -13,6 +13,15 @@ def test_gui_flag_is_exclusive():
     assert exc.value.code == 2
 
 
+@pytest.mark.parametrize(
+    "option", [["--jobs", "4"], ["--plan-format", "json"], ["--silence-threshold", "-50"], ["--hedge-budget", "0.5"]]
+)
+def test_gui_flag_rejects_run_options(option):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--gui", *option])
+    assert exc.value.code == 2
+
+
 def test_gui_flag_launches_gui(monkeypatch):
     invoked = False
 
@@ -40,6 +49,10 @@ def test_prompt_file_is_forwarded_to_run_voicebrief(monkeypatch, tmp_path: Path)
             optimized_transcript = None
             markdown_transcript = None
             source_path = Path("example.mp3")
+            stitched_transcript = None
+            caption_paths: list[Path] = []
+            profile_outputs: list[Path] = []
+            reused_from = None
 
         return Result()
 
@@ -63,3 +76,34 @@ def test_custom_instructions_and_prompt_file_cannot_be_combined():
         )
 
     assert exc.value.code == 1
+
+
+def test_warmup_command_is_dispatched(monkeypatch, tmp_path: Path):
+    import voicebrief.gptapi as gptapi
+
+    captured: dict[str, object] = {}
+
+    def fake_warmup(models):
+        captured["models"] = list(models)
+        return tmp_path
+
+    monkeypatch.setattr(gptapi, "warmup", fake_warmup)
+    monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+    monkeypatch.setenv("VOICEBRIEF_TIKTOKEN_CACHE_DIR", "unused")
+
+    cli.main(["warmup", "--cache-dir", str(tmp_path), "--model", "gpt-4o"])
+
+    assert captured["models"] == ["gpt-4o"]
+    assert cli.os.environ["VOICEBRIEF_TIKTOKEN_CACHE_DIR"] == str(tmp_path)
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    import subprocess
+
+    code = (
+        "import sys, voicebrief.__main__, voicebrief.gptapi; "
+        "print(','.join(m for m in ('openai', 'tiktoken', 'dotenv', 'moviepy', 'pydub') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
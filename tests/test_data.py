@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import gptapi
+from voicebrief.data import LazyTranscript, RollingTranscript, Transcript
+from voicebrief.stitch import stitch, stitch_pieces
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_lazy_transcript_reads_and_streams_from_disk(tmp_path: Path, use_mmap: bool):
+    text = "héllo wörld — " * 50
+    eager = Transcript.to_file(text, tmp_path / "t.txt")
+    lazy = LazyTranscript.from_transcript(eager, use_mmap=use_mmap)
+
+    assert not hasattr(lazy, "__dict__")
+    assert lazy.text == text
+    pieces = list(lazy.iter_chunks(size=7))  # splits multi-byte characters when mapped
+    assert len(pieces) > 1 and "".join(pieces) == text
+    assert lazy.load() == eager
+
+    (tmp_path / "t.txt").write_text("changed", encoding="utf-8")
+    assert lazy.text == "changed"
+
+
+def test_lazy_transcript_handles_empty_files(tmp_path: Path):
+    lazy = LazyTranscript.to_file("", tmp_path / "empty.txt")
+    assert lazy.text == ""
+    assert list(LazyTranscript(lazy.text_path, use_mmap=True).iter_chunks()) == []
+
+
+def test_write_parts_leaves_no_partial_output_on_failure(tmp_path: Path):
+    target = tmp_path / "out.txt"
+
+    def parts():
+        yield "first"
+        raise RuntimeError("request failed")
+
+    with pytest.raises(RuntimeError):
+        LazyTranscript.write_parts(parts(), target, "\n")
+
+    assert list(tmp_path.iterdir()) == []
+    assert LazyTranscript.write_parts(iter(["a", "b"]), target, "\n").text == "a\nb"
+
+
+def test_post_processing_of_lazy_transcripts_streams_lazy_output(monkeypatch, tmp_path: Path):
+    class WordEncoding:
+        def encode(self, text):
+            return text.split()
+
+    batches: list[str] = []
+
+    def fake_completion(client, model, system_prompt, text, task, metrics=None, cancel_token=None):
+        batches.append(text)
+        return f"batch {len(batches)}"
+
+    monkeypatch.setattr(gptapi, "_get_client", lambda: object())
+    monkeypatch.setattr(gptapi, "_get_model", lambda: "test-model")
+    monkeypatch.setattr(gptapi, "_get_encoding", lambda model: WordEncoding())
+    monkeypatch.setattr(gptapi, "_chat_completion", fake_completion)
+    words = " ".join(["word"] * 3000)
+    transcripts = [
+        LazyTranscript.to_file(words, tmp_path / f"transcription_talk_{i}.txt") for i in range(3)
+    ]
+
+    result = gptapi.optimize_transcriptions(transcripts)
+
+    assert isinstance(result, LazyTranscript)
+    assert result.text_path == tmp_path / "optimized_transcription_talk_0.txt"
+    assert result.text == "batch 1\n\nbatch 2\n\nbatch 3"
+    assert len(batches) == 3
+
+
+def test_rolling_transcript_appends_completed_prefix_in_order(tmp_path: Path):
+    path = tmp_path / "transcription_talk.txt"
+    with RollingTranscript(path, 3, keep_pieces=False) as rolling:
+        rolling.add(2, "third")
+        assert path.read_text() == ""
+        rolling.add(0, "first")
+        assert path.read_text() == "first"
+        rolling.add(1, "second")
+        assert path.read_text() == "first second third"
+
+        transcript = rolling.finish()
+
+    assert transcript == LazyTranscript(path)
+
+
+def test_rolling_transcript_stitches_overlapping_chunks(tmp_path: Path):
+    texts = [
+        "We agreed that the budget for next quar",
+        "the budget for next quarter is twelve thousand eu",
+        "is twelve thousand euros, as discussed.",
+    ]
+    path = tmp_path / "transcription_talk.txt"
+    piece_paths = [tmp_path / f"piece_{index}.txt" for index in range(3)]
+    with RollingTranscript(path, 3, stitch=True, piece_paths=piece_paths) as rolling:
+        rolling.add(0, texts[0])
+        rolling.add(1, texts[1])
+        # Chunk 1's tail depends on chunk 2, so only chunk 0 is written.
+        assert path.read_text() == "We agreed that the budget for next"
+        rolling.add(2, texts[2])
+        transcript = rolling.finish()
+
+    assert transcript.text == path.read_text() == stitch(texts)
+    assert [p.read_text() for p in piece_paths] == stitch_pieces(texts)
+
+
+def test_rolling_transcript_finish_requires_every_chunk(tmp_path: Path):
+    with RollingTranscript(tmp_path / "t.txt", 2) as rolling:
+        rolling.add(0, "only")
+        with pytest.raises(ValueError):
+            rolling.add(0, "again")
+        with pytest.raises(RuntimeError):
+            rolling.finish()
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import endpoints
+from voicebrief.endpoints import chat_endpoint, parse_headers, transcription_endpoint
+
+_ENV_VARS = [
+    "OPENAI_API_KEY",
+    "OPENAI_BASE_URL",
+    "OPENAI_MODEL",
+    "VOICEBRIEF_TIMEOUT",
+] + [
+    f"VOICEBRIEF_{kind}_{name}"
+    for kind in ("TRANSCRIBE", "CHAT")
+    for name in ("BASE_URL", "API_KEY", "MODEL", "TIMEOUT", "HEADERS", "FALLBACK_MODEL")
+]
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in _ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(endpoints, "load_env", lambda: None)
+
+
+def test_defaults_target_public_api(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4-turbo")
+
+    transcription = transcription_endpoint()
+    chat = chat_endpoint()
+
+    assert transcription.base_url is None
+    assert transcription.model == "whisper-1"
+    assert transcription.fallback_model == "gpt-4o-mini-transcribe"
+    assert chat.model == "gpt-4-turbo"
+    assert chat.api_key == "sk-test"
+    assert transcription.connection_key == chat.connection_key
+
+
+def test_endpoints_are_configured_separately(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("VOICEBRIEF_TRANSCRIBE_BASE_URL", "http://whisper.local:8000/v1")
+    monkeypatch.setenv("VOICEBRIEF_TRANSCRIBE_MODEL", "large-v3")
+    monkeypatch.setenv("VOICEBRIEF_TRANSCRIBE_FALLBACK_MODEL", "")
+    monkeypatch.setenv("VOICEBRIEF_TRANSCRIBE_TIMEOUT", "120")
+    monkeypatch.setenv("VOICEBRIEF_CHAT_BASE_URL", "http://vllm.local:8001/v1")
+    monkeypatch.setenv("VOICEBRIEF_CHAT_API_KEY", "chat-key")
+    monkeypatch.setenv("VOICEBRIEF_CHAT_HEADERS", "X-Tenant: ops; X-Trace: 1")
+
+    transcription = transcription_endpoint()
+    chat = chat_endpoint()
+
+    assert transcription.base_url == "http://whisper.local:8000/v1"
+    assert transcription.model == "large-v3"
+    assert transcription.fallback_model is None
+    assert transcription.timeout == 120.0
+    assert chat.base_url == "http://vllm.local:8001/v1"
+    assert chat.api_key == "chat-key"
+    assert chat.headers == {"X-Tenant": "ops", "X-Trace": "1"}
+    assert transcription.connection_key != chat.connection_key
+
+
+def test_custom_base_url_does_not_require_api_key(monkeypatch):
+    monkeypatch.setenv("VOICEBRIEF_CHAT_BASE_URL", "http://vllm.local:8001/v1")
+
+    assert chat_endpoint().api_key
+    assert transcription_endpoint().api_key is None
+
+
+def test_parse_headers_accepts_json_and_rejects_garbage():
+    assert parse_headers('{"B": "2", "A": 1}') == (("A", "1"), ("B", "2"))
+    assert parse_headers("") == ()
+    with pytest.raises(ValueError):
+        parse_headers("no-colon-here")
+
+
+def test_transcription_and_chat_are_routed_to_their_own_servers(monkeypatch, tmp_path: Path):
+    pytest.importorskip("openai")
+    from benchmarks.fake_api import FakeOpenAIServer
+    from voicebrief import gptapi
+
+    audio = tmp_path / "clip.mp3"
+    audio.write_bytes(b"\0" * 1000)
+    with FakeOpenAIServer() as audio_server, FakeOpenAIServer() as chat_server:
+        monkeypatch.setenv("VOICEBRIEF_TRANSCRIBE_BASE_URL", audio_server.base_url)
+        monkeypatch.setenv("VOICEBRIEF_CHAT_BASE_URL", chat_server.base_url)
+
+        gptapi.speech_to_text(audio)
+        gptapi.summarize_text("hello")
+
+    assert audio_server.stats.by_endpoint == {"transcriptions": 1}
+    assert chat_server.stats.by_endpoint == {"chat": 1}
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+from voicebrief import app, gptapi
+from voicebrief.data import Transcript
+from voicebrief.fingerprint import FingerprintRegistry, RegisteredOutputs, fingerprint
+
+
+def test_fingerprint_depends_on_content_not_location(tmp_path: Path):
+    data = bytes(range(256)) * 20_000
+    first, copy, changed = tmp_path / "a.mp3", tmp_path / "copy.mp3", tmp_path / "b.mp3"
+    first.write_bytes(data)
+    copy.write_bytes(data)
+    changed.write_bytes(data[:-1] + b"x")
+
+    assert fingerprint(first) == fingerprint(copy)
+    assert fingerprint(first) != fingerprint(changed)
+    assert fingerprint(first).startswith(f"{len(data)}:")
+
+
+def test_lookup_matches_duration_and_options_and_drops_missing_outputs(tmp_path: Path):
+    transcript = tmp_path / "transcription_a.txt"
+    transcript.write_text("hello")
+    outputs = RegisteredOutputs(source=tmp_path / "a.mp3", transcripts=[transcript])
+
+    with FingerprintRegistry(tmp_path / "registry.db") as registry:
+        registry.register("key", 60.0, {"speed": 1.0}, outputs)
+
+        assert registry.lookup("key", 60.05, {"speed": 1.0}).transcripts == [transcript]
+        assert registry.lookup("key", 61.0, {"speed": 1.0}) is None
+        assert registry.lookup("key", 60.0, {"speed": 2.0}) is None
+        transcript.unlink()
+        assert registry.lookup("key", 60.0, {"speed": 1.0}) is None
+
+
+def test_place_renames_outputs_after_the_new_source(tmp_path: Path):
+    (tmp_path / "old").mkdir()
+    chunk = tmp_path / "old" / "transcription_a_000.txt"
+    chunk.write_text("hi")
+    srt = tmp_path / "old" / "a.srt"
+    srt.write_text("1")
+    outputs = RegisteredOutputs(source=tmp_path / "old" / "a.mp3", transcripts=[chunk], captions=[srt])
+
+    placed = outputs.place(tmp_path / "new" / "talk.mp3", tmp_path / "new", mode="link")
+
+    assert [p.name for p in placed.paths()] == ["transcription_talk_000.txt", "talk.srt"]
+    assert placed.transcripts[0].samefile(chunk)
+
+
+def test_second_copy_reuses_outputs_without_transcribing(monkeypatch, tmp_path: Path):
+    calls = []
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        calls.append(chunk)
+        return Transcript.to_file("hello", Path(destination) / ("transcription_" + chunk.stem + ".txt"))
+
+    monkeypatch.setattr(gptapi, "transcribe_audio", fake_transcribe)
+    registry = tmp_path / "registry.db"
+    (tmp_path / "in").mkdir()
+    original, upload = tmp_path / "talk.mp3", tmp_path / "in" / "reupload.mp3"
+    original.write_bytes(b"x" * 64)
+    upload.write_bytes(b"x" * 64)
+
+    first = app.run_voicebrief(original, fingerprint_registry=registry)
+    second = app.run_voicebrief(upload, destination=tmp_path / "out", fingerprint_registry=registry, reuse="copy")
+
+    assert len(calls) == 1 and first.reused_from is None
+    assert second.reused_from == original
+    assert second.transcripts[0].text_path == tmp_path / "out" / "transcription_reupload.txt"
+    assert second.transcripts[0].text == "hello"
+
+
+def test_rerunning_a_linked_copy_leaves_the_original_outputs_unchanged(monkeypatch, tmp_path: Path):
+    replies = iter(["original text", "edited text"])
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        return Transcript.to_file(next(replies), gptapi.transcription_output_path(chunk, destination))
+
+    monkeypatch.setattr(gptapi, "transcribe_audio", fake_transcribe)
+    registry = tmp_path / "registry.db"
+    original, upload = tmp_path / "talk.mp3", tmp_path / "in" / "reupload.mp3"
+    upload.parent.mkdir()
+    original.write_bytes(b"x" * 64)
+    upload.write_bytes(b"x" * 64)
+    app.run_voicebrief(original, fingerprint_registry=registry)
+    reused = app.run_voicebrief(upload, destination=tmp_path / "out", fingerprint_registry=registry, reuse="link")
+    assert reused.transcripts[0].text_path.samefile(tmp_path / "transcription_talk.txt")
+
+    app.run_voicebrief(upload, destination=tmp_path / "out")
+
+    assert (tmp_path / "transcription_talk.txt").read_text() == "original text"
+    assert (tmp_path / "out" / "transcription_reupload.txt").read_text() == "edited text"
@@ -0,0 +1,24 @@
+from voicebrief.gui import _format_duration, _LogBatcher
+
+
+def test_log_batcher_requests_one_flush_per_batch():
+    batcher = _LogBatcher(max_lines=10)
+
+    assert batcher.add("a\n") is True
+    assert batcher.add("b\n") is False
+    assert batcher.drain() == "a\nb\n"
+    assert batcher.add("c\n") is True
+
+
+def test_log_batcher_caps_pending_lines_and_reports_drops():
+    batcher = _LogBatcher(max_lines=3)
+    for i in range(5):
+        batcher.add(f"{i}\n")
+
+    assert batcher.drain() == "... 2 log line(s) dropped ...\n2\n3\n4\n"
+    assert batcher.drain() == ""
+
+
+def test_format_duration():
+    assert _format_duration(42.4) == "42s"
+    assert _format_duration(125) == "2m05s"
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from voicebrief.cancel import CancellationToken, ProcessingCancelled
+from voicebrief.hedging import DeadlineExceeded, HedgePolicy, Hedger, LatencyTracker
+from voicebrief.metrics import RunMetrics
+
+
+def _tracker(*samples: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for sample in samples:
+        tracker.record(sample)
+    return tracker
+
+
+def _slow_then_fast():
+    """First attempt blocks until it is abandoned, later attempts answer at once."""
+    calls = []
+
+    def fn(token: CancellationToken) -> str:
+        calls.append(token)
+        if len(calls) == 1:
+            token.wait(5)
+            return "slow"
+        return "fast"
+
+    return fn, calls
+
+
+def test_latency_tracker_nearest_rank_percentile():
+    tracker = _tracker(*[float(n) for n in range(1, 11)])
+
+    assert tracker.percentile(50) == 5.0
+    assert tracker.percentile(95) == 10.0
+    assert LatencyTracker().percentile(95) is None
+
+
+def test_slow_request_is_hedged_and_the_hedge_wins():
+    metrics = RunMetrics()
+    policy = HedgePolicy(hedge_percentile=95, max_extra_fraction=1.0, min_delay_seconds=0.0)
+    hedger = Hedger(policy, _tracker(0.05, 0.05, 0.05), metrics)
+    fn, calls = _slow_then_fast()
+
+    assert hedger.call(fn, cost=100) == "fast"
+    assert len(calls) == 2
+    assert calls[0].cancelled  # the losing attempt is released
+    assert (metrics.hedges_issued, metrics.hedges_won) == (1, 1)
+
+
+def test_hedges_respect_the_extra_spend_cap():
+    metrics = RunMetrics()
+    policy = HedgePolicy(deadline_seconds=0.3, hedge_percentile=50, max_extra_fraction=0.5, min_delay_seconds=0.0)
+    hedger = Hedger(policy, _tracker(0.01, 0.01, 0.01), metrics)
+    fn, calls = _slow_then_fast()
+
+    with pytest.raises(DeadlineExceeded):
+        hedger.call(fn, cost=100)  # a hedge would cost 100% of the 100 sent so far
+    assert len(calls) == 1
+    assert metrics.hedges_issued == 0
+
+
+def test_no_hedge_before_enough_latency_samples():
+    hedger = Hedger(HedgePolicy(hedge_percentile=95), LatencyTracker())
+
+    assert hedger.hedge_delay() is None
+    assert hedger.call(lambda token: "ok") == "ok"
+    assert len(hedger.tracker) == 1
+
+
+def test_failure_of_an_unhedged_request_is_raised():
+    hedger = Hedger(HedgePolicy(deadline_seconds=5), LatencyTracker())
+
+    def fail(token):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        hedger.call(fail)
+
+
+def test_cancellation_releases_the_caller():
+    hedger = Hedger(HedgePolicy(), LatencyTracker())
+    cancel = CancellationToken()
+    threading.Timer(0.05, cancel.cancel).start()
+    started = time.perf_counter()
+
+    with pytest.raises(ProcessingCancelled):
+        hedger.call(lambda token: token.wait(5), cancel_token=cancel)
+    assert time.perf_counter() - started < 2
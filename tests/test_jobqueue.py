@@ -0,0 +1,141 @@
+import sqlite3
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from voicebrief import app
+from voicebrief.jobqueue import JobQueue, QueueWorker
+from voicebrief.jobs import JobState
+from voicebrief.metrics import RunMetrics
+
+
+def test_claim_leases_each_job_to_one_worker(tmp_path):
+    with JobQueue(tmp_path / "queue.db") as queue, JobQueue(tmp_path / "queue.db") as other:
+        job_id = queue.enqueue("/media/a.mp3", {"generate_optimized": True})
+
+        job = queue.claim("node-1")
+        assert job is not None and job.id == job_id
+        assert job.options == {"generate_optimized": True}
+        assert job.attempts == 1
+        assert other.claim("node-2") is None
+
+        assert queue.heartbeat(job_id, "node-1")
+        assert not queue.heartbeat(job_id, "node-2")
+        assert queue.complete(job_id, "node-1", {"optimized": "x.txt"})
+        assert other.get(job_id).state is JobState.DONE
+        assert other.get(job_id).result == {"optimized": "x.txt"}
+
+
+def test_expired_lease_is_taken_over_and_the_old_owner_is_ignored(tmp_path):
+    with JobQueue(tmp_path / "queue.db") as queue:
+        job_id = queue.enqueue("a.mp3")
+        queue.claim("node-1", lease_seconds=0.01)
+        time.sleep(0.05)
+
+        job = queue.claim("node-2")
+        assert job is not None and job.id == job_id and job.worker == "node-2"
+        assert not queue.complete(job_id, "node-1")
+        assert queue.fail(job_id, "node-1", "late") is None
+
+
+def test_failed_jobs_are_retried_then_dead_lettered(tmp_path):
+    with JobQueue(tmp_path / "queue.db", retry_backoff_seconds=0) as queue:
+        job_id = queue.enqueue("a.mp3", max_attempts=2)
+
+        queue.claim("w")
+        assert queue.fail(job_id, "w", "RuntimeError: 502") is JobState.QUEUED
+        queue.claim("w")
+        assert queue.fail(job_id, "w", "RuntimeError: 502") is JobState.FAILED
+        assert queue.claim("w") is None
+        assert queue.counts()["failed"] == 1
+
+        assert queue.requeue_failed() == 1
+        assert queue.claim("w").attempts == 1
+
+
+def test_permanent_errors_are_not_retried(tmp_path):
+    with JobQueue(tmp_path / "queue.db", retry_backoff_seconds=0) as queue:
+        job_id = queue.enqueue("a.mp3")
+        queue.claim("w")
+
+        assert queue.fail(job_id, "w", "FileNotFoundError", retryable=False) is JobState.FAILED
+
+
+def test_worker_drains_the_queue_and_records_results(tmp_path, monkeypatch):
+    def fake_run(source, cancel_token=None, **options):
+        if source.name == "missing.mp3":
+            raise FileNotFoundError(source)
+        text_path = tmp_path / f"transcription_{source.stem}.txt"
+        return SimpleNamespace(
+            transcripts=[SimpleNamespace(text_path=text_path)],
+            optimized_transcript=None,
+            markdown_transcript=None,
+            stitched_transcript=None,
+            segments_path=None,
+            caption_paths=[],
+            metrics=RunMetrics(),
+        )
+
+    monkeypatch.setattr(app, "run_voicebrief", fake_run)
+    with JobQueue(tmp_path / "queue.db") as queue:
+        good = queue.enqueue(tmp_path / "talk.mp3")
+        bad = queue.enqueue(tmp_path / "missing.mp3")
+
+        finished = QueueWorker(queue, "node-1", concurrency=2, poll_seconds=0.01).run(drain=True)
+
+        assert finished == 2
+        assert queue.get(good).state is JobState.DONE
+        assert queue.get(good).result["transcripts"] == [str(tmp_path / "transcription_talk.txt")]
+        assert queue.get(bad).state is JobState.FAILED
+        assert queue.get(bad).error.startswith("FileNotFoundError")
+        assert Path(queue.path).exists()
+
+
+def _empty_result(source, cancel_token=None, **options):
+    return SimpleNamespace(
+        transcripts=[],
+        optimized_transcript=None,
+        markdown_transcript=None,
+        stitched_transcript=None,
+        segments_path=None,
+        caption_paths=[],
+        metrics=RunMetrics(),
+    )
+
+
+def test_worker_survives_a_failing_claim(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "run_voicebrief", _empty_result)
+    with JobQueue(tmp_path / "queue.db") as queue:
+        job_id = queue.enqueue(tmp_path / "talk.mp3")
+        claim = queue.claim
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def flaky_claim(worker, lease_seconds):
+            if failures:
+                raise failures.pop()
+            return claim(worker, lease_seconds)
+
+        monkeypatch.setattr(queue, "claim", flaky_claim)
+
+        assert QueueWorker(queue, "node-1", poll_seconds=0.01).run(drain=True) == 1
+        assert queue.get(job_id).state is JobState.DONE
+
+
+def test_worker_survives_a_failing_outcome_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "run_voicebrief", _empty_result)
+    with JobQueue(tmp_path / "queue.db") as queue:
+        first = queue.enqueue(tmp_path / "first.mp3")
+        second = queue.enqueue(tmp_path / "second.mp3")
+        complete = queue.complete
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def flaky_complete(job_id, worker, result):
+            if failures:
+                raise failures.pop()
+            return complete(job_id, worker, result)
+
+        monkeypatch.setattr(queue, "complete", flaky_complete)
+
+        assert QueueWorker(queue, "node-1", poll_seconds=0.01).run(drain=True) == 1
+        assert queue.get(first).state is JobState.RUNNING  # left to lease expiry
+        assert queue.get(second).state is JobState.DONE
@@ -0,0 +1,64 @@
+import threading
+from pathlib import Path
+
+from voicebrief import jobs
+from voicebrief.gui import _job_status_text
+from voicebrief.jobs import Job, JobRunner, JobState
+from voicebrief.progress import ChunkTranscribed, StageStarted
+
+
+def test_runner_processes_jobs_concurrently_and_reports_progress(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_run(source, cancel_token=None, progress=None, **options):
+        barrier.wait()  # both jobs must be running at the same time
+        progress(StageStarted("transcription", 0.0))
+        progress(ChunkTranscribed(1, 2, Path("c"), 10, 10, 1, 3.0, 0.1))
+        if options.get("fail"):
+            raise RuntimeError("boom")
+        return f"result for {source.name}"
+
+    monkeypatch.setattr(jobs, "run_voicebrief", fake_run)
+    updates: list[tuple[int, JobState]] = []
+    runner = JobRunner(max_workers=2, on_update=lambda job: updates.append((job.id, job.state)))
+    good = runner.submit("a.mp3")
+    bad = runner.submit("b.mp3", fail=True)
+    runner.wait(timeout=5)
+    runner.shutdown()
+
+    assert good.state is JobState.DONE and good.result == "result for a.mp3"
+    assert good.fraction == 1.0
+    assert bad.state is JobState.FAILED and bad.error == "boom"
+    assert (good.id, JobState.RUNNING) in updates
+    assert not runner.active
+
+
+def test_cancel_stops_running_and_queued_jobs(monkeypatch):
+    started = threading.Event()
+
+    def fake_run(source, cancel_token=None, progress=None, **options):
+        started.set()
+        cancel_token.wait(5)
+        cancel_token.raise_if_cancelled()
+
+    monkeypatch.setattr(jobs, "run_voicebrief", fake_run)
+    runner = JobRunner(max_workers=1)
+    running = runner.submit("a.mp3")
+    queued = runner.submit("b.mp3")
+    assert started.wait(5)
+
+    assert runner.cancel(queued.id) is True
+    assert queued.state is JobState.CANCELLED
+    runner.cancel(running.id)
+    runner.wait(timeout=5)
+
+    assert running.state is JobState.CANCELLED
+    assert runner.cancel(running.id) is False
+
+
+def test_job_status_text():
+    job = Job(1, Path("a.mp3"), {})
+    assert _job_status_text(job) == "Queued"
+    job.state, job.stage = JobState.RUNNING, "transcription"
+    job.fraction, job.eta_seconds = 0.5, 65
+    assert _job_status_text(job) == "Transcribing 50% · ETA 1m05s"
@@ -0,0 +1,82 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from voicebrief.cancel import CancellationToken, call_cancellable
+from voicebrief.logging_utils import (
+    ContextFilter,
+    JsonFormatter,
+    TextFormatter,
+    _ContextQueueHandler,
+    log_context,
+)
+
+
+class _Collect(logging.Handler):
+    def __init__(self, formatter):
+        super().__init__()
+        self.setFormatter(formatter)
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def _logger(handler):
+    logger = logging.getLogger("voicebrief.test_logging")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_json_records_carry_the_log_context():
+    collect = _Collect(JsonFormatter())
+    collect.addFilter(ContextFilter())
+    log = _logger(collect)
+
+    with log_context(run_id="r1", file="talk.mp3"):
+        with log_context(chunk=2):
+            log.info("chunk %d of %d", 2, 3)
+        log.info("done")
+    log.info("outside")
+
+    entries = [json.loads(line) for line in collect.lines]
+    assert entries[0]["message"] == "chunk 2 of 3"
+    assert (entries[0]["run_id"], entries[0]["file"], entries[0]["chunk"]) == ("r1", "talk.mp3", 2)
+    assert (entries[1]["run_id"], entries[1]["chunk"]) == ("r1", None)
+    assert entries[2]["run_id"] is None
+
+
+def test_queued_records_keep_context_and_traceback():
+    records = queue.SimpleQueue()
+    handler = _ContextQueueHandler(records)
+    handler.addFilter(ContextFilter())
+    collect = _Collect(JsonFormatter())
+    listener = QueueListener(records, collect)
+    listener.start()
+    log = _logger(handler)
+
+    with log_context(run_id="r2", chunk=1):
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            log.exception("failed %s", "upload")
+    listener.stop()
+
+    entry = json.loads(collect.lines[0])
+    assert entry["message"] == "failed upload"
+    assert entry["run_id"] == "r2" and entry["chunk"] == 1
+    assert "RuntimeError: boom" in entry["exc"]
+
+
+def test_context_follows_cancellable_calls_onto_their_thread():
+    collect = _Collect(TextFormatter())
+    collect.addFilter(ContextFilter())
+    log = _logger(collect)
+
+    with log_context(run_id="r3", file="a.wav", chunk=4):
+        call_cancellable(CancellationToken(), log.info, "uploading")
+
+    assert collect.lines[0].endswith("| uploading | run=r3 file=a.wav chunk=4")
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+from voicebrief.metrics import RunMetrics
+
+
+def _sample_metrics() -> RunMetrics:
+    metrics = RunMetrics(audio_seconds=120.0, wall_seconds=30.0)
+    metrics.record_stage("segmentation", 1.5)
+    metrics.record_chunk(Path("/tmp/talk_000.mp3"), 10.0, 1000)
+    metrics.record_chunk(Path("/tmp/talk_001.mp3"), 12.0, 500)
+    metrics.record_request("optimize", "gpt-4o", 4.0, 300, 200)
+    metrics.record_request("markdown", "gpt-4o", 5.0, 100, 50)
+    return metrics
+
+
+def test_totals_and_realtime_factor():
+    metrics = _sample_metrics()
+
+    assert metrics.bytes_uploaded == 1500
+    assert metrics.tokens_in == 400
+    assert metrics.tokens_out == 250
+    assert metrics.realtime_factor == 4.0
+    assert metrics.stage_seconds("segmentation") == 1.5
+    assert metrics.stage_seconds("extraction") == 0.0
+
+
+def test_realtime_factor_is_none_without_audio_duration():
+    assert RunMetrics(wall_seconds=5.0).realtime_factor is None
+
+
+def test_stage_context_records_elapsed_time():
+    metrics = RunMetrics()
+    with metrics.stage("probe"):
+        pass
+
+    assert [stage.name for stage in metrics.stages] == ["probe"]
+    assert metrics.stages[0].seconds >= 0
+
+
+def test_write_infers_format_from_suffix(tmp_path: Path):
+    metrics = _sample_metrics()
+
+    json_path = metrics.write(tmp_path / "run.json")
+    prom_path = metrics.write(tmp_path / "run.prom")
+
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    assert data["bytes_uploaded"] == 1500
+    assert len(data["chunks"]) == 2
+
+    prom = prom_path.read_text(encoding="utf-8")
+    assert "# TYPE voicebrief_run_realtime_factor gauge" in prom
+    assert 'voicebrief_tokens_total{direction="in"} 400' in prom
+    assert 'voicebrief_chunk_transcription_seconds{chunk="talk_001.mp3"} 12.0' in prom
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import planner
+from voicebrief.gptapi import token_batches
+from voicebrief.planner import PlanAssumptions, plan_paths
+
+
+def test_token_batches_groups_consecutive_items_up_to_the_limit():
+    assert token_batches([1500, 1500, 1500, 5000, 10], limit=4000) == [[0, 1], [2], [3], [4]]
+    assert token_batches([], limit=4000) == []
+
+
+def test_plan_estimates_chunks_requests_tokens_and_cost(monkeypatch, tmp_path: Path):
+    library = tmp_path / "library"
+    (library / "day1").mkdir(parents=True)
+    long_audio = library / "day1" / "long.mp3"
+    with long_audio.open("wb") as handle:
+        handle.truncate(40 * 1024 * 1024)  # 40 MB, 40 minutes -> 3 chunks
+    (library / "meeting.mp4").write_bytes(b"v")
+    (library / "notes.txt").write_text("not media")
+    durations = {long_audio: 2400.0, library / "meeting.mp4": 600.0}
+    monkeypatch.setattr(
+        planner, "probe_duration_seconds", lambda path, cancel_token=None: durations[path]
+    )
+    assumptions = PlanAssumptions(
+        transcript_tokens_per_minute=100, prompt_tokens_per_request=0, price_transcribe_per_minute=0.01
+    )
+
+    plan = plan_paths([library], generate_optimized=True, jobs=2, assumptions=assumptions)
+
+    long_plan, video_plan = plan.files
+    assert long_plan.path == long_audio and long_plan.chunks == 3
+    assert long_plan.chat_requests == 1  # 4000 tokens fit one batch
+    assert long_plan.tokens_in == 4000
+    assert video_plan.video and video_plan.chunks == 1
+    assert plan.audio_seconds == 3000
+    assert plan.cost == pytest.approx(0.5 + 5000 / 1e6 * 2.5 + 5000 / 1e6 * 10.0)
+    assert plan.wall_seconds == max(f.seconds for f in plan.files)
+    assert "TOTAL (2 files)" in plan.format_table()
+
+
+def test_plan_reports_unprobeable_files(monkeypatch, tmp_path: Path):
+    broken = tmp_path / "broken.mp3"
+    broken.write_bytes(b"x")
+
+    def failing_probe(path, cancel_token=None):
+        raise RuntimeError("ffprobe failed for broken.mp3: Invalid data")
+
+    monkeypatch.setattr(planner, "probe_duration_seconds", failing_probe)
+
+    plan = plan_paths([broken], assumptions=PlanAssumptions())
+
+    assert plan.files[0].error.endswith("Invalid data")
+    assert plan.to_dict()["total"]["failed"] == 1
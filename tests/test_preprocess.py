@@ -0,0 +1,28 @@
+import pytest
+
+from voicebrief.preprocess import kept_ranges, parse_silences
+
+SILENCEDETECT_OUTPUT = """\
+[silencedetect @ 0x1] silence_start: -0.01
+[silencedetect @ 0x1] silence_end: 3.2 | silence_duration: 3.2
+size=N/A time=00:00:20.00 bitrate=N/A speed= 400x
+[silencedetect @ 0x1] silence_start: 10.5
+[silencedetect @ 0x1] silence_end: 16.5 | silence_duration: 6
+[silencedetect @ 0x1] silence_start: 55
+"""
+
+
+def test_parse_silences_closes_a_trailing_silence_at_the_duration():
+    assert parse_silences(SILENCEDETECT_OUTPUT, 60.0) == [(0.0, 3.2), (10.5, 16.5), (55.0, 60.0)]
+    assert parse_silences(SILENCEDETECT_OUTPUT) == [(0.0, 3.2), (10.5, 16.5)]
+
+
+def test_kept_ranges_keep_padding_around_speech():
+    ranges = kept_ranges([(0.0, 3.2), (10.5, 16.5), (55.0, 60.0)], 60.0, padding=0.5)
+
+    assert ranges == [(2.7, 11.0), (16.0, 55.5)]
+    assert 60.0 - sum(end - start for start, end in ranges) == pytest.approx(12.2)
+
+
+def test_kept_ranges_ignore_silences_shorter_than_the_padding():
+    assert kept_ranges([(5.0, 5.4)], 10.0, padding=0.3) == [(0.0, 10.0)]
@@ -0,0 +1,77 @@
+import contextvars
+import json
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+
+from voicebrief import profiling
+from voicebrief.profiling import ProfileSession, span
+
+
+def test_span_is_noop_without_session():
+    with span("idle", "test"):
+        pass
+
+    assert profiling._ACTIVE_RECORDER.get() is None
+
+
+def test_session_writes_stats_and_trace_from_all_threads(tmp_path: Path):
+    with ProfileSession(tmp_path, "talk") as session:
+        with span("main-work", "test", item=1):
+            sum(range(1000))
+
+        def worker() -> None:
+            with span("worker-work", "test"):
+                pass
+
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,), name="chunk-worker")
+        thread.start()
+        thread.join()
+
+    assert session.outputs == [tmp_path / "profile_talk.pstats", tmp_path / "profile_talk.trace.json"]
+    assert profiling._ACTIVE_RECORDER.get() is None
+
+    pstats.Stats(str(session.stats_path))
+    trace = json.loads(session.trace_path.read_text(encoding="utf-8"))
+    spans = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert set(spans) == {"main-work", "worker-work"}
+    assert spans["main-work"]["args"] == {"item": 1}
+    assert spans["main-work"]["tid"] != spans["worker-work"]["tid"]
+    thread_names = {
+        event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "thread_name"
+    }
+    assert "chunk-worker" in thread_names
+
+
+def test_only_one_session_runs_at_a_time_and_other_contexts_record_nothing(tmp_path: Path):
+    def unprofiled_run() -> None:
+        with span("other-run", "test"):
+            pass
+
+    with ProfileSession(tmp_path, "first") as session:
+        with pytest.raises(RuntimeError, match="already being profiled"):
+            ProfileSession(tmp_path, "second").start()
+        thread = threading.Thread(target=unprofiled_run)
+        thread.start()
+        thread.join()
+
+    assert [event["name"] for event in session.recorder.events] == []
+    with ProfileSession(tmp_path, "second"):
+        pass
+
+
+def test_failed_start_leaves_profiling_available(tmp_path: Path, monkeypatch):
+    session = ProfileSession(tmp_path, "first")
+
+    def busy() -> None:
+        raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(session._profiler, "enable", busy)
+    with pytest.raises(ValueError):
+        session.start()
+
+    assert profiling._ACTIVE_RECORDER.get() is None
+    with ProfileSession(tmp_path, "second"):
+        pass
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import app, gptapi
+from voicebrief.data import Transcript
+from voicebrief.progress import (
+    ChunkStarted,
+    ChunkTranscribed,
+    ProgressReporter,
+    RunFinished,
+    StageFinished,
+    StageStarted,
+)
+
+
+def test_reporter_estimates_eta_from_byte_rate(monkeypatch):
+    clock = iter([0.0, 0.0, 10.0, 10.0, 10.0])
+    monkeypatch.setattr("voicebrief.progress.time.perf_counter", lambda: next(clock))
+    events = []
+    reporter = ProgressReporter(events.append)
+
+    reporter.chunks_planned([100, 300])
+    reporter.chunk_transcribed(1, Path("a.mp3"), 100)
+
+    event = events[0]
+    assert isinstance(event, ChunkTranscribed)
+    assert (event.completed, event.total, event.total_bytes_uploaded) == (1, 2, 100)
+    assert event.eta_seconds == pytest.approx(30.0)
+
+
+def test_reporter_swallows_callback_errors():
+    def broken(_event):
+        raise RuntimeError("ui gone")
+
+    ProgressReporter(broken).stage_started("probe")
+
+
+def test_iter_progress_yields_typed_events(monkeypatch, tmp_path: Path):
+    source = tmp_path / "talk.mp3"
+    source.write_bytes(b"x" * 64)
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        return Transcript.to_file("hello", tmp_path / "transcription_talk.txt")
+
+    monkeypatch.setattr(gptapi, "transcribe_audio", fake_transcribe)
+
+    events = list(app.iter_progress(source))
+
+    stages = [e.stage for e in events if isinstance(e, StageStarted)]
+    assert stages == ["probe", "segmentation", "transcription"]
+    assert [type(e) for e in events if isinstance(e, (ChunkStarted, ChunkTranscribed))] == [
+        ChunkStarted,
+        ChunkTranscribed,
+    ]
+    assert any(isinstance(e, StageFinished) and e.stage == "transcription" for e in events)
+    assert isinstance(events[-1], RunFinished)
+    assert events[-1].result.transcripts[0].text == "hello"
+
+
+def test_iter_progress_reraises_errors(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        list(app.iter_progress(tmp_path / "missing.mp3"))
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import app, gptapi
+from voicebrief.data import LazyTranscript, Transcript
+from voicebrief.search import SearchIndex, chunk_offset, index_transcripts, match_expression
+
+
+def test_add_replaces_entries_and_ranks_hits(tmp_path: Path):
+    with SearchIndex(tmp_path / "index.db") as index:
+        budget = tmp_path / "transcription_budget.txt"
+        index.add(budget, "The budget for next year was approved.", source="budget.mp3", chunk_offset=600.0)
+        index.add(tmp_path / "optimized_other.txt", "We mentioned the budget once.")
+        index.add(budget, "The budget review, budget cuts and the budget total.", source="budget.mp3")
+
+        hits = index.search("budget")
+
+        assert len(index) == 2
+        assert [hit.path.name for hit in hits] == ["transcription_budget.txt", "optimized_other.txt"]
+        assert hits[0].source == "budget.mp3" and hits[0].chunk_offset is None
+        assert "[budget]" in hits[0].snippet
+        assert [hit.kind for hit in index.search("budget", kind="optimized")] == ["optimized"]
+        assert index.search("budg*") and not index.search("approved")
+
+
+def test_match_expression_quotes_words():
+    assert match_expression('say "hi" there*') == '"say" """hi""" "there"*'
+    with pytest.raises(ValueError):
+        match_expression("   ")
+
+
+def test_index_directory_adds_changed_files_and_drops_missing(tmp_path: Path):
+    (tmp_path / "talks").mkdir()
+    transcript = tmp_path / "talks" / "transcription_a.txt"
+    transcript.write_text("quarterly roadmap", encoding="utf-8")
+    (tmp_path / "talks" / "full_md_a.md").write_text("# Roadmap", encoding="utf-8")
+    (tmp_path / "talks" / "notes.txt").write_text("roadmap", encoding="utf-8")
+
+    with SearchIndex(tmp_path / "index.db") as index:
+        assert index.index_directory(tmp_path) == 2
+        assert index.index_directory(tmp_path) == 0
+        transcript.unlink()
+        index.index_directory(tmp_path)
+
+        assert [hit.kind for hit in index.search("roadmap")] == ["markdown"]
+
+
+def test_written_transcripts_are_indexed_with_source_and_offset(tmp_path: Path):
+    with SearchIndex(tmp_path / "index.db") as index:
+        with index_transcripts(index, tmp_path / "talk.mp3"):
+            with chunk_offset(1200.0):
+                Transcript.to_file("first chunk words", tmp_path / "transcription_talk_1.txt")
+            LazyTranscript.write_parts(["merged ", "words"], tmp_path / "optimized_talk.txt")
+        Transcript.to_file("outside words", tmp_path / "transcription_other.txt")
+
+        hits = {hit.path.name: hit for hit in index.search("words")}
+
+    assert set(hits) == {"transcription_talk_1.txt", "optimized_talk.txt"}
+    assert hits["transcription_talk_1.txt"].chunk_offset == 1200.0
+    assert hits["optimized_talk.txt"].source == str(tmp_path / "talk.mp3")
+
+
+def test_run_indexes_its_transcripts(monkeypatch, tmp_path: Path):
+    source = tmp_path / "talk.mp3"
+    source.write_bytes(b"x" * 64)
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        return Transcript.to_file("searchable words", tmp_path / "transcription_talk.txt")
+
+    monkeypatch.setattr(gptapi, "transcribe_audio", fake_transcribe)
+
+    app.run_voicebrief(source, search_index=tmp_path / "index.db")
+
+    with SearchIndex(tmp_path / "index.db") as index:
+        [hit] = index.search("searchable")
+    assert (hit.source, hit.chunk_offset) == (str(source), 0.0)
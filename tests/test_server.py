@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from voicebrief import jobs
+from voicebrief.metrics import RunMetrics
+from voicebrief.server import VoicebriefHTTPServer, VoicebriefService
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    def fake_run(source, cancel_token=None, progress=None, **options):
+        metrics = RunMetrics(audio_seconds=60.0, wall_seconds=2.0)
+        return SimpleNamespace(
+            transcripts=[SimpleNamespace(text_path=tmp_path / "transcription_talk.txt")],
+            optimized_transcript=None,
+            markdown_transcript=None,
+            stitched_transcript=None,
+            segments_path=None,
+            caption_paths=[],
+            metrics=metrics,
+            options=options,
+        )
+
+    monkeypatch.setattr(jobs, "run_voicebrief", fake_run)
+    service = VoicebriefService(max_workers=1)
+    httpd = VoicebriefHTTPServer(("127.0.0.1", 0), service, token="secret")
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", service
+    httpd.shutdown()
+    httpd.server_close()
+    service.shutdown()
+
+
+def _request(url, method="GET", body=None, token="secret"):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            payload = response.read().decode()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        payload, status = err.read().decode(), err.code
+    try:
+        return status, json.loads(payload)
+    except ValueError:
+        return status, payload
+
+
+def test_submit_poll_and_fetch_result(server, tmp_path):
+    base, service = server
+    media = tmp_path / "talk.mp3"
+    media.write_bytes(b"x")
+
+    status, job = _request(base + "/jobs", "POST", {"path": str(media), "options": {"generate_optimized": True}})
+    assert status == 202 and job["url"] == f"/jobs/{job['id']}"
+
+    deadline = time.time() + 5
+    while _request(base + job["url"])[1]["state"] != "done" and time.time() < deadline:
+        time.sleep(0.01)
+
+    status, result = _request(base + job["url"] + "/result")
+    assert status == 200
+    assert result["transcripts"] == [str(tmp_path / "transcription_talk.txt")]
+    assert service.runner.get(job["id"]).result.options == {"generate_optimized": True, "lazy_transcripts": True}
+    assert _request(base + job["url"] + "/metrics")[1]["audio_seconds"] == 60.0
+    service.runner.wait(timeout=5)  # the finished-job counters update after the state
+    status, text = _request(base + "/metrics")
+    assert 'voicebrief_service_jobs_finished_total{state="done"} 1' in text
+    assert "voicebrief_service_audio_seconds_total 60.0" in text
+
+
+def test_invalid_requests_are_rejected(server, tmp_path):
+    base, _service = server
+    media = tmp_path / "talk.mp3"
+    media.write_bytes(b"x")
+
+    assert _request(base + "/jobs", token=None)[0] == 401
+    status, body = _request(base + "/jobs", "POST", {"path": str(media), "options": {"cancel_token": 1}})
+    assert status == 400 and "cancel_token" in body["error"]
+    status, body = _request(base + "/jobs", "POST", {"path": str(media), "options": {"profile": True}})
+    assert status == 400 and "profile" in body["error"]
+    assert _request(base + "/jobs", "POST", {"path": str(tmp_path / "missing.mp3")})[0] == 400
+    assert _request(base + "/jobs/99")[0] == 404
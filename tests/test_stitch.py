@@ -0,0 +1,87 @@
+from voicebrief.stitch import find_seam, seam_window, stitch, stitch_pieces
+
+
+def test_stitch_removes_the_duplicated_overlap():
+    left = "We agreed to ship the release on Friday after the final"
+    right = "after the final review. Marketing will prepare the notes."
+
+    assert stitch([left, right]) == (
+        "We agreed to ship the release on Friday after the final review. Marketing will prepare the notes."
+    )
+
+
+def test_stitch_drops_words_garbled_by_the_cut():
+    # The left chunk ends mid-word, the right one starts mid-word.
+    left = "the budget for next quarter is set at twelve thou"
+    right = "rter is set at twelve thousand euros, as discussed."
+
+    assert stitch([left, right]) == "the budget for next quarter is set at twelve thousand euros, as discussed."
+
+
+def test_matching_ignores_case_and_punctuation():
+    left = "Thanks everyone. Next item, the roadmap"
+    right = "next item: the Roadmap for spring."
+
+    assert stitch([left, right]) == "Thanks everyone. Next item, the roadmap for spring."
+
+
+def test_transcripts_without_a_shared_run_are_joined_unchanged():
+    assert find_seam("hello there", "general kenobi") is None
+    assert stitch(["hello there", "general kenobi"]) == "hello there general kenobi"
+
+
+def test_stitch_pieces_keep_one_piece_per_transcript():
+    texts = ["one two three four five", "three four five six seven", "five six seven eight"]
+
+    pieces = stitch_pieces(texts)
+
+    assert pieces == ["one two three four five", "six seven", "eight"]
+    assert " ".join(pieces) == "one two three four five six seven eight"
+
+
+def test_repeated_phrase_away_from_the_cut_is_not_taken_as_the_overlap():
+    left = "so at the end of the day we decided that the budget would go to the new team and we ship"
+    right = "we ship it next week. Remember, at the end of the day the customers only care about quality."
+
+    # "we ship" is too short to trust as the seam; both texts are kept whole.
+    assert stitch([left, right]) == f"{left} {right}"
+
+
+def test_a_longer_repeat_outside_the_window_is_not_taken():
+    left = "I think the report is good and we should send it to them"
+    right = "send it to them tomorrow and then I think the report is good enough"
+
+    assert stitch([left, right]) == (
+        "I think the report is good and we should send it to them tomorrow and then I think the report is good enough"
+    )
+
+
+def test_seam_window_bounds_the_search_to_the_overlap():
+    left = "alpha beta gamma delta one two three four five six seven eight nine ten"
+    right = "ten eleven twelve alpha beta gamma delta"
+
+    assert seam_window(1.0) == 6
+    # "alpha beta gamma delta" is 14 words from the cut, outside a 1 s overlap.
+    assert find_seam(left, right, window_words=seam_window(1.0)) is None
+
+
+def test_a_short_common_phrase_is_not_taken_as_the_overlap():
+    # "over the" is shared, but accepting it would delete "dog went".
+    texts = ["the quick brown fox jumps over the la", "the lazy dog went over the lazy hill"]
+
+    assert "dog went" in stitch(texts)
+    assert find_seam(*texts) is None
+
+
+def test_a_run_filling_the_window_keeps_the_words_after_it():
+    left = "we will review the draft budget on monday and then send it"
+    right = "review the draft budget on monday and then send it out"
+
+    assert stitch([left, right]) == "we will review the draft budget on monday and then send it out"
+
+
+def test_the_longest_run_wins_over_a_shorter_one_nearer_the_cut():
+    left = "x the final budget by friday y red blue green"
+    right = "red blue green the final budget by friday z w"
+
+    assert stitch([left, right]) == "x the final budget by friday z w"
@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from voicebrief.preprocess import atempo_filter, encoder_bitrate
+from voicebrief.timeline import TimeMap
+
+
+def test_tempo_map_rescales_to_the_original_timeline():
+    time_map = TimeMap.tempo(1.5)
+    assert time_map.to_original(10.0) == 15.0
+    assert time_map.map_range(2.0, 4.0) == (3.0, 6.0)
+    assert TimeMap.identity().is_identity
+
+
+def test_kept_ranges_map_cut_audio_back_to_original_positions():
+    time_map = TimeMap.from_kept_ranges([(0.0, 10.0), (25.0, 30.0), (40.0, 50.0)])
+    assert time_map.to_original(5.0) == 5.0
+    assert time_map.to_original(12.0) == 27.0
+    assert time_map.to_original(16.0) == 41.0
+    assert time_map.to_original(26.0) == 51.0  # past the end keeps the last offset
+
+
+def test_then_composes_stages_in_processing_order():
+    cuts = TimeMap.from_kept_ranges([(0.0, 10.0), (20.0, 40.0)])
+    combined = cuts.then(TimeMap.tempo(2.0))  # cut silences, then speed up 2x
+
+    for t in (0.0, 3.0, 4.999, 5.0, 7.5, 14.0):
+        assert combined.to_original(t) == pytest.approx(cuts.to_original(t * 2.0))
+    assert TimeMap.identity().then(cuts) is cuts
+    assert TimeMap.from_dict(combined.to_dict()) == combined
+    assert math.isinf(combined.segments[-1].end)
+
+
+def test_atempo_filter_chains_factors_outside_the_supported_range():
+    assert atempo_filter(1.5) == "atempo=1.5"
+    assert atempo_filter(3.0) == "atempo=2,atempo=1.5"
+    assert atempo_filter(0.25) == "atempo=0.5,atempo=0.5"
+    with pytest.raises(ValueError):
+        atempo_filter(0)
+
+
+def test_encoder_bitrate_never_exceeds_the_source_rate():
+    assert encoder_bitrate(480_000, 60.0) == 64_000
+    assert encoder_bitrate(10_000_000, 60.0) == 128_000
+    assert encoder_bitrate(1_000, None) == 128_000
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from voicebrief import app, gptapi
+from voicebrief.cancel import ProcessingCancelled
+from voicebrief.data import Transcript
+from voicebrief.workspace import (
+    ScratchBudgetExceeded,
+    Workspace,
+    WorkspaceConfig,
+    workspace_config,
+)
+
+
+def test_workspace_is_removed_on_success_and_cancel(tmp_path: Path):
+    config = WorkspaceConfig(root=tmp_path, keep_on_failure=True)
+    with Workspace(config, "talk") as scratch:
+        (scratch.path / "chunk.mp3").write_bytes(b"x" * 10)
+        assert scratch.usage() == 10
+
+    with pytest.raises(ProcessingCancelled):
+        with Workspace(config, "talk"):
+            raise ProcessingCancelled()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_workspace_is_kept_on_failure_only_when_configured(tmp_path: Path):
+    for keep in (False, True):
+        with pytest.raises(RuntimeError):
+            with Workspace(WorkspaceConfig(root=tmp_path, keep_on_failure=keep)):
+                raise RuntimeError("boom")
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_reserve_enforces_run_and_global_budgets(tmp_path: Path):
+    (tmp_path / "leftover").mkdir()
+    (tmp_path / "leftover" / "old.wav").write_bytes(b"x" * 60)
+
+    with Workspace(WorkspaceConfig(root=tmp_path, run_budget_bytes=100)) as scratch:
+        scratch.reserve(100)
+        with pytest.raises(ScratchBudgetExceeded, match="Scratch budget"):
+            scratch.reserve(101)
+
+    config = WorkspaceConfig(root=tmp_path, global_budget_bytes=100)
+    with Workspace(config) as first, Workspace(config) as second:
+        first.reserve(30)
+        with pytest.raises(ScratchBudgetExceeded, match="Global"):
+            second.reserve(20)  # 60 on disk + 30 reserved by the first run
+
+
+def test_workspace_config_from_env(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("VOICEBRIEF_SCRATCH_DIR", str(tmp_path))
+    monkeypatch.setenv("VOICEBRIEF_SCRATCH_RUN_BUDGET_MB", "1.5")
+    monkeypatch.setenv("VOICEBRIEF_KEEP_SCRATCH_ON_FAILURE", "true")
+
+    config = workspace_config()
+
+    assert config.root == tmp_path
+    assert config.run_budget_bytes == 1536 * 1024
+    assert config.global_budget_bytes is None
+    assert config.keep_on_failure is True
+
+
+def test_run_writes_outputs_next_to_source_and_cleans_scratch(monkeypatch, tmp_path: Path):
+    source = tmp_path / "talk.mp3"
+    source.write_bytes(b"x" * 64)
+    scratch_root = tmp_path / "scratch"
+    destinations: list[Path] = []
+
+    def fake_transcribe(chunk, destination, cancel_token=None, hedger=None):
+        destinations.append(destination)
+        return Transcript.to_file("hello", destination / "transcription_talk.txt")
+
+    monkeypatch.setattr(gptapi, "transcribe_audio", fake_transcribe)
+
+    app.run_voicebrief(source, workspace=WorkspaceConfig(root=scratch_root))
+
+    assert destinations == [tmp_path]
+    assert list(scratch_root.iterdir()) == []
@@ -6,12 +6,18 @@ Voicebrief - Converts video / audio conversations to text and subsequently provi
 @license: MIT
 """
 import argparse
+import json
 import logging
 import os
+import sys
+import time
+from dataclasses import replace
 from pathlib import Path
+from typing import Callable, Dict
 
 from voicebrief.app import run_voicebrief
 from voicebrief.logging_utils import configure_logging
+from voicebrief.workspace import workspace_config
 
 
 def _load_custom_instructions(args: argparse.Namespace) -> str | None:
@@ -32,11 +38,384 @@ def _load_custom_instructions(args: argparse.Namespace) -> str | None:
     return None
 
 
+def _warmup_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="voicebrief warmup",
+        description="Pre-populate the tiktoken cache so later runs work without network access.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Cache directory to populate. Env fallback: VOICEBRIEF_TIKTOKEN_CACHE_DIR.",
+    )
+    parser.add_argument(
+        "--model",
+        action="append",
+        default=[],
+        help="Model whose encoding should be cached (repeatable; default: OPENAI_MODEL).",
+    )
+    parser.add_argument("--log-level", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], default=None)
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level)
+    if args.cache_dir:
+        os.environ["VOICEBRIEF_TIKTOKEN_CACHE_DIR"] = str(Path(args.cache_dir).expanduser())
+        os.environ.pop("TIKTOKEN_CACHE_DIR", None)
+
+    start = time.perf_counter()
+    from voicebrief.gptapi import warmup  # Lazy import
+
+    cache_dir = warmup(args.model)
+    logging.getLogger("voicebrief.cli").info(
+        "tiktoken cache ready at %s (%.2fs)", cache_dir, time.perf_counter() - start
+    )
+
+
+def _add_queue_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=os.environ.get("VOICEBRIEF_QUEUE_DB"),
+        help="Job queue database, e.g. on a shared volume. Env fallback: VOICEBRIEF_QUEUE_DB.",
+    )
+    parser.add_argument(
+        "--journal-mode",
+        choices=["wal", "delete"],
+        default="wal",
+        help='SQLite journal mode (default: wal). Use "delete" when workers on different hosts share the '
+        "database over NFS.",
+    )
+    parser.add_argument("--log-level", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], default=None)
+    _add_log_format_argument(parser)
+
+
+def _add_log_format_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default=None,
+        help="Log output format. Env fallback: VOICEBRIEF_LOG_FORMAT (default: text).",
+    )
+
+
+def _open_queue(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    if not args.db:
+        parser.error("--db (or VOICEBRIEF_QUEUE_DB) is required")
+    from voicebrief.jobqueue import JobQueue  # Lazy import
+
+    return JobQueue(args.db, journal_mode=args.journal_mode)
+
+
+def _enqueue_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="voicebrief enqueue",
+        description="Add media files (or directories of them) to a shared job queue for voicebrief workers.",
+    )
+    parser.add_argument("paths", nargs="+", help="Media files or directories (searched recursively)")
+    _add_queue_arguments(parser)
+    parser.add_argument("--destination", type=str, default=None, help="Output directory for every job")
+    parser.add_argument("-v", "--video", action="store_true", help="Treat the files as video")
+    parser.add_argument("-m", "--markdown", action="store_true", help="Generate a markdown transcript")
+    parser.add_argument("-o", "--optimized", action="store_true", help="Generate an optimized transcript")
+    parser.add_argument("-c", "--custom-instructions", type=str, default=None)
+    parser.add_argument("--prompt-file", type=str, default=None)
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a job is dead-lettered")
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level, args.log_format)
+    from voicebrief.planner import discover_media  # Lazy import
+
+    options = {
+        "force_video": args.video,
+        "generate_markdown": args.markdown,
+        "generate_optimized": args.optimized,
+        "custom_instructions": _load_custom_instructions(args),
+    }
+    if args.destination:
+        options["destination"] = str(Path(args.destination).expanduser().resolve())
+    with _open_queue(parser, args) as queue:
+        for path in discover_media(args.paths):
+            job_id = queue.enqueue(path.resolve(), options, max_attempts=args.max_attempts)
+            print(f"{job_id}\t{path}")
+
+
+def _worker_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="voicebrief worker",
+        description="Claim jobs from a shared job queue and process them until stopped.",
+    )
+    _add_queue_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs processed at once (default: 1)")
+    parser.add_argument(
+        "--lease", type=float, default=120.0, help="Lease in seconds, renewed by heartbeats (default: 120)"
+    )
+    parser.add_argument("--poll", type=float, default=5.0, help="Seconds between polls of an empty queue")
+    parser.add_argument("--drain", action="store_true", help="Exit when no job is available")
+    parser.add_argument("--worker-id", type=str, default=None, help="Name of this worker (default: host:pid)")
+    parser.add_argument("--scratch-dir", type=str, default=None, help="Directory for intermediate files")
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level, args.log_format, queued=True)
+    from voicebrief.jobqueue import QueueWorker  # Lazy import
+
+    run_options = {}
+    if args.scratch_dir:
+        run_options["workspace"] = replace(workspace_config(), root=Path(args.scratch_dir).expanduser())
+    with _open_queue(parser, args) as queue:
+        worker = QueueWorker(
+            queue,
+            worker_id=args.worker_id,
+            concurrency=args.concurrency,
+            lease_seconds=args.lease,
+            poll_seconds=args.poll,
+            run_options=run_options,
+        )
+        log = logging.getLogger("voicebrief.cli")
+        log.info("Worker %s polling %s", worker.worker_id, queue.path)
+        finished = worker.run(drain=args.drain)
+        log.info("Worker %s finished %d job(s)", worker.worker_id, finished)
+
+
+def _queue_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="voicebrief queue",
+        description="Show the state of a shared job queue and manage dead-lettered jobs.",
+    )
+    _add_queue_arguments(parser)
+    parser.add_argument("--failed", action="store_true", help="List dead-lettered jobs with their last error")
+    parser.add_argument("--requeue-failed", action="store_true", help="Put dead-lettered jobs back in the queue")
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level, args.log_format)
+    from voicebrief.jobs import JobState  # Lazy import
+
+    with _open_queue(parser, args) as queue:
+        if args.requeue_failed:
+            print(f"Requeued {queue.requeue_failed()} job(s)")
+        print("  ".join(f"{state}={count}" for state, count in queue.counts().items()))
+        if args.failed:
+            for job in queue.jobs(JobState.FAILED):
+                print(f"{job.id}\t{job.source}\t{job.error}")
+
+
+def _serve_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="voicebrief serve",
+        description="Run a local HTTP service that accepts jobs and reports their status, progress and results.",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs processed concurrently (default: 2)")
+    parser.add_argument(
+        "--token",
+        type=str,
+        default=os.environ.get("VOICEBRIEF_SERVE_TOKEN"),
+        help="Require this bearer token on every request. Env fallback: VOICEBRIEF_SERVE_TOKEN.",
+    )
+    parser.add_argument(
+        "--no-warmup", action="store_true", help="Skip loading the tokenizer and API clients at startup"
+    )
+    parser.add_argument("--log-level", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], default=None)
+    _add_log_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level, args.log_format, queued=True)
+    from voicebrief.server import serve  # Lazy import
+
+    serve(args.host, args.port, args.workers, token=args.token, warm=not args.no_warmup)
+
+
+def _captions_main(argv: list[str]) -> None:
+    from voicebrief.captions import CAPTION_FORMATS, write_captions  # Lazy import
+
+    parser = argparse.ArgumentParser(
+        prog="voicebrief captions",
+        description="Render captions from a segments_<name>.json sidecar without calling the API.",
+    )
+    parser.add_argument("sidecar", help="Segment sidecar written by a run with --timestamps or --captions")
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="formats",
+        action="append",
+        choices=CAPTION_FORMATS,
+        help="Format to write (repeatable; default: srt)",
+    )
+    parser.add_argument("--destination", type=str, default=None, help="Output directory (default: next to the sidecar)")
+    args = parser.parse_args(argv)
+
+    output_dir = Path(args.destination).expanduser() if args.destination else None
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    for path in write_captions(Path(args.sidecar).expanduser(), args.formats or ["srt"], output_dir):
+        print(path)
+
+
+def _search_main(argv: list[str]) -> None:
+    import sqlite3  # Lazy import
+    from voicebrief.captions import format_timestamp  # Lazy import
+    from voicebrief.search import KINDS, SEARCH_INDEX_ENV, SearchIndex, search_index_path
+
+    parser = argparse.ArgumentParser(
+        prog="voicebrief search",
+        description="Search the full-text index of produced transcripts.",
+    )
+    parser.add_argument("query", nargs="*", help="Words that must all occur; end a word with * to match a prefix")
+    parser.add_argument("--index", type=str, default=None, help=f"Index database. Env fallback: {SEARCH_INDEX_ENV}.")
+    parser.add_argument(
+        "--add",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Index new or changed outputs under DIR before searching (repeatable)",
+    )
+    parser.add_argument("--kind", choices=KINDS, default=None, help="Only search this kind of output")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of hits (default: 20)")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to SQLite FTS5 unchanged")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format (default: text)")
+    args = parser.parse_args(argv)
+
+    index_path = search_index_path(args.index)
+    if index_path is None:
+        parser.error(f"no index given; use --index or set {SEARCH_INDEX_ENV}")
+    if not args.query and not args.add:
+        parser.error("a query or --add is required")
+
+    with SearchIndex(index_path) as index:
+        for directory in args.add:
+            added = index.index_directory(Path(directory))
+            print(f"Indexed {added} new or changed file(s) under {directory}", file=sys.stderr)
+        if not args.query:
+            return
+        start = time.perf_counter()
+        try:
+            hits = index.search(" ".join(args.query), limit=args.limit, kind=args.kind, raw=args.raw)
+        except sqlite3.OperationalError as exc:
+            parser.error(f"invalid query: {exc}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.format == "json":
+        print(json.dumps([hit.to_dict() for hit in hits], indent=2, ensure_ascii=False))
+        return
+    for hit in hits:
+        where = hit.source or hit.path.name
+        if hit.chunk_offset is not None:
+            where += f" @ {format_timestamp(hit.chunk_offset)[:8]}"
+        print(f"{hit.score:7.2f}  {where}  ({hit.kind})\n         {hit.path}\n         {hit.snippet}")
+    print(f"{len(hits)} hit(s) in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+def _bulk_main(argv: list[str]) -> None:
+    from voicebrief.batch import (  # Lazy import
+        BACKENDS,
+        DEFAULT_POLL_SECONDS,
+        discover_transcripts,
+        load_groups,
+        run_bulk,
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="voicebrief bulk",
+        description="Post-process many transcripts as one Batch API job and write the usual output files.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Transcript files, or directories searched for transcription_*.txt (not needed to resume)",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=str,
+        required=True,
+        help="Directory for the batch requests and manifest; run again with it to resume polling",
+    )
+    parser.add_argument("-o", "--optimized", action="store_true", help="Generate optimized transcripts")
+    parser.add_argument("-m", "--markdown", action="store_true", help="Generate markdown transcripts")
+    parser.add_argument("-s", "--summary", action="store_true", help="Generate summaries (summary_<name>.md)")
+    parser.add_argument("--destination", type=str, default=None, help="Output directory (default: next to each input)")
+    parser.add_argument("-c", "--custom-instructions", type=str, default=None)
+    parser.add_argument("--prompt-file", type=str, default=None)
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="openai",
+        help="openai (Batch API) or local (answers in-process with the request text, for offline tests)",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=DEFAULT_POLL_SECONDS,
+        help=f"Seconds between status checks (default: {DEFAULT_POLL_SECONDS:.0f})",
+    )
+    parser.add_argument("--timeout", type=float, default=None, help="Stop waiting after this many seconds")
+    parser.add_argument("--log-level", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], default=None)
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level)
+    work_dir = Path(args.work_dir).expanduser()
+    requested = (("optimize", args.optimized), ("markdown", args.markdown), ("summary", args.summary))
+    tasks = [task for task, wanted in requested if wanted]
+    resuming = (work_dir / "manifest.json").exists()
+    if not resuming and not (args.paths and tasks):
+        parser.error("give transcripts and at least one of -o, -m, -s (or a --work-dir to resume)")
+    groups = discover_transcripts(Path(p) for p in args.paths) if not resuming else []
+    if not resuming and not groups:
+        parser.error("no transcripts found")
+
+    try:
+        result = run_bulk(
+            load_groups(groups),
+            tasks,
+            work_dir,
+            backend=BACKENDS[args.backend](),
+            destination=Path(args.destination).expanduser() if args.destination else None,
+            custom_instructions=_load_custom_instructions(args),
+            poll_seconds=args.poll,
+            timeout_seconds=args.timeout,
+        )
+    except (TimeoutError, ValueError, RuntimeError) as exc:
+        logging.getLogger("voicebrief.cli").error("%s", exc)
+        sys.exit(1)
+    for path in result.written:
+        print(path)
+    if result.failed:
+        logging.getLogger("voicebrief.cli").error(
+            "Batch %s %s; %d output(s) not written: %s",
+            result.batch_id,
+            result.status,
+            len(result.failed),
+            ", ".join(str(path) for path in result.failed),
+        )
+        sys.exit(1)
+
+
+# Sub-commands take precedence over a media path with the same name.
+_COMMANDS: Dict[str, Callable[[list[str]], None]] = {
+    "warmup": _warmup_main,
+    "captions": _captions_main,
+    "search": _search_main,
+    "bulk": _bulk_main,
+    "enqueue": _enqueue_main,
+    "worker": _worker_main,
+    "queue": _queue_main,
+    "serve": _serve_main,
+}
+
+
 def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
     try:
+        if argv and argv[0] in _COMMANDS:
+            _COMMANDS[argv[0]](argv[1:])
+            return
+
         parser = argparse.ArgumentParser(
             description="""Voicebrief - Converts video / audio conversations
-to text and subsequently provides a summary into a managable report."""
+to text and subsequently provides a summary into a managable report.""",
+            epilog=f"Other commands: {', '.join(sorted(_COMMANDS))} "
+            '(run "voicebrief <command> --help" for details).',
         )
         parser.add_argument("path", type=str, nargs="?", help="Path to the media file")
         parser.add_argument(
@@ -88,6 +467,155 @@ to text and subsequently provides a summary into a managable report."""
             default=None,
             help="Set log level. Env fallback: VOICEBRIEF_LOG_LEVEL.",
         )
+        _add_log_format_argument(parser)
+        parser.add_argument(
+            "--log-queue",
+            action="store_true",
+            help="Write logs from a background thread so processing never waits on log output. "
+            "Env fallback: VOICEBRIEF_LOG_QUEUE.",
+        )
+        parser.add_argument(
+            "--metrics-out",
+            type=str,
+            default=None,
+            help="Write run metrics to this file (Prometheus text for .prom, JSON otherwise).",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Record cProfile stats and a Chrome trace timeline (viewable in Perfetto) next to the outputs.",
+        )
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=1.0,
+            help="Speed the audio up by this factor before transcription, e.g. 1.25-1.5 "
+            "(pitch is preserved; default: 1.0).",
+        )
+        parser.add_argument(
+            "--remove-silence",
+            type=float,
+            default=None,
+            metavar="SECONDS",
+            help="Cut silences longer than SECONDS before transcription.",
+        )
+        parser.add_argument(
+            "--silence-threshold",
+            type=float,
+            default=-35.0,
+            metavar="DB",
+            help="Level in dB below which audio counts as silence (default: -35).",
+        )
+        parser.add_argument(
+            "--segmentation",
+            choices=["auto", "copy", "range"],
+            default="auto",
+            help="How audio is split into chunks: stream copy in one ffmpeg process, or parallel "
+            "re-encoding of time ranges (default: auto, range for video and WAV/FLAC sources).",
+        )
+        parser.add_argument(
+            "--segment-workers",
+            type=int,
+            default=None,
+            help="Parallel ffmpeg processes for range segmentation (default: CPU count).",
+        )
+        parser.add_argument(
+            "--chunk-overlap",
+            type=float,
+            default=0.0,
+            metavar="SECONDS",
+            help="Audio shared by neighbouring chunks; the duplicated words are removed when the "
+            "transcripts are stitched (implies range segmentation; default: 0).",
+        )
+        parser.add_argument(
+            "--request-deadline",
+            type=float,
+            default=None,
+            metavar="SECONDS",
+            help="Fail a transcription request that takes longer than SECONDS.",
+        )
+        parser.add_argument(
+            "--hedge-percentile",
+            type=float,
+            default=None,
+            metavar="P",
+            help="Send a duplicate of a transcription request still running after the P-th percentile "
+            "of recent latencies and keep the first reply (e.g. 95).",
+        )
+        parser.add_argument(
+            "--hedge-budget",
+            type=float,
+            default=0.2,
+            metavar="FRACTION",
+            help="Cap on hedged uploads as a fraction of the audio sent (default: 0.2).",
+        )
+        parser.add_argument(
+            "--timestamps",
+            action="store_true",
+            help="Request segment timestamps and write them to segments_<name>.json.",
+        )
+        parser.add_argument(
+            "--captions",
+            action="append",
+            choices=["srt", "vtt", "md"],
+            default=[],
+            metavar="FORMAT",
+            help="Write captions (srt, vtt or md for timestamped markdown; repeatable). Implies --timestamps.",
+        )
+        parser.add_argument(
+            "--search-index",
+            type=str,
+            default=None,
+            metavar="PATH",
+            help="Add every transcript written to this full-text index (see 'voicebrief search'). "
+            "Env fallback: VOICEBRIEF_SEARCH_INDEX.",
+        )
+        parser.add_argument(
+            "--fingerprint-db",
+            type=str,
+            default=None,
+            metavar="PATH",
+            help="Registry of processed inputs; a copy of an already processed recording reuses its outputs. "
+            "Env fallback: VOICEBRIEF_FINGERPRINT_DB.",
+        )
+        parser.add_argument(
+            "--reuse",
+            choices=["copy", "link"],
+            default="copy",
+            help="How reused outputs are placed in the destination: copy (default) or hard link "
+            "(copying across file systems).",
+        )
+        parser.add_argument(
+            "--plan",
+            action="store_true",
+            help='Estimate chunks, requests, tokens, time and cost for "path" (a file or a directory) '
+            "without calling the API, then exit.",
+        )
+        parser.add_argument(
+            "--plan-format",
+            choices=["table", "json"],
+            default="table",
+            help="Output format of --plan (default: table).",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of files processed concurrently, assumed by the --plan time estimate (default: 1).",
+        )
+        parser.add_argument(
+            "--scratch-dir",
+            type=str,
+            default=None,
+            help="Directory for intermediate files, e.g. on tmpfs or a local SSD. "
+            "Env fallback: VOICEBRIEF_SCRATCH_DIR (default: system temp dir).",
+        )
+        parser.add_argument(
+            "--keep-scratch-on-failure",
+            action="store_true",
+            help="Keep intermediate files of a failed run for debugging. "
+            "Env fallback: VOICEBRIEF_KEEP_SCRATCH_ON_FAILURE.",
+        )
         parser.add_argument(
             "-g",
             "--gui",
@@ -109,6 +637,29 @@ to text and subsequently provides a summary into a managable report."""
                     args.custom_instructions,
                     args.prompt_file,
                     args.log_level,
+                    args.log_format,
+                    args.log_queue,
+                    args.metrics_out,
+                    args.profile,
+                    args.scratch_dir,
+                    args.keep_scratch_on_failure,
+                    args.plan,
+                    args.plan_format != "table",
+                    args.jobs != 1,
+                    args.speed != 1.0,
+                    args.remove_silence,
+                    args.silence_threshold != -35.0,
+                    args.segmentation != "auto",
+                    args.segment_workers,
+                    args.chunk_overlap,
+                    args.request_deadline,
+                    args.hedge_percentile,
+                    args.hedge_budget != 0.2,
+                    args.timestamps,
+                    args.captions,
+                    args.search_index,
+                    args.fingerprint_db,
+                    args.reuse != "copy",
                 )
             ):
                 parser.error("--gui cannot be combined with other arguments.")
@@ -123,10 +674,40 @@ to text and subsequently provides a summary into a managable report."""
 
         # Configure logging
         level = "DEBUG" if args.verbose else args.log_level
-        configure_logging(level)
+        configure_logging(level, args.log_format, queued=args.log_queue or None)
         log = logging.getLogger("voicebrief.cli")
         log.debug("CLI started with args: %s", vars(args))
+
+        if args.plan:
+            if args.destination:
+                parser.error("--plan takes a single file or directory and no destination.")
+            from voicebrief.planner import plan_paths  # Lazy import
+
+            plan = plan_paths(
+                [args.path],
+                force_video=args.video,
+                generate_optimized=args.optimized,
+                generate_markdown=args.markdown,
+                jobs=args.jobs,
+            )
+            print(plan.to_json() if args.plan_format == "json" else plan.format_table())
+            return
         custom_instructions = _load_custom_instructions(args)
+        scratch = workspace_config()
+        if args.scratch_dir:
+            scratch = replace(scratch, root=Path(args.scratch_dir).expanduser())
+        if args.keep_scratch_on_failure:
+            scratch = replace(scratch, keep_on_failure=True)
+
+        hedging = None
+        if args.request_deadline is not None or args.hedge_percentile is not None:
+            from voicebrief.hedging import HedgePolicy  # Lazy import
+
+            hedging = HedgePolicy(
+                deadline_seconds=args.request_deadline,
+                hedge_percentile=args.hedge_percentile,
+                max_extra_fraction=args.hedge_budget,
+            )
 
         result = run_voicebrief(
             Path(args.path),
@@ -137,13 +718,38 @@ to text and subsequently provides a summary into a managable report."""
             generate_optimized=args.optimized,
             custom_instructions=custom_instructions,
             logger=log,
+            profile=args.profile,
+            workspace=scratch,
+            speed=args.speed,
+            remove_silence=args.remove_silence,
+            silence_threshold_db=args.silence_threshold,
+            segmentation=args.segmentation,
+            segment_workers=args.segment_workers,
+            chunk_overlap=args.chunk_overlap,
+            hedging=hedging,
+            timestamps=args.timestamps,
+            captions=args.captions,
+            search_index=args.search_index,
+            fingerprint_registry=args.fingerprint_db,
+            reuse=args.reuse,
         )
 
         log.info("Processing complete for %s", result.source_path)
+        if result.reused_from:
+            log.info("Outputs reused from %s", result.reused_from)
+        if result.stitched_transcript:
+            log.info("Consolidated transcript available at %s", result.stitched_transcript.text_path)
+        for caption_path in result.caption_paths:
+            log.info("Captions available at %s", caption_path)
         if result.optimized_transcript:
             log.info("Optimized transcript available at %s", result.optimized_transcript.text_path)
         if result.markdown_transcript:
             log.info("Markdown transcript available at %s", result.markdown_transcript.text_path)
+        if args.metrics_out:
+            metrics_path = result.metrics.write(Path(args.metrics_out).expanduser())
+            log.info("Run metrics written to %s", metrics_path)
+        for profile_path in result.profile_outputs:
+            log.info("Profile output available at %s", profile_path)
 
     except Exception as e:
         if os.environ.get("VOICEBRIEF_LOG_LEVEL", "").upper() == "DEBUG":
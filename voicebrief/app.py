@@ -1,29 +1,107 @@
 """High-level orchestration helpers for running Voicebrief workflows."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
 import logging
+import queue
+import threading
+import time
+import uuid
 
-from voicebrief.audio import partition_sound_file
+from voicebrief.audio import (
+    MAX_CHUNK_SIZE_MB,
+    REENCODE_EXTENSIONS,
+    partition_by_ranges,
+    partition_sound_file,
+    probe_duration_seconds,
+)
+from voicebrief.cancel import CancellationToken, raise_if_cancelled
+from voicebrief.captions import (
+    CAPTION_FORMATS,
+    Segment,
+    merge_chunk_segments,
+    remap_segments,
+    write_captions,
+    write_sidecar,
+)
+from voicebrief.fingerprint import (
+    REUSE_MODES,
+    FingerprintRegistry,
+    RegisteredOutputs,
+    fingerprint,
+    registry_path,
+)
+from voicebrief.hedging import HedgePolicy, Hedger
+from voicebrief.logging_utils import log_context
+from voicebrief.metrics import RunMetrics
+from voicebrief.profiling import ProfileSession, span
+from voicebrief.progress import ProgressCallback, ProgressEvent, ProgressReporter
+from voicebrief.search import SearchIndex, chunk_offset, index_transcripts, search_index_path
+from voicebrief.timeline import TimeMap
+from voicebrief.workspace import Workspace, WorkspaceConfig, workspace_config
 
 if TYPE_CHECKING:  # pragma: no cover - typing helper
-    from voicebrief.data import Transcript
+    from voicebrief.data import AnyTranscript
 
 _VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".webm"}
+# Scratch space needed per second of extracted audio: the 44.1 kHz 16-bit
+# stereo WAV written by moviepy plus the 128 kbit/s MP3 made from it.
+_EXTRACTION_BYTES_PER_SECOND = 44_100 * 2 * 2 + 128_000 // 8
+_SEGMENTATION_MODES = ("auto", "copy", "range")
 
 
 @dataclass(frozen=True)
 class VoicebriefResult:
-    """Outcome of processing a single media source."""
+    """Outcome of processing a single media source.
+
+    ``audio_path`` is the audio that was partitioned. It points into the run's
+    scratch workspace when audio was extracted from a video or preprocessed,
+    and that file is removed when the run ends. ``time_map`` maps timestamps
+    on ``audio_path`` back to the source. ``reused_from`` names the earlier
+    source whose outputs were linked or copied instead of processing again.
+    """
 
     source_path: Path
     audio_path: Path
-    transcripts: List["Transcript"]
-    optimized_transcript: Optional["Transcript"]
-    markdown_transcript: Optional["Transcript"]
+    transcripts: List["AnyTranscript"]
+    optimized_transcript: Optional["AnyTranscript"]
+    markdown_transcript: Optional["AnyTranscript"]
     extracted_audio: bool
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    profile_outputs: List[Path] = field(default_factory=list)
+    time_map: TimeMap = field(default_factory=TimeMap)
+    stitched_transcript: Optional["AnyTranscript"] = None
+    segments_path: Optional[Path] = None
+    caption_paths: List[Path] = field(default_factory=list)
+    reused_from: Optional[Path] = None
+
+
+def _probe_chunk_spans(
+    chunks: Sequence[Path], total_seconds: Optional[float], cancel_token: Optional[CancellationToken]
+) -> List[Tuple[float, float]]:
+    """``(start, duration)`` of consecutive stream-copied chunks, from their probed durations."""
+    if len(chunks) == 1:
+        return [(0.0, total_seconds or 0.0)]
+    spans = []
+    start = 0.0
+    for chunk in chunks:
+        duration = probe_duration_seconds(chunk, cancel_token)
+        spans.append((start, duration))
+        start += duration
+    return spans
+
+
+@contextmanager
+def _stage(metrics: RunMetrics, reporter: ProgressReporter, name: str) -> Iterator[None]:
+    """Time a pipeline stage for the metrics, the profiling timeline and progress."""
+    reporter.stage_started(name)
+    start = time.perf_counter()
+    with span(name, "stage"), metrics.stage(name):
+        yield
+    reporter.stage_finished(name, time.perf_counter() - start)
 
 
 def run_voicebrief(
@@ -35,9 +113,33 @@ def run_voicebrief(
     generate_optimized: bool = False,
     custom_instructions: str | None = None,
     logger: Optional[logging.Logger] = None,
+    profile: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
+    workspace: Optional[WorkspaceConfig] = None,
+    lazy_transcripts: bool = False,
+    speed: float = 1.0,
+    remove_silence: Optional[float] = None,
+    silence_threshold_db: float = -35.0,
+    segmentation: str = "auto",
+    segment_workers: Optional[int] = None,
+    chunk_overlap: float = 0.0,
+    hedging: Optional[HedgePolicy] = None,
+    run_id: Optional[str] = None,
+    timestamps: bool = False,
+    captions: Sequence[str] = (),
+    search_index: Path | str | None = None,
+    fingerprint_registry: Path | str | None = None,
+    reuse: str = "copy",
 ) -> VoicebriefResult:
     """Run the Voicebrief pipeline for a media file.
 
+    With more than one chunk, the chunk transcripts are also merged into
+    ``transcription_<stem>.txt`` (``VoicebriefResult.stitched_transcript``).
+    That file is appended in chunk order as soon as each prefix of chunks
+    has been transcribed, so it can be followed while the run is going
+    (see :class:`voicebrief.data.RollingTranscript`).
+
     Parameters
     ----------
     source_path:
@@ -60,10 +162,128 @@ def run_voicebrief(
     logger:
         Optional logger to record progress. When ``None`` the module logger is
         used.
+    profile:
+        When ``True``, record cProfile statistics and a Chrome trace-event
+        timeline of the run as ``profile_<stem>.pstats`` and
+        ``profile_<stem>.trace.json`` in the output directory.
+    cancel_token:
+        Optional token to stop the run from another thread. Running ffmpeg
+        processes are killed, in-flight API calls are abandoned, intermediate
+        files are removed and :class:`ProcessingCancelled` is raised.
+    progress:
+        Optional callback receiving typed events from
+        :mod:`voicebrief.progress` (stage started/finished, chunk n/m started
+        and transcribed with bytes uploaded and ETA, run finished). It is
+        called on the thread doing the work.
+    workspace:
+        Scratch workspace settings for intermediate files (extracted audio
+        and chunks). When ``None`` they are read from the environment with
+        :func:`voicebrief.workspace.workspace_config`. The workspace is
+        removed when the run ends; failed runs keep it if
+        ``keep_on_failure`` is set. Exceeding a disk budget raises
+        :class:`voicebrief.workspace.ScratchBudgetExceeded`.
+    lazy_transcripts:
+        When ``True``, the result holds :class:`voicebrief.data.LazyTranscript`
+        objects that read their text from disk on demand, and post-processing
+        output is streamed to disk. Memory then stays flat regardless of the
+        transcript volume, which matters when many files are processed in one
+        process.
+    speed:
+        Tempo factor applied before partitioning (ffmpeg ``atempo``, pitch
+        preserved). Values such as 1.25-1.5 shorten the audio that is
+        uploaded and billed. Timestamps are mapped back through
+        ``VoicebriefResult.time_map``.
+    remove_silence:
+        When set, cut silences longer than this many seconds before
+        partitioning. A short margin of each silence is kept around the
+        speech. The removed duration is reported as
+        ``metrics.removed_audio_seconds``, and ``VoicebriefResult.time_map``
+        maps the trimmed timeline back to the original.
+    silence_threshold_db:
+        Level below which audio counts as silence for ``remove_silence``.
+    segmentation:
+        ``"copy"`` splits the audio with a single ffmpeg process that copies
+        the stream. ``"range"`` plans time ranges from the probed duration
+        and encodes each chunk to MP3 in its own ffmpeg process, in
+        parallel. ``"auto"`` (default) picks ``"range"`` for video and
+        uncompressed/lossless sources, which need re-encoding anyway. For
+        video this also replaces the separate extraction step. Without
+        preprocessing it picks ``"copy"`` otherwise.
+    segment_workers:
+        Maximum number of parallel ffmpeg processes in ``"range"`` mode
+        (default: CPU count).
+    chunk_overlap:
+        Seconds of audio shared by neighbouring chunks, so a word cut at a
+        chunk boundary is transcribed whole at least once. The duplicated
+        text is removed from the consolidated transcript (see below) and
+        from the post-processing input, as by
+        :func:`voicebrief.stitch.stitch_pieces`; seams are only searched
+        among the words this much audio can hold. Requires ``"range"``
+        segmentation; ``"auto"`` selects it.
+    hedging:
+        Deadline and hedging policy for transcription requests. A request
+        running past ``deadline_seconds`` raises
+        :class:`voicebrief.hedging.DeadlineExceeded`. With
+        ``hedge_percentile`` set, a chunk still running after that percentile
+        of recent latencies is sent again and the first reply wins, within
+        the ``max_extra_fraction`` spend cap. Hedges issued and won are
+        counted in ``metrics.hedges_issued`` and ``metrics.hedges_won``.
+    run_id:
+        Identifier attached to every log record of the run, together with
+        the source file name and the chunk index (see
+        :func:`voicebrief.logging_utils.log_context`). A random one is
+        generated when ``None``.
+    timestamps:
+        Request segment timestamps with each transcription, map them onto
+        the source timeline (chunk offsets, then ``time_map``) and store
+        them in ``segments_<stem>.json`` (``VoicebriefResult.segments_path``).
+    captions:
+        Caption formats to render from that sidecar: ``"srt"``, ``"vtt"``
+        and/or ``"md"`` (timestamped markdown). Implies ``timestamps``; see
+        :mod:`voicebrief.captions`.
+    search_index:
+        SQLite full-text index that every transcript written by the run is
+        added to, keyed by source and chunk offset (see
+        :mod:`voicebrief.search`). Falls back to ``VOICEBRIEF_SEARCH_INDEX``;
+        nothing is indexed when neither is set.
+    fingerprint_registry:
+        SQLite registry of processed inputs (see
+        :mod:`voicebrief.fingerprint`). Right after probing, before any
+        extraction, segmentation or API call, the source's sampled
+        fingerprint and duration are looked up. If the same content was
+        processed with the same output options, and its outputs still
+        exist, those outputs are placed in the destination instead.
+        Successful runs are registered. Falls back to
+        ``VOICEBRIEF_FINGERPRINT_DB``; nothing is deduplicated when neither
+        is set.
+    reuse:
+        How reused outputs are placed: ``"copy"`` (default) or ``"link"``
+        (hard link, copying across file systems).
     """
 
     log = logger or logging.getLogger("voicebrief.app")
+    metrics = RunMetrics()
+    reporter = ProgressReporter(progress)
+    run_start = time.perf_counter()
 
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+    if segmentation not in _SEGMENTATION_MODES:
+        raise ValueError(f"segmentation must be one of {', '.join(_SEGMENTATION_MODES)}, got {segmentation!r}")
+    unknown_captions = set(captions) - set(CAPTION_FORMATS)
+    if unknown_captions:
+        raise ValueError(
+            f"captions must be among {', '.join(CAPTION_FORMATS)}, got {', '.join(sorted(unknown_captions))}"
+        )
+    timestamps = timestamps or bool(captions)
+    if reuse not in REUSE_MODES:
+        raise ValueError(f"reuse must be one of {', '.join(REUSE_MODES)}, got {reuse!r}")
+    if chunk_overlap < 0:
+        raise ValueError(f"chunk_overlap must not be negative, got {chunk_overlap}")
+    if chunk_overlap and segmentation == "copy":
+        raise ValueError("chunk_overlap requires range segmentation")
+    if remove_silence is not None and remove_silence <= 0:
+        raise ValueError(f"remove_silence must be a positive number of seconds, got {remove_silence}")
     src_path = Path(source_path).expanduser()
     if not src_path.exists():
         raise FileNotFoundError(f"File {src_path} does not exist")
@@ -74,62 +294,413 @@ def run_voicebrief(
             raise NotADirectoryError(f"Destination must be a directory: {dest_path}")
         dest_path.mkdir(parents=True, exist_ok=True)
 
-    needs_extraction = force_video
-    if not needs_extraction and auto_detect_video:
-        needs_extraction = src_path.suffix.lower() in _VIDEO_EXTENSIONS
-
-    if needs_extraction:
-        log.info("Extracting audio from video: %s", src_path)
-        from voicebrief.video import video_to_audio  # Lazy import
-
-        audio_path = video_to_audio(src_path)
-        log.info("Audio extracted to: %s", audio_path)
-    else:
-        audio_path = src_path
-
-    log.debug("Partitioning audio: %s", audio_path)
-    audio_chunks = partition_sound_file(audio_path)
-    log.info("Processing %d audio chunk(s)", len(audio_chunks))
-
-    from voicebrief.gptapi import transcribe_audio
-
-    transcripts: List["Transcript"] = []
-    for chunk in audio_chunks:
-        log.info("Transcribing chunk: %s", chunk)
-        transcript = transcribe_audio(chunk, dest_path)
-        transcripts.append(transcript)
-
-    if not transcripts:
-        raise RuntimeError("No transcripts generated. Check the input media file.")
-
-    log.info("All transcripts saved to: %s", transcripts[0].text_path.parent)
-    
-    optimized_transcript: Optional["Transcript"] = None
-    markdown_transcript: Optional["Transcript"] = None
-    
-    if generate_optimized:
-        from voicebrief.gptapi import optimize_transcriptions
-        optimized_transcript = optimize_transcriptions(
-            transcripts,
-            dest_path,
-            custom_instructions=custom_instructions,
+    output_dir = dest_path or src_path.parent
+    index_path = search_index_path(search_index)
+    registry_file = registry_path(fingerprint_registry)
+
+    with ExitStack() as stack:
+        stack.enter_context(log_context(run_id=run_id or uuid.uuid4().hex[:12], file=src_path.name))
+        if index_path is not None:
+            searchable = stack.enter_context(SearchIndex(index_path))
+            stack.enter_context(index_transcripts(searchable, src_path))
+        session: Optional[ProfileSession] = None
+        if profile:
+            session = stack.enter_context(ProfileSession(output_dir, src_path.stem))
+            log.info("Profiling enabled; writing %s", ", ".join(str(p) for p in session.outputs))
+        scratch = stack.enter_context(Workspace(workspace or workspace_config(), src_path.stem))
+        raise_if_cancelled(cancel_token)
+
+        needs_extraction = force_video
+        if not needs_extraction and auto_detect_video:
+            needs_extraction = src_path.suffix.lower() in _VIDEO_EXTENSIONS
+
+        # ffprobe reads the duration of video containers too, so probing the
+        # source up front also sizes the extraction for the scratch budget.
+        with _stage(metrics, reporter, "probe"):
+            try:
+                metrics.audio_seconds = probe_duration_seconds(src_path, cancel_token)
+            except (OSError, RuntimeError, ValueError) as exc:
+                log.debug("Could not probe audio duration of %s: %s", src_path, exc)
+
+        registry: Optional[FingerprintRegistry] = None
+        input_key: Optional[str] = None
+        # Settings that change the outputs; a registered run is only reused for the same ones.
+        output_options = {
+            "speed": speed,
+            "remove_silence": remove_silence,
+            "silence_threshold_db": silence_threshold_db if remove_silence is not None else None,
+            "chunk_overlap": chunk_overlap,
+            "timestamps": timestamps,
+            "captions": sorted(set(captions)),
+            "optimized": generate_optimized,
+            "markdown": generate_markdown,
+            "custom_instructions": custom_instructions if generate_optimized or generate_markdown else None,
+        }
+        if registry_file is not None:
+            registry = stack.enter_context(FingerprintRegistry(registry_file))
+            with _stage(metrics, reporter, "fingerprint"):
+                input_key = fingerprint(src_path)
+                previous = registry.lookup(input_key, metrics.audio_seconds, output_options)
+            if previous is not None:
+                log.info("Same content as %s; reusing its outputs", previous.source)
+                result = _reused_result(
+                    previous, src_path, output_dir, reuse, metrics, lazy_transcripts, run_start
+                )
+                reporter.run_finished(result)
+                return result
+
+        preprocessing = remove_silence is not None or speed != 1.0
+        reencoded_source = needs_extraction or src_path.suffix.lower() in REENCODE_EXTENSIONS
+        range_mode = segmentation == "range" or chunk_overlap > 0 or (
+            segmentation == "auto" and reencoded_source and not preprocessing
         )
-        log.info("Optimized transcript written to: %s", optimized_transcript.text_path)
-    
-    if generate_markdown:
-        from voicebrief.gptapi import generate_markdown_transcript
-        markdown_transcript = generate_markdown_transcript(
-            transcripts,
-            dest_path,
-            custom_instructions=custom_instructions,
+        if range_mode and not metrics.audio_seconds:
+            log.warning("Duration of %s is unknown; falling back to copy segmentation", src_path)
+            range_mode = False
+        overlap = chunk_overlap if range_mode else 0.0
+
+        if needs_extraction and range_mode and not preprocessing:
+            # The range encoders read the audio track straight from the video.
+            log.info("Extracting and segmenting audio from video in parallel: %s", src_path)
+            audio_path = src_path
+        elif needs_extraction:
+            log.info("Extracting audio from video: %s", src_path)
+            from voicebrief.video import video_to_audio  # Lazy import
+
+            if metrics.audio_seconds:
+                scratch.reserve(
+                    int(metrics.audio_seconds * _EXTRACTION_BYTES_PER_SECOND), "audio extraction"
+                )
+            with _stage(metrics, reporter, "extraction"):
+                audio_path = video_to_audio(src_path, scratch.path / (src_path.stem + ".wav"))
+            scratch.check()
+            raise_if_cancelled(cancel_token)
+            log.info("Audio extracted to: %s", audio_path)
+        else:
+            audio_path = src_path
+
+        time_map = TimeMap.identity()
+        metrics.processed_audio_seconds = metrics.audio_seconds
+        keep: Optional[List[Tuple[float, float]]] = None
+        if remove_silence is not None and metrics.audio_seconds:
+            from voicebrief.preprocess import detect_silences, kept_ranges
+
+            with _stage(metrics, reporter, "silence"):
+                silences = detect_silences(
+                    audio_path,
+                    remove_silence,
+                    silence_threshold_db,
+                    metrics.audio_seconds,
+                    cancel_token,
+                )
+            keep = kept_ranges(silences, metrics.audio_seconds)
+            kept_seconds = sum(end - start for start, end in keep)
+            metrics.removed_audio_seconds = metrics.audio_seconds - kept_seconds
+            metrics.processed_audio_seconds = kept_seconds
+            log.info(
+                "Removing %.1fs of silence (%.0f%% of %.1fs) in %d cut(s)",
+                metrics.removed_audio_seconds,
+                100 * metrics.removed_audio_seconds / metrics.audio_seconds,
+                metrics.audio_seconds,
+                max(0, len(keep) - 1),
+            )
+            if metrics.removed_audio_seconds <= 0:
+                keep = None
+        elif remove_silence is not None:
+            log.warning("Duration of %s is unknown; skipping silence removal", audio_path)
+
+        if keep is not None or speed != 1.0:
+            from voicebrief.preprocess import encoder_bitrate, render
+
+            bitrate = encoder_bitrate(audio_path.stat().st_size, metrics.audio_seconds)
+            if metrics.processed_audio_seconds:
+                metrics.processed_audio_seconds /= speed
+                scratch.reserve(int(metrics.processed_audio_seconds * bitrate / 8), "preprocessed audio")
+            log.info(
+                "Preprocessing audio (speed %.2fx, silence removal %s): %s",
+                speed,
+                "on" if keep is not None else "off",
+                audio_path,
+            )
+            with _stage(metrics, reporter, "preprocess"):
+                audio_path, time_map = render(
+                    audio_path,
+                    scratch.path / f"{src_path.stem}_preprocessed.mp3",
+                    keep,
+                    speed,
+                    bitrate,
+                    cancel_token,
+                )
+            scratch.check()
+            try:
+                metrics.processed_audio_seconds = probe_duration_seconds(audio_path, cancel_token)
+            except (OSError, RuntimeError, ValueError) as exc:
+                log.debug("Could not probe duration of %s: %s", audio_path, exc)
+
+        log.debug("Partitioning audio (%s mode): %s", "range" if range_mode else "copy", audio_path)
+        chunk_dir = scratch.path / (audio_path.stem + "_chunks")
+        if range_mode and metrics.processed_audio_seconds:
+            from voicebrief.preprocess import encoder_bitrate
+
+            bitrate = encoder_bitrate(audio_path.stat().st_size, metrics.processed_audio_seconds)
+            scratch.reserve(int(metrics.processed_audio_seconds * bitrate / 8), "audio chunks")
+            with _stage(metrics, reporter, "segmentation"):
+                ranges = partition_by_ranges(
+                    audio_path,
+                    metrics.processed_audio_seconds,
+                    bitrate=bitrate,
+                    output_dir=chunk_dir,
+                    workers=segment_workers,
+                    cancel_token=cancel_token,
+                    overlap_seconds=overlap,
+                )
+            audio_chunks = [chunk.path for chunk in ranges]
+            chunk_spans = [(chunk.start, chunk.duration) for chunk in ranges]
+        else:
+            audio_size = audio_path.stat().st_size
+            if audio_size >= MAX_CHUNK_SIZE_MB * 1024 * 1024:
+                scratch.reserve(audio_size, "audio chunks")
+            with _stage(metrics, reporter, "segmentation"):
+                audio_chunks = partition_sound_file(
+                    audio_path,
+                    duration_seconds=metrics.processed_audio_seconds,
+                    cancel_token=cancel_token,
+                    output_dir=chunk_dir,
+                )
+            chunk_spans = []
+            if timestamps or index_path is not None:
+                chunk_spans = _probe_chunk_spans(audio_chunks, metrics.processed_audio_seconds, cancel_token)
+        scratch.check()
+        log.info("Processing %d audio chunk(s)", len(audio_chunks))
+
+        from voicebrief.data import LazyTranscript, RollingTranscript, Transcript
+        from voicebrief.stitch import seam_window
+        from voicebrief.gptapi import transcribe_audio, transcribe_audio_segments, transcription_output_path
+
+        consolidated: Optional[RollingTranscript] = None
+        # Stitched pieces of overlapping chunks, named like the chunk transcripts.
+        piece_paths: List[Path] = []
+        if len(audio_chunks) > 1:
+            if overlap:
+                pieces_dir = scratch.path / "stitched"
+                pieces_dir.mkdir()
+                piece_paths = [transcription_output_path(chunk, pieces_dir) for chunk in audio_chunks]
+            consolidated = stack.enter_context(
+                RollingTranscript(
+                    output_dir / f"transcription_{src_path.stem}.txt",
+                    len(audio_chunks),
+                    stitch=overlap > 0,
+                    keep_pieces=not lazy_transcripts,
+                    # Chunks are cut from the sped-up audio, so the overlap holds more speech.
+                    window_words=seam_window(overlap * speed),
+                    piece_paths=piece_paths or None,
+                )
+            )
+
+        hedger = Hedger(hedging, metrics=metrics) if hedging is not None else None
+        transcripts: List["AnyTranscript"] = []
+        chunk_segments: List[List[Segment]] = []
+        chunk_sizes = [chunk.stat().st_size for chunk in audio_chunks]
+        reporter.chunks_planned(chunk_sizes)
+        with _stage(metrics, reporter, "transcription"):
+            for index, (chunk, size) in enumerate(zip(audio_chunks, chunk_sizes), start=1):
+                reporter.chunk_started(index, chunk, size)
+                chunk_start = time.perf_counter()
+                offset = time_map.to_original(chunk_spans[index - 1][0]) if chunk_spans else None
+                with span("transcribe " + chunk.name, "chunk"), log_context(chunk=index), chunk_offset(offset):
+                    log.info("Transcribing chunk: %s", chunk)
+                    if timestamps:
+                        transcript, segments = transcribe_audio_segments(
+                            chunk, output_dir, cancel_token=cancel_token, hedger=hedger
+                        )
+                        if segments is None:
+                            log.warning("No timestamps returned for %s; using the whole chunk", chunk.name)
+                            duration = chunk_spans[index - 1][1]
+                            segments = [Segment(0.0, duration, transcript.text.strip())] if transcript.text else []
+                        chunk_segments.append(segments)
+                    else:
+                        transcript = transcribe_audio(chunk, output_dir, cancel_token=cancel_token, hedger=hedger)
+                if consolidated is not None:
+                    consolidated.add(index - 1, transcript.text)
+                metrics.record_chunk(chunk, time.perf_counter() - chunk_start, size)
+                reporter.chunk_transcribed(index, chunk, size)
+                transcripts.append(
+                    LazyTranscript.from_transcript(transcript) if lazy_transcripts else transcript
+                )
+
+        if not transcripts:
+            raise RuntimeError("No transcripts generated. Check the input media file.")
+
+        log.info("All transcripts saved to: %s", transcripts[0].text_path.parent)
+
+        # Post-processing reads the stitched pieces; the per-chunk files keep
+        # the raw transcription of each chunk.
+        post_inputs: Sequence["AnyTranscript"] = transcripts
+        stitched_transcript: Optional["AnyTranscript"] = None
+        if consolidated is not None:
+            stitched_transcript = consolidated.finish()
+            if piece_paths:
+                pieces = [LazyTranscript(path) for path in piece_paths]
+                post_inputs = pieces if lazy_transcripts else [Transcript(p.text, p.text_path) for p in pieces]
+            log.info("Consolidated transcript written to: %s", stitched_transcript.text_path)
+
+        segments_path: Optional[Path] = None
+        caption_paths: List[Path] = []
+        if timestamps:
+            with _stage(metrics, reporter, "timestamps"):
+                merged = merge_chunk_segments(
+                    [(start, segments) for (start, _), segments in zip(chunk_spans, chunk_segments)], overlap
+                )
+                segments_path = write_sidecar(
+                    remap_segments(merged, time_map),
+                    output_dir / f"segments_{src_path.stem}.json",
+                    source=src_path.name,
+                )
+                caption_paths = write_captions(segments_path, captions)
+            log.info("Segment timestamps written to: %s", segments_path)
+            for path in caption_paths:
+                log.info("Captions written to: %s", path)
+
+        optimized_transcript: Optional["AnyTranscript"] = None
+        markdown_transcript: Optional["AnyTranscript"] = None
+
+        if generate_optimized:
+            from voicebrief.gptapi import optimize_transcriptions
+            with _stage(metrics, reporter, "optimize"):
+                optimized_transcript = optimize_transcriptions(
+                    post_inputs,
+                    # The stitched pieces live in the scratch workspace.
+                    output_dir,
+                    custom_instructions=custom_instructions,
+                    metrics=metrics,
+                    cancel_token=cancel_token,
+                )
+            log.info("Optimized transcript written to: %s", optimized_transcript.text_path)
+
+        if generate_markdown:
+            from voicebrief.gptapi import generate_markdown_transcript
+            with _stage(metrics, reporter, "markdown"):
+                markdown_transcript = generate_markdown_transcript(
+                    post_inputs,
+                    output_dir,
+                    custom_instructions=custom_instructions,
+                    metrics=metrics,
+                    cancel_token=cancel_token,
+                )
+            log.info("Markdown transcript written to: %s", markdown_transcript.text_path)
+
+        metrics.wall_seconds = time.perf_counter() - run_start
+        log.debug(
+            "Run finished in %.2fs (audio=%ss, realtime factor=%s, uploaded=%dB)",
+            metrics.wall_seconds,
+            metrics.audio_seconds,
+            metrics.realtime_factor,
+            metrics.bytes_uploaded,
+        )
+
+        result = VoicebriefResult(
+            source_path=src_path,
+            audio_path=audio_path,
+            transcripts=transcripts,
+            optimized_transcript=optimized_transcript,
+            markdown_transcript=markdown_transcript,
+            extracted_audio=needs_extraction,
+            metrics=metrics,
+            profile_outputs=session.outputs if session else [],
+            time_map=time_map,
+            stitched_transcript=stitched_transcript,
+            segments_path=segments_path,
+            caption_paths=caption_paths,
         )
-        log.info("Markdown transcript written to: %s", markdown_transcript.text_path)
+        if registry is not None and input_key is not None:
+            registry.register(
+                input_key,
+                metrics.audio_seconds,
+                output_options,
+                RegisteredOutputs(
+                    source=src_path,
+                    transcripts=[t.text_path for t in transcripts],
+                    stitched=stitched_transcript.text_path if stitched_transcript else None,
+                    optimized=optimized_transcript.text_path if optimized_transcript else None,
+                    markdown=markdown_transcript.text_path if markdown_transcript else None,
+                    segments=segments_path,
+                    captions=caption_paths,
+                    time_map=time_map.to_dict(),
+                ),
+            )
+        reporter.run_finished(result)
+        return result
 
+
+def _reused_result(
+    previous: RegisteredOutputs,
+    src_path: Path,
+    output_dir: Path,
+    reuse: str,
+    metrics: RunMetrics,
+    lazy_transcripts: bool,
+    run_start: float,
+) -> VoicebriefResult:
+    """Result of a run whose outputs are placed from an earlier run of the same content."""
+    from voicebrief.data import LazyTranscript, Transcript, transcript_written
+
+    placed = previous.place(src_path, output_dir, reuse)
+
+    def load(path: Optional[Path]) -> Optional["AnyTranscript"]:
+        if path is None:
+            return None
+        transcript = LazyTranscript(path) if lazy_transcripts else Transcript(path.read_text(encoding="utf-8"), path)
+        transcript_written(transcript)
+        return transcript
+
+    transcripts = [load(path) for path in placed.transcripts]
+    metrics.wall_seconds = time.perf_counter() - run_start
     return VoicebriefResult(
         source_path=src_path,
-        audio_path=audio_path,
-        transcripts=transcripts,
-        optimized_transcript=optimized_transcript,
-        markdown_transcript=markdown_transcript,
-        extracted_audio=needs_extraction,
+        audio_path=src_path,
+        transcripts=[t for t in transcripts if t is not None],
+        optimized_transcript=load(placed.optimized),
+        markdown_transcript=load(placed.markdown),
+        extracted_audio=False,
+        metrics=metrics,
+        time_map=TimeMap.from_dict(placed.time_map) if placed.time_map else TimeMap.identity(),
+        stitched_transcript=load(placed.stitched),
+        segments_path=placed.segments,
+        caption_paths=placed.captions,
+        reused_from=previous.source,
     )
+
+
+def iter_progress(source_path: Path | str, **kwargs: Any) -> Iterator[ProgressEvent]:
+    """Run :func:`run_voicebrief` on a worker thread and yield its progress events.
+
+    Accepts the same keyword arguments as :func:`run_voicebrief` (except
+    ``progress``). The last event is :class:`~voicebrief.progress.RunFinished`
+    carrying the :class:`VoicebriefResult`. Errors from the run are re-raised
+    in the consuming thread. Closing the iterator early cancels the run.
+    """
+    events: "queue.Queue[Any]" = queue.Queue()
+    token = kwargs.pop("cancel_token", None) or CancellationToken()
+    done = object()
+
+    def worker() -> None:
+        try:
+            run_voicebrief(source_path, cancel_token=token, progress=events.put, **kwargs)
+        except BaseException as exc:  # re-raised in the consumer
+            events.put(exc)
+        finally:
+            events.put(done)
+
+    thread = threading.Thread(target=worker, name="voicebrief-run", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = events.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if thread.is_alive():
+            token.cancel()
@@ -6,20 +6,73 @@ Voicebrief - Converts video / audio conversations to text and subsequently provi
 @license: MIT
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
-import subprocess
+from typing import List, Optional, Tuple
 import logging
 import math
+import os
 
+from voicebrief.cancel import CancellationToken, ProcessingCancelled, raise_if_cancelled
+from voicebrief.process import run_process
 
-def partition_sound_file(audio_path: Path, max_chunk_size_mb: int = 20) -> List[Path]:
+# Upload limit of the transcription API, with some headroom.
+MAX_CHUNK_SIZE_MB = 20
+# Uncompressed/lossless sources; stream-copying them makes large, numerous
+# chunks, so they are segmented by re-encoding ranges instead.
+REENCODE_EXTENSIONS = {".wav", ".wave", ".flac", ".aif", ".aiff"}
+RANGE_BITRATE = 128_000
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """A chunk file and the time range of the segmented audio it covers."""
+
+    path: Path
+    start: float
+    duration: float
+
+
+def partition_sound_file(
+    audio_path: Path,
+    max_chunk_size_mb: int = MAX_CHUNK_SIZE_MB,
+    duration_seconds: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    output_dir: Optional[Path] = None,
+) -> List[Path]:
+    """Split ``audio_path`` into chunks below ``max_chunk_size_mb``.
+
+    Chunks are written to ``output_dir`` (default: ``<stem>_chunks`` next to
+    the audio file). Files that are already small enough are returned as is.
+    """
     max_chunk_size_bytes = max_chunk_size_mb * 1024 * 1024
-    return _partition_sound_file(audio_path, max_chunk_size_bytes)
+    return _partition_sound_file(
+        audio_path,
+        max_chunk_size_bytes,
+        duration_seconds,
+        cancel_token=cancel_token,
+        output_dir=output_dir,
+    )
 
 
-def _partition_sound_file(audio_path: Path, max_chunk_size_bytes: int) -> List[Path]:
+def probe_duration_seconds(
+    audio_path: Path, cancel_token: Optional[CancellationToken] = None
+) -> float:
+    """Return the duration of a media file in seconds using ffprobe."""
+    return _probe_duration_seconds(audio_path, cancel_token)
+
+
+def _partition_sound_file(
+    audio_path: Path,
+    max_chunk_size_bytes: int,
+    duration_seconds: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    output_dir: Optional[Path] = None,
+) -> List[Path]:
     log = logging.getLogger("voicebrief.audio")
+    raise_if_cancelled(cancel_token)
 
     # if size audio_path is snaller than max_chunk_size_bytes, return audio_path
     # as chunking it would be unnecessary
@@ -34,11 +87,12 @@ def _partition_sound_file(audio_path: Path, max_chunk_size_bytes: int) -> List[P
         return [audio_path]
 
     # The output directory for chunks
-    output_dir = audio_path.parent / (audio_path.stem + "_chunks")
-    output_dir.mkdir(exist_ok=True)
+    if output_dir is None:
+        output_dir = audio_path.parent / (audio_path.stem + "_chunks")
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     segment_seconds = _estimate_segment_duration_seconds(
-        audio_path, max_chunk_size_bytes
+        audio_path, max_chunk_size_bytes, duration_seconds, cancel_token
     )
 
     # The base command for ffmpeg
@@ -61,9 +115,12 @@ def _partition_sound_file(audio_path: Path, max_chunk_size_bytes: int) -> List[P
 
     log.debug("Running ffmpeg: %s", " ".join(base_command))
     # Execute the command
-    result = subprocess.run(
-        base_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
+    chunk_pattern = f"{audio_path.stem}_*{audio_path.suffix}"
+    try:
+        result = run_process(base_command, cancel_token=cancel_token)
+    except ProcessingCancelled:
+        remove_chunk_files(list(output_dir.glob(chunk_pattern)), audio_path)
+        raise
 
     # Check for errors
     if result.returncode != 0:
@@ -72,17 +129,160 @@ def _partition_sound_file(audio_path: Path, max_chunk_size_bytes: int) -> List[P
         raise Exception(f"Error splitting file: {err}")
 
     # List the created files and sort them to ensure correct order
-    paths = sorted(output_dir.glob(f"{audio_path.stem}_*{audio_path.suffix}"))
+    paths = sorted(output_dir.glob(chunk_pattern))
     log.debug("Created %d chunk(s) in %s", len(paths), output_dir)
 
     if not paths:
         raise RuntimeError(f"ffmpeg created no chunks for {audio_path}")
 
-    return _resplit_oversized_chunks(paths, max_chunk_size_bytes, log)
+    return _resplit_oversized_chunks(paths, max_chunk_size_bytes, log, cancel_token)
+
 
+def plan_segments(
+    duration_seconds: float, segment_seconds: float, overlap_seconds: float = 0.0
+) -> List[Tuple[float, float]]:
+    """Split ``duration_seconds`` into ``(start, length)`` ranges.
 
-def _probe_duration_seconds(audio_path: Path) -> float:
-    result = subprocess.run(
+    Ranges start every ``segment_seconds``; each one except the last runs
+    ``overlap_seconds`` into the next, so a word cut at a boundary is heard
+    whole in at least one chunk.
+    """
+    if duration_seconds <= 0 or segment_seconds <= 0:
+        raise ValueError("duration_seconds and segment_seconds must be positive")
+    if overlap_seconds < 0:
+        raise ValueError("overlap_seconds must not be negative")
+    segment_seconds = float(segment_seconds)
+    count = max(1, math.ceil(duration_seconds / segment_seconds - 1e-9))
+    ranges = []
+    for index in range(count):
+        start = index * segment_seconds
+        ranges.append((start, min(segment_seconds + overlap_seconds, duration_seconds - start)))
+    return ranges
+
+
+def partition_by_ranges(
+    audio_path: Path,
+    duration_seconds: float,
+    max_chunk_size_mb: int = MAX_CHUNK_SIZE_MB,
+    bitrate: int = RANGE_BITRATE,
+    output_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    overlap_seconds: float = 0.0,
+) -> List[AudioChunk]:
+    """Encode ``audio_path`` into MP3 chunks with one ffmpeg process per time range.
+
+    The ranges are planned from ``duration_seconds`` and the constant target
+    ``bitrate``, so every chunk stays below ``max_chunk_size_mb``. Up to
+    ``workers`` processes (default: CPU count) run in parallel, each seeking
+    to its range with ``-ss``/``-t``. Works for audio and video inputs.
+    With ``overlap_seconds``, neighbouring chunks share that much audio
+    (see :mod:`voicebrief.stitch`).
+    """
+    log = logging.getLogger("voicebrief.audio")
+    raise_if_cancelled(cancel_token)
+    max_chunk_size_bytes = max_chunk_size_mb * 1024 * 1024
+    segment_seconds: float = _calculate_segment_duration_seconds(
+        max(1, int(duration_seconds * bitrate / 8)), duration_seconds, max_chunk_size_bytes
+    )
+    if segment_seconds < duration_seconds and overlap_seconds > 0:
+        if overlap_seconds >= segment_seconds / 2:
+            raise ValueError(
+                f"overlap_seconds ({overlap_seconds}) must be less than half a segment ({segment_seconds}s)"
+            )
+        # The overlap is part of every chunk's size budget.
+        segment_seconds -= overlap_seconds
+    ranges = plan_segments(duration_seconds, segment_seconds, overlap_seconds)
+    if output_dir is None:
+        output_dir = audio_path.parent / (audio_path.stem + "_chunks")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    chunks = [
+        AudioChunk(output_dir / f"{audio_path.stem}_{index:03d}.mp3", start, length)
+        for index, (start, length) in enumerate(ranges)
+    ]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks)))
+    log.debug(
+        "Encoding %d range(s) of %ss from %s with %d worker(s)",
+        len(chunks),
+        segment_seconds,
+        audio_path,
+        workers,
+    )
+
+    # A failure (or the caller's cancellation) kills every running encoder.
+    abort = CancellationToken()
+    unregister = cancel_token.register(abort.cancel) if cancel_token is not None else (lambda: None)
+
+    def encode(chunk: AudioChunk) -> None:
+        command = [
+            "ffmpeg",
+            "-y",
+            "-ss",
+            f"{chunk.start:.3f}",
+            "-t",
+            f"{chunk.duration:.3f}",
+            "-i",
+            str(audio_path),
+            "-vn",
+            "-c:a",
+            "libmp3lame",
+            "-b:a",
+            str(bitrate),
+            str(chunk.path),
+        ]
+        result = run_process(command, cancel_token=abort)
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", errors="replace")
+            raise RuntimeError(f"Error encoding {chunk.path.name} from {audio_path}: {err}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="voicebrief-segment") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, encode, chunk) for chunk in chunks]
+            errors = []
+            for future in futures:
+                try:
+                    future.result()
+                except BaseException as exc:
+                    abort.cancel()
+                    errors.append(exc)
+        if errors:
+            raise_if_cancelled(cancel_token)
+            first = next((e for e in errors if not isinstance(e, ProcessingCancelled)), errors[0])
+            raise first
+    except BaseException:
+        remove_chunk_files([chunk.path for chunk in chunks], audio_path)
+        raise
+    finally:
+        unregister()
+
+    for chunk in chunks:
+        size = chunk.path.stat().st_size
+        if size > max_chunk_size_bytes:
+            raise RuntimeError(f"Encoded chunk exceeds limit: {chunk.path} ({size}B > {max_chunk_size_bytes}B)")
+    return chunks
+
+
+def remove_chunk_files(chunks: List[Path], audio_path: Path) -> None:
+    """Delete chunk files produced from ``audio_path`` and their empty directories.
+
+    ``audio_path`` itself is never removed (it is returned as the only chunk
+    when no splitting was needed).
+    """
+    directories = set()
+    for chunk in chunks:
+        if chunk == audio_path:
+            continue
+        chunk.unlink(missing_ok=True)
+        directories.add(chunk.parent)
+    for directory in sorted(directories, key=lambda d: len(d.parts), reverse=True):
+        if directory.name.endswith("_chunks") and not any(directory.iterdir()):
+            directory.rmdir()
+
+
+def _probe_duration_seconds(
+    audio_path: Path, cancel_token: Optional[CancellationToken] = None
+) -> float:
+    result = run_process(
         [
             "ffprobe",
             "-v",
@@ -93,9 +293,8 @@ def _probe_duration_seconds(audio_path: Path) -> float:
             "default=nokey=1:noprint_wrappers=1",
             str(audio_path),
         ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
         text=True,
+        cancel_token=cancel_token,
     )
     if result.returncode != 0:
         err = result.stderr.strip()
@@ -133,11 +332,15 @@ def _calculate_segment_duration_seconds(
 
 
 def _estimate_segment_duration_seconds(
-    audio_path: Path, max_chunk_size_bytes: int
+    audio_path: Path,
+    max_chunk_size_bytes: int,
+    duration_seconds: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
 ) -> int:
     log = logging.getLogger("voicebrief.audio")
     size_bytes = audio_path.stat().st_size
-    duration_seconds = _probe_duration_seconds(audio_path)
+    if duration_seconds is None:
+        duration_seconds = _probe_duration_seconds(audio_path, cancel_token)
     segment_seconds = _calculate_segment_duration_seconds(
         size_bytes,
         duration_seconds,
@@ -155,7 +358,10 @@ def _estimate_segment_duration_seconds(
 
 
 def _resplit_oversized_chunks(
-    paths: List[Path], max_chunk_size_bytes: int, log: logging.Logger
+    paths: List[Path],
+    max_chunk_size_bytes: int,
+    log: logging.Logger,
+    cancel_token: Optional[CancellationToken] = None,
 ) -> List[Path]:
     final_paths: List[Path] = []
     for path in paths:
@@ -170,7 +376,9 @@ def _resplit_oversized_chunks(
             size,
             max_chunk_size_bytes,
         )
-        resplit_paths = _partition_sound_file(path, max_chunk_size_bytes)
+        resplit_paths = _partition_sound_file(
+            path, max_chunk_size_bytes, cancel_token=cancel_token
+        )
         if len(resplit_paths) == 1 and resplit_paths[0] == path:
             raise RuntimeError(f"Unable to reduce oversized chunk: {path}")
         final_paths.extend(resplit_paths)
@@ -0,0 +1,373 @@
+"""Bulk post-processing through the OpenAI Batch API.
+
+For backlogs that do not need interactive latency, the optimize, markdown
+and summary requests of many recordings are written to one JSONL file and
+submitted as a single batch job, at batch pricing. :func:`run_bulk` polls
+until the job finishes and writes every reply to the output file the
+interactive functions in :mod:`voicebrief.gptapi` would have written, using
+the same prompts and request sizes.
+
+The job is recorded in ``manifest.json`` in the work directory, so running
+again with the same directory resumes polling instead of submitting twice.
+Backends implement :class:`BatchBackend`; :class:`LocalBatchBackend`
+answers the requests in-process, for tests and offline runs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Set
+
+from voicebrief.cancel import CancellationToken, raise_if_cancelled
+from voicebrief.data import AnyTranscript, LazyTranscript, Transcript
+
+TASKS = ("optimize", "markdown", "summary")
+BATCH_ENDPOINT = "/v1/chat/completions"
+DEFAULT_POLL_SECONDS = 60.0
+# Batch states after which nothing changes any more.
+_FINISHED_STATES = ("completed", "failed", "expired", "cancelled")
+# Chunk transcripts: transcription_<chunk audio stem>_NNN.txt, where the chunk
+# audio is the source, its extracted audio or <source>_preprocessed.
+_CHUNK_TRANSCRIPT = re.compile(r"^transcription_(?P<stem>.+)_\d{3,}\.txt$")
+
+
+class BatchBackend(Protocol):
+    """Where batch jobs run. Lines follow the OpenAI Batch API formats."""
+
+    name: str
+
+    def submit(self, requests_path: Path) -> str:
+        """Start a job for the JSONL requests and return its id."""
+
+    def status(self, batch_id: str) -> str:
+        """Batch state, e.g. ``"in_progress"`` or ``"completed"``."""
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Output (and error) lines of a finished job."""
+
+
+class OpenAIBatchBackend:
+    """Runs jobs with the Batch API of the chat endpoint."""
+
+    name = "openai"
+
+    def __init__(self, client: Any = None, completion_window: str = "24h"):
+        if client is None:
+            from voicebrief.gptapi import _get_client  # Lazy import
+
+            client = _get_client()
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests_path: Path) -> str:
+        with requests_path.open("rb") as handle:
+            uploaded = self.client.files.create(file=handle, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window=self.completion_window
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                yield from _parse_jsonl(self.client.files.content(file_id).text)
+
+
+def echo_reply(system_prompt: str, text: str, model: str) -> str:
+    """Default local reply: the request text unchanged."""
+    return text
+
+
+class LocalBatchBackend:
+    """Answers a job in-process when it is submitted.
+
+    ``respond(system_prompt, text, model)`` produces each reply; the default
+    echoes the text, which exercises the whole pipeline without network
+    access. The output is stored next to the requests file and the batch id
+    is its path, so a resumed run finds it.
+    """
+
+    name = "local"
+
+    def __init__(self, respond: Optional[Callable[[str, str, str], str]] = None):
+        self.respond = respond or echo_reply
+
+    def submit(self, requests_path: Path) -> str:
+        output_path = requests_path.with_name(f"local-{uuid.uuid4().hex[:12]}.output.jsonl")
+        lines: List[Dict[str, Any]] = []
+        for request in _parse_jsonl(requests_path.read_text(encoding="utf-8")):
+            body = request["body"]
+            system, user = (m["content"] for m in body["messages"])
+            reply = self.respond(system, user, body["model"])
+            lines.append(
+                {
+                    "id": f"{output_path.stem}-{len(lines)}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"model": body["model"], "choices": [{"message": {"content": reply}}]},
+                    },
+                    "error": None,
+                }
+            )
+        _write_jsonl(output_path, lines)
+        return str(output_path)
+
+    def status(self, batch_id: str) -> str:
+        return "completed" if Path(batch_id).exists() else "failed"
+
+    def results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        yield from _parse_jsonl(Path(batch_id).read_text(encoding="utf-8"))
+
+
+BACKENDS: Dict[str, Callable[[], BatchBackend]] = {
+    "openai": OpenAIBatchBackend,
+    "local": LocalBatchBackend,
+}
+
+
+@dataclass
+class BulkOutput:
+    """An output file and the requests whose replies it joins."""
+
+    task: str
+    path: Path
+    custom_ids: List[str]
+    separator: str
+
+
+@dataclass
+class BulkResult:
+    batch_id: str
+    status: str
+    written: List[Path] = field(default_factory=list)
+    failed: List[Path] = field(default_factory=list)
+
+
+def _consolidated_transcript(path: Path, existing: Set[Path]) -> Optional[Path]:
+    """The consolidated transcript in ``existing`` that chunk transcript ``path`` belongs to."""
+    match = _CHUNK_TRANSCRIPT.match(path.name)
+    if not match:
+        return None
+    stems = [match["stem"]]
+    if stems[0].endswith("_preprocessed"):
+        stems.append(stems[0][:-len("_preprocessed")])
+    for stem in stems:
+        consolidated = path.with_name(f"transcription_{stem}.txt")
+        if consolidated in existing:
+            return consolidated
+    return None
+
+
+def discover_transcripts(paths: Iterable[Path]) -> List[List[Path]]:
+    """Group transcript files by recording.
+
+    A file is a recording of its own. A directory is searched recursively
+    for ``transcription_*.txt``. A run of several chunks writes the
+    consolidated ``transcription_<stem>.txt`` next to the chunk transcripts
+    (``transcription_<stem>_NNN.txt``, or ``<stem>_preprocessed_NNN``); those
+    chunks form a group, in chunk order, and the consolidated transcript is
+    skipped, as the interactive pipeline post-processes the chunks. Every
+    other file, such as the transcript of a recording named
+    ``meeting_001.mp3``, is a recording of its own.
+    """
+    groups: List[List[Path]] = []
+    for path in paths:
+        path = Path(path).expanduser()
+        if path.is_file():
+            groups.append([path])
+            continue
+        candidates = sorted(path.rglob("transcription_*.txt"))
+        existing = set(candidates)
+        chunks: Dict[Path, List[Path]] = {}
+        singles = []
+        for candidate in candidates:
+            consolidated = _consolidated_transcript(candidate, existing)
+            if consolidated is not None:
+                chunks.setdefault(consolidated, []).append(candidate)
+            else:
+                singles.append(candidate)
+        groups.extend(chunks.values())
+        groups.extend([single] for single in singles if single not in chunks)
+    return groups
+
+
+def prepare_bulk(
+    groups: Sequence[Sequence[AnyTranscript]],
+    tasks: Sequence[str],
+    requests_path: Path,
+    destination: Optional[Path] = None,
+    custom_instructions: Optional[str] = None,
+    model: Optional[str] = None,
+) -> List[BulkOutput]:
+    """Write the requests of ``tasks`` for every group to ``requests_path``.
+
+    Returns the outputs to assemble from the replies. Outputs go to
+    ``destination``, or next to each group's first transcript.
+    """
+    from voicebrief import gptapi  # Lazy import
+
+    unknown = set(tasks) - set(TASKS)
+    if unknown or not tasks:
+        raise ValueError(f"tasks must be among {', '.join(TASKS)}, got {', '.join(tasks) or 'none'}")
+    model = model or gptapi._get_model()
+    prompts = {
+        "optimize": gptapi.OPTIMIZE_PROMPT,
+        "markdown": gptapi.MARKDOWN_PROMPT,
+        "summary": gptapi.SUMMARY_PROMPT,
+    }
+    paths = {
+        "optimize": gptapi.optimized_output_path,
+        "markdown": gptapi.markdown_output_path,
+        "summary": gptapi.summary_output_path,
+    }
+    separators = {"optimize": gptapi.OPTIMIZED_SEPARATOR, "markdown": gptapi.MARKDOWN_SEPARATOR, "summary": ""}
+
+    requests: List[Dict[str, Any]] = []
+    outputs: List[BulkOutput] = []
+    for group_index, transcripts in enumerate(groups):
+        for task in tasks:
+            if task == "summary":
+                texts = [" ".join(t.text for t in transcripts)]
+            else:
+                texts = [text for text, _ in gptapi.request_texts(transcripts, model)]
+            system_prompt = gptapi._compose_system_prompt(prompts[task], custom_instructions)
+            custom_ids = [f"{group_index}-{task}-{part}" for part in range(len(texts))]
+            for custom_id, text in zip(custom_ids, texts):
+                requests.append(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": {
+                            "model": model,
+                            "messages": [
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": text},
+                            ],
+                        },
+                    }
+                )
+            outputs.append(BulkOutput(task, paths[task](transcripts, destination), custom_ids, separators[task]))
+    _write_jsonl(requests_path, requests)
+    return outputs
+
+
+def write_outputs(outputs: Sequence[BulkOutput], results: Iterable[Dict[str, Any]]) -> BulkResult:
+    """Join the replies of each output and write it; outputs with a failed request are skipped."""
+    log = logging.getLogger("voicebrief.batch")
+    replies: Dict[str, str] = {}
+    for line in results:
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            log.warning("Batch request %s failed: %s", line.get("custom_id"), line.get("error") or response)
+            continue
+        replies[line["custom_id"]] = response["body"]["choices"][0]["message"]["content"] or ""
+
+    result = BulkResult(batch_id="", status="completed")
+    for output in outputs:
+        if all(custom_id in replies for custom_id in output.custom_ids):
+            output.path.parent.mkdir(parents=True, exist_ok=True)
+            text = output.separator.join(replies[custom_id] for custom_id in output.custom_ids)
+            result.written.append(Transcript.to_file(text, output.path).text_path)
+        else:
+            result.failed.append(output.path)
+    return result
+
+
+def run_bulk(
+    groups: Sequence[Sequence[AnyTranscript]],
+    tasks: Sequence[str],
+    work_dir: Path,
+    backend: Optional[BatchBackend] = None,
+    destination: Optional[Path] = None,
+    custom_instructions: Optional[str] = None,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    timeout_seconds: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> BulkResult:
+    """Submit (or resume) a batch job for ``groups`` and write its outputs.
+
+    ``groups`` holds the transcripts of each recording, as passed to
+    :func:`voicebrief.gptapi.optimize_transcriptions`. On resume the
+    manifest in ``work_dir`` is used and ``groups`` and ``tasks`` are
+    ignored. Raises :class:`TimeoutError` if the job is still running
+    after ``timeout_seconds``; run again with the same ``work_dir`` to
+    keep waiting.
+    """
+    log = logging.getLogger("voicebrief.batch")
+    backend = backend or OpenAIBatchBackend()
+    work_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = work_dir / "manifest.json"
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["backend"] != backend.name:
+            raise ValueError(f"{work_dir} holds a {manifest['backend']} batch, not {backend.name}")
+        if manifest.get("finished"):
+            raise ValueError(f"The batch in {work_dir} has already been written out; use a new work directory")
+        batch_id = manifest["batch_id"]
+        outputs = [BulkOutput(o["task"], Path(o["path"]), o["custom_ids"], o["separator"]) for o in manifest["outputs"]]
+        log.info("Resuming batch %s with %d output(s)", batch_id, len(outputs))
+    else:
+        requests_path = work_dir / "requests.jsonl"
+        outputs = prepare_bulk(groups, tasks, requests_path, destination, custom_instructions)
+        batch_id = backend.submit(requests_path)
+        manifest = {
+            "backend": backend.name,
+            "batch_id": batch_id,
+            "outputs": [
+                {"task": o.task, "path": str(o.path.resolve()), "custom_ids": o.custom_ids, "separator": o.separator}
+                for o in outputs
+            ],
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        log.info("Submitted batch %s with %d output(s) from %d recording(s)", batch_id, len(outputs), len(groups))
+
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds is not None else None
+    while True:
+        raise_if_cancelled(cancel_token)
+        status = backend.status(batch_id)
+        if status in _FINISHED_STATES:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch {batch_id} is still {status}; run again with {work_dir} to resume")
+        log.debug("Batch %s is %s; checking again in %.0fs", batch_id, status, poll_seconds)
+        if cancel_token is not None:
+            cancel_token.wait(poll_seconds)
+        else:
+            time.sleep(poll_seconds)
+
+    # A failed or expired job may still have answered part of the requests.
+    result = write_outputs(outputs, backend.results(batch_id) if status != "failed" else [])
+    result.batch_id, result.status = batch_id, status
+    manifest["finished"] = True
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    log.info("Batch %s %s: %d output(s) written, %d failed", batch_id, status, len(result.written), len(result.failed))
+    return result
+
+
+def load_groups(groups: Sequence[Sequence[Path]]) -> List[List[AnyTranscript]]:
+    """Lazy transcripts for grouped transcript paths."""
+    return [[LazyTranscript(path) for path in group] for group in groups]
+
+
+def _parse_jsonl(text: str) -> Iterator[Dict[str, Any]]:
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def _write_jsonl(path: Path, lines: Iterable[Dict[str, Any]]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, ensure_ascii=False) + "\n")
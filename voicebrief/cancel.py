@@ -0,0 +1,156 @@
+"""Cooperative cancellation for Voicebrief runs."""
+from __future__ import annotations
+
+import contextvars
+import io
+import threading
+from typing import Any, BinaryIO, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ProcessingCancelled(Exception):
+    """Raised when a run is stopped through its :class:`CancellationToken`."""
+
+
+class CancellationToken:
+    """Thread-safe flag that stages poll and subprocesses/requests subscribe to.
+
+    ``cancel()`` may be called from any thread (e.g. a GUI callback). Callbacks
+    registered with :meth:`register` run exactly once, on the cancelling thread,
+    which lets blocking work such as an ffmpeg child process be killed right away.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # pragma: no cover - best effort cleanup
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ProcessingCancelled("Processing was cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or ``timeout`` elapses; return ``cancelled``."""
+        return self._event.wait(timeout)
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation; returns a function that unregisters it.
+
+        If the token is already cancelled the callback runs immediately.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def raise_if_cancelled(token: Optional[CancellationToken]) -> None:
+    """Convenience for optional tokens."""
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def call_cancellable(
+    token: Optional[CancellationToken], fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Call ``fn`` and return its result, or raise as soon as ``token`` is cancelled.
+
+    Blocking client calls (such as HTTP requests) cannot be interrupted from
+    another thread, so ``fn`` runs on a daemon thread. On cancellation the
+    caller is released immediately, and any result of the abandoned call is
+    discarded; an error it raises after cancellation is reported as
+    :class:`ProcessingCancelled`. To stop the work itself, ``fn`` must watch
+    the token, e.g. by uploading through a :class:`CancellableReader`.
+    """
+    if token is None:
+        return fn(*args, **kwargs)
+    token.raise_if_cancelled()
+
+    done = threading.Event()
+    outcome: dict = {}
+
+    def runner() -> None:
+        try:
+            outcome["value"] = fn(*args, **kwargs)
+        except BaseException as exc:  # re-raised on the calling thread
+            outcome["error"] = exc
+        finally:
+            done.set()
+
+    unregister = token.register(done.set)
+    try:
+        # The copied context keeps the caller's log fields on the request thread.
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(runner,), name="voicebrief-request", daemon=True).start()
+        done.wait()
+    finally:
+        unregister()
+    if "value" in outcome:
+        return outcome["value"]
+    if "error" in outcome and not token.cancelled:
+        raise outcome["error"]
+    raise ProcessingCancelled("Processing was cancelled")
+
+
+class CancellableReader(io.RawIOBase):
+    """Binary file whose reads raise :class:`ProcessingCancelled` once ``token`` is cancelled.
+
+    HTTP clients stream a file upload in chunks, so the request fails at the
+    next chunk and its connection is closed, instead of the upload running to
+    the end after the caller gave up. Seeking, ``tell`` and ``fileno`` go to
+    the wrapped file, so clients still see its size.
+    """
+
+    def __init__(self, raw: BinaryIO, token: CancellationToken):
+        super().__init__()
+        self._raw = raw
+        self._token = token
+        self.name = getattr(raw, "name", None)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._raw.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def fileno(self) -> int:
+        return self._raw.fileno()
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._token.raise_if_cancelled()
+        return self._raw.read(-1 if size is None else size)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
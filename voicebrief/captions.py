@@ -0,0 +1,141 @@
+"""Timestamped transcript segments, their sidecar file and caption formats.
+
+Transcription with timestamps yields segments relative to each chunk.
+:func:`merge_chunk_segments` places them on the timeline of the audio that
+was partitioned, and :func:`remap_segments` maps them back to the source
+recording through the run's :class:`~voicebrief.timeline.TimeMap`. The
+result is stored once as a compact JSON sidecar; SRT, WebVTT and
+timestamped markdown are rendered from it without further API calls.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from voicebrief.data import replace_text
+from voicebrief.timeline import TimeMap
+
+SIDECAR_VERSION = 1
+CAPTION_FORMATS = ("srt", "vtt", "md")
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Transcribed text between ``start`` and ``end`` seconds."""
+
+    start: float
+    end: float
+    text: str
+
+
+def segments_from_response(response: Any) -> Optional[List[Segment]]:
+    """Segments of a ``verbose_json`` transcription response, or ``None`` if it has none."""
+    raw = getattr(response, "segments", None)
+    if raw is None and isinstance(response, dict):
+        raw = response.get("segments")
+    if raw is None:
+        return None
+    segments = []
+    for item in raw:
+        get = item.get if isinstance(item, dict) else (lambda key, item=item: getattr(item, key, None))
+        text = (get("text") or "").strip()
+        if text:
+            segments.append(Segment(float(get("start") or 0.0), float(get("end") or 0.0), text))
+    return segments
+
+
+def merge_chunk_segments(
+    chunks: Sequence[Tuple[float, Sequence[Segment]]], overlap_seconds: float = 0.0
+) -> List[Segment]:
+    """Shift each chunk's segments by its offset and drop the overlap duplicates.
+
+    ``chunks`` holds ``(offset, segments)`` in chunk order. Where chunks
+    overlap, the cut between neighbours is placed in the middle of the shared
+    audio: a segment belongs to the chunk on whose side its midpoint falls.
+    """
+    merged: List[Segment] = []
+    for index, (offset, segments) in enumerate(chunks):
+        lower = chunks[index][0] + overlap_seconds / 2 if index > 0 else float("-inf")
+        upper = chunks[index + 1][0] + overlap_seconds / 2 if index + 1 < len(chunks) else float("inf")
+        for segment in segments:
+            start, end = offset + segment.start, offset + segment.end
+            if lower <= (start + end) / 2 < upper:
+                merged.append(Segment(start, end, segment.text))
+    return merged
+
+
+def remap_segments(segments: Iterable[Segment], time_map: TimeMap) -> List[Segment]:
+    """Map segment times from the processed audio to the original recording."""
+    if time_map.is_identity:
+        return list(segments)
+    return [Segment(*time_map.map_range(s.start, s.end), s.text) for s in segments]
+
+
+def write_sidecar(segments: Sequence[Segment], path: Path, source: Optional[str] = None) -> Path:
+    """Store segments as compact JSON: ``[start, end, text]`` triples in milliseconds precision."""
+    data = {
+        "version": SIDECAR_VERSION,
+        "source": source,
+        "segments": [[round(s.start, 3), round(s.end, 3), s.text] for s in segments],
+    }
+    replace_text(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return path
+
+
+def read_sidecar(path: Path) -> Tuple[Optional[str], List[Segment]]:
+    """Return ``(source name, segments)`` from a sidecar written by :func:`write_sidecar`."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != SIDECAR_VERSION:
+        raise ValueError(f"Unsupported segment sidecar version in {path}: {data.get('version')!r}")
+    return data.get("source"), [Segment(start, end, text) for start, end, text in data["segments"]]
+
+
+def format_timestamp(seconds: float, separator: str = ".") -> str:
+    """``HH:MM:SS<separator>mmm``; SRT uses ``,`` and WebVTT ``.``."""
+    millis = max(0, int(round(seconds * 1000)))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def to_srt(segments: Sequence[Segment]) -> str:
+    blocks = [
+        f"{index}\n{format_timestamp(s.start, ',')} --> {format_timestamp(s.end, ',')}\n{s.text}\n"
+        for index, s in enumerate(segments, start=1)
+    ]
+    return "\n".join(blocks)
+
+
+def to_vtt(segments: Sequence[Segment]) -> str:
+    blocks = [f"{format_timestamp(s.start)} --> {format_timestamp(s.end)}\n{s.text}\n" for s in segments]
+    return "WEBVTT\n\n" + "\n".join(blocks)
+
+
+def to_markdown(segments: Sequence[Segment], title: Optional[str] = None) -> str:
+    lines = [f"# {title}", ""] if title else []
+    lines += [f"**[{format_timestamp(s.start)[:8]}]** {s.text}\n" for s in segments]
+    return "\n".join(lines)
+
+
+def caption_path(sidecar: Path, fmt: str, output_dir: Optional[Path] = None) -> Path:
+    """Output path for ``fmt`` next to ``sidecar`` (``segments_<stem>.json``)."""
+    stem = sidecar.stem.removeprefix("segments_")
+    name = f"timestamped_{stem}.md" if fmt == "md" else f"{stem}.{fmt}"
+    return (output_dir or sidecar.parent) / name
+
+
+def write_captions(sidecar: Path, formats: Iterable[str], output_dir: Optional[Path] = None) -> List[Path]:
+    """Render ``formats`` (``srt``, ``vtt``, ``md``) from a sidecar file."""
+    source, segments = read_sidecar(sidecar)
+    renderers = {"srt": to_srt, "vtt": to_vtt, "md": lambda s: to_markdown(s, source)}
+    written = []
+    for fmt in formats:
+        if fmt not in renderers:
+            raise ValueError(f"Caption format must be one of {', '.join(CAPTION_FORMATS)}, got {fmt!r}")
+        path = caption_path(sidecar, fmt, output_dir)
+        replace_text(path, renderers[fmt](segments))
+        written.append(path)
+    return written
@@ -6,8 +6,49 @@ Voicebrief - Converts video / audio conversations to text and subsequently provi
 @license: MIT
 """
 
+from __future__ import annotations
+
+import codecs
+import mmap
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from voicebrief.profiling import span
+from voicebrief.stitch import DEFAULT_WINDOW_WORDS, find_seam
+
+# Characters (or bytes, when memory-mapped) per streamed piece.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Observer of the transcripts written in the current context, e.g. the
+# search index of a run (see :func:`on_transcript_written`).
+_WRITE_HOOK: ContextVar[Optional[Callable[["AnyTranscript"], None]]] = ContextVar(
+    "voicebrief_write_hook", default=None
+)
+
+
+@contextmanager
+def on_transcript_written(hook: Callable[["AnyTranscript"], None]) -> Iterator[None]:
+    """Call ``hook`` with every transcript written to a file in the block.
+
+    The hook is a context variable, so it follows the block into threads
+    started with a copied context and does not see concurrent runs.
+    """
+    token = _WRITE_HOOK.set(hook)
+    try:
+        yield
+    finally:
+        _WRITE_HOOK.reset(token)
+
+
+def transcript_written(transcript: "AnyTranscript") -> None:
+    """Report ``transcript`` to the hook; ``to_file`` and friends do this themselves."""
+    hook = _WRITE_HOOK.get()
+    if hook is not None:
+        hook(transcript)
 
 
 @dataclass
@@ -17,5 +58,242 @@ class Transcript:
 
     @classmethod
     def to_file(cls, text: str, path: Path) -> "Transcript":
-        path.write_text(text)
-        return Transcript(text, path)
+        with span("write " + path.name, "io", path=str(path)):
+            replace_text(path, text)
+        transcript = Transcript(text, path)
+        transcript_written(transcript)
+        return transcript
+
+
+class LazyTranscript:
+    """Transcript that keeps its text on disk and reads it on demand.
+
+    Behaves like :class:`Transcript` (``text`` and ``text_path``) but holds
+    no text between accesses, so many of them can be kept alive in constant
+    memory. Use :meth:`iter_chunks` to stream the contents instead of
+    reading them in one piece. With ``use_mmap`` the file is memory-mapped,
+    leaving the paging of large files to the operating system.
+    """
+
+    __slots__ = ("text_path", "encoding", "use_mmap")
+
+    def __init__(self, text_path: Path, encoding: str = "utf-8", use_mmap: bool = False):
+        self.text_path = Path(text_path)
+        self.encoding = encoding
+        self.use_mmap = use_mmap
+
+    @classmethod
+    def to_file(cls, text: str, path: Path) -> "LazyTranscript":
+        return cls.write_parts([text], path)
+
+    @classmethod
+    def write_parts(
+        cls, parts: Iterable[str], path: Path, separator: str = ""
+    ) -> "LazyTranscript":
+        """Write ``parts`` one by one as they are produced, joined by ``separator``.
+
+        Parts go to a ``.part`` file that replaces ``path`` only once ``parts``
+        is exhausted, so a failure while producing them leaves no truncated
+        output behind.
+        """
+        partial = path.with_name(path.name + ".part")
+        with span("write " + path.name, "io", path=str(path)):
+            try:
+                with partial.open("w", encoding="utf-8") as handle:
+                    for index, part in enumerate(parts):
+                        if index:
+                            handle.write(separator)
+                        handle.write(part)
+                partial.replace(path)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+        transcript = cls(path)
+        transcript_written(transcript)
+        return transcript
+
+    @classmethod
+    def from_transcript(cls, transcript: "AnyTranscript", use_mmap: bool = False) -> "LazyTranscript":
+        return cls(transcript.text_path, use_mmap=use_mmap)
+
+    @property
+    def text(self) -> str:
+        """The full text, read from disk on every access."""
+        return "".join(self.iter_chunks())
+
+    @property
+    def size_bytes(self) -> int:
+        return self.text_path.stat().st_size
+
+    def iter_chunks(self, size: int = _STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the text in pieces of roughly ``size`` characters."""
+        if self.use_mmap:
+            yield from self._iter_mmap_chunks(size)
+            return
+        with self.text_path.open("r", encoding=self.encoding) as handle:
+            while True:
+                piece = handle.read(size)
+                if not piece:
+                    return
+                yield piece
+
+    def load(self) -> Transcript:
+        """Return an in-memory :class:`Transcript` with the current contents."""
+        return Transcript(self.text, self.text_path)
+
+    def _iter_mmap_chunks(self, size: int) -> Iterator[str]:
+        with self.text_path.open("rb") as handle:
+            if self.text_path.stat().st_size == 0:  # empty files cannot be mapped
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                decoder = codecs.getincrementaldecoder(self.encoding)()
+                for offset in range(0, len(mapped), size):
+                    piece = decoder.decode(mapped[offset:offset + size])
+                    if piece:
+                        yield piece
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    yield tail
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyTranscript):
+            return NotImplemented
+        return self.text_path == other.text_path and self.encoding == other.encoding
+
+    def __hash__(self) -> int:
+        return hash((self.text_path, self.encoding))
+
+    def __repr__(self) -> str:
+        return f"LazyTranscript(text_path={self.text_path!r})"
+
+
+AnyTranscript = Union[Transcript, LazyTranscript]
+
+
+def replace_text(path: Path, text: str) -> None:
+    """Write ``text`` to a ``.part`` file and move it over ``path``.
+
+    Outputs may be hard links to the files of an earlier run (see
+    :mod:`voicebrief.fingerprint`); replacing the file instead of writing
+    into it leaves the other link untouched.
+    """
+    partial = path.with_name(path.name + ".part")
+    try:
+        partial.write_text(text, encoding="utf-8")
+        partial.replace(path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+class RollingTranscript:
+    """Consolidated transcript appended in chunk order while chunks complete.
+
+    Chunk texts may be added in any order (:meth:`add` is thread-safe); the
+    file grows as soon as the next chunk of the completed prefix is known,
+    and is flushed after every piece, so it can be followed with ``tail -f``.
+    With ``stitch`` the chunks overlap: a piece is written once its
+    successor has arrived, trimmed exactly as by
+    :func:`voicebrief.stitch.stitch_pieces`, with seams searched within
+    ``window_words`` of each cut (see :func:`voicebrief.stitch.seam_window`).
+    With ``piece_paths`` each trimmed piece is also written to its own file,
+    so later stages can read the stitched text chunk by chunk. After a failed
+    run the file holds the transcript of the completed prefix.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        total: int,
+        stitch: bool = False,
+        keep_pieces: bool = True,
+        separator: str = " ",
+        window_words: int = DEFAULT_WINDOW_WORDS,
+        piece_paths: Optional[Sequence[Path]] = None,
+    ):
+        if piece_paths is not None and len(piece_paths) != total:
+            raise ValueError(f"Expected {total} piece paths, got {len(piece_paths)}")
+        self.path = path
+        self.total = total
+        self.piece_paths = list(piece_paths) if piece_paths is not None else None
+        self.stitch = stitch
+        self.window_words = window_words
+        self.separator = separator
+        self.pieces: Optional[List[str]] = [] if keep_pieces else None
+        self._texts: Dict[int, str] = {}
+        self._next = 0
+        self._start = 0
+        self._wrote = False
+        self._lock = threading.Lock()
+        # Unlink first: the file may be a hard link to an earlier run's output.
+        path.unlink(missing_ok=True)
+        self._handle = path.open("w", encoding="utf-8")
+
+    def __enter__(self) -> "RollingTranscript":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+    @property
+    def completed(self) -> int:
+        """Number of chunks written to the file."""
+        return self._next
+
+    def add(self, index: int, text: str) -> None:
+        """Record the transcript of chunk ``index`` (0-based) and write what is ready."""
+        if not 0 <= index < self.total:
+            raise IndexError(f"Chunk index {index} outside 0..{self.total - 1}")
+        with self._lock:
+            if index < self._next or index in self._texts:
+                raise ValueError(f"Chunk {index} was already added")
+            self._texts[index] = text
+            self._write_ready()
+
+    def _write_ready(self) -> None:
+        while self._next in self._texts:
+            index = self._next
+            text = self._texts[index]
+            end, next_start = len(text), 0
+            if self.stitch and index + 1 < self.total:
+                if index + 1 not in self._texts:
+                    return
+                seam = find_seam(text, self._texts[index + 1], self.window_words)
+                if seam is not None:
+                    end, next_start = max(self._start, seam[0]), seam[1]
+            piece = text[self._start:end].strip()
+            if piece:
+                if self._wrote:
+                    self._handle.write(self.separator)
+                self._handle.write(piece)
+                self._handle.flush()
+                self._wrote = True
+            if self.pieces is not None:
+                self.pieces.append(piece)
+            if self.piece_paths is not None:
+                replace_text(self.piece_paths[index], piece)
+            del self._texts[index]
+            self._start = next_start
+            self._next += 1
+
+    def finish(self) -> AnyTranscript:
+        """Close the file once every chunk is written and return it as a transcript.
+
+        A :class:`Transcript` when the pieces were kept, otherwise a
+        :class:`LazyTranscript`.
+        """
+        with self._lock:
+            if self._next != self.total:
+                raise RuntimeError(f"Only {self._next} of {self.total} chunks were added to {self.path}")
+            self._handle.close()
+        transcript: AnyTranscript
+        if self.pieces is not None:
+            transcript = Transcript(self.separator.join(p for p in self.pieces if p), self.path)
+        else:
+            transcript = LazyTranscript(self.path)
+        transcript_written(transcript)
+        return transcript
@@ -0,0 +1,126 @@
+"""Configuration of the OpenAI-compatible endpoints used for transcription and chat.
+
+Both endpoints are configured from environment variables (or ``.env``) so
+audio can be sent to one server, for instance a colocated Whisper server,
+and post-processing to another. Unset values fall back to the standard
+``OPENAI_*`` variables and then to the public OpenAI API.
+
+==================================  ======================================
+Transcription                       Chat (post-processing)
+==================================  ======================================
+``VOICEBRIEF_TRANSCRIBE_BASE_URL``  ``VOICEBRIEF_CHAT_BASE_URL``
+``VOICEBRIEF_TRANSCRIBE_API_KEY``   ``VOICEBRIEF_CHAT_API_KEY``
+``VOICEBRIEF_TRANSCRIBE_MODEL``     ``VOICEBRIEF_CHAT_MODEL``
+``VOICEBRIEF_TRANSCRIBE_TIMEOUT``   ``VOICEBRIEF_CHAT_TIMEOUT``
+``VOICEBRIEF_TRANSCRIBE_HEADERS``   ``VOICEBRIEF_CHAT_HEADERS``
+==================================  ======================================
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+DEFAULT_TRANSCRIPTION_MODEL = "whisper-1"
+DEFAULT_TRANSCRIPTION_FALLBACK_MODEL = "gpt-4o-mini-transcribe"
+DEFAULT_CHAT_MODEL = "gpt-4o"
+# Placeholder key for self-hosted servers that do not check credentials.
+_NO_KEY = "not-needed"
+
+
+@dataclass(frozen=True)
+class EndpointConfig:
+    """Connection settings and model names for one endpoint."""
+
+    base_url: Optional[str]
+    api_key: Optional[str]
+    model: str
+    fallback_model: Optional[str] = None
+    timeout: Optional[float] = None
+    extra_headers: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return dict(self.extra_headers)
+
+    @property
+    def connection_key(
+        self,
+    ) -> Tuple[Optional[str], Optional[str], Optional[float], Tuple[Tuple[str, str], ...]]:
+        """Settings that require a distinct client (and connection pool)."""
+        return (self.base_url, self.api_key, self.timeout, self.extra_headers)
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load variables from a ``.env`` file once per process."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def transcription_endpoint() -> EndpointConfig:
+    """Endpoint used for speech-to-text requests."""
+    load_env()
+    fallback = os.environ.get(
+        "VOICEBRIEF_TRANSCRIBE_FALLBACK_MODEL", DEFAULT_TRANSCRIPTION_FALLBACK_MODEL
+    )
+    return _endpoint_from_env(
+        "VOICEBRIEF_TRANSCRIBE",
+        os.environ.get("VOICEBRIEF_TRANSCRIBE_MODEL", DEFAULT_TRANSCRIPTION_MODEL),
+        fallback_model=fallback.strip() or None,
+    )
+
+
+def chat_endpoint() -> EndpointConfig:
+    """Endpoint used for post-processing (optimize, markdown, summary)."""
+    load_env()
+    model = os.environ.get("VOICEBRIEF_CHAT_MODEL") or os.environ.get(
+        "OPENAI_MODEL", DEFAULT_CHAT_MODEL
+    )
+    return _endpoint_from_env("VOICEBRIEF_CHAT", model)
+
+
+def _endpoint_from_env(
+    prefix: str, model: str, fallback_model: Optional[str] = None
+) -> EndpointConfig:
+    base_url = os.environ.get(f"{prefix}_BASE_URL") or os.environ.get("OPENAI_BASE_URL") or None
+    api_key = os.environ.get(f"{prefix}_API_KEY") or os.environ.get("OPENAI_API_KEY") or None
+    if api_key is None and os.environ.get(f"{prefix}_BASE_URL"):
+        api_key = _NO_KEY
+    timeout_text = os.environ.get(f"{prefix}_TIMEOUT") or os.environ.get("VOICEBRIEF_TIMEOUT")
+    try:
+        timeout = float(timeout_text) if timeout_text else None
+    except ValueError:
+        raise ValueError(f"{prefix}_TIMEOUT must be a number of seconds, got {timeout_text!r}")
+    return EndpointConfig(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        fallback_model=fallback_model,
+        timeout=timeout,
+        extra_headers=parse_headers(os.environ.get(f"{prefix}_HEADERS", "")),
+    )
+
+
+def parse_headers(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse extra headers given as a JSON object or ``"Name: value; Other: value"``."""
+    text = text.strip()
+    if not text:
+        return ()
+    if text.startswith("{"):
+        parsed = json.loads(text)
+        if not isinstance(parsed, dict):
+            raise ValueError("Extra headers JSON must be an object")
+        return tuple(sorted((str(k), str(v)) for k, v in parsed.items()))
+    headers = []
+    for item in text.split(";"):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition(":")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid header {item.strip()!r}; expected 'Name: value'")
+        headers.append((name.strip(), value.strip()))
+    return tuple(sorted(headers))
@@ -0,0 +1,240 @@
+"""Registry of processed inputs, keyed by a sampled content fingerprint.
+
+The same recording often arrives more than once: re-uploads, or copies in
+other folders. :func:`fingerprint` identifies a file from its size and a
+BLAKE2b hash of evenly spaced samples (about 1 MiB read, whatever the
+size), and the probed duration guards against files that only agree on
+those samples. :class:`FingerprintRegistry` remembers the outputs of each
+successful run under that fingerprint and the options that shaped them,
+so a later run of a copy can reuse them instead of transcribing again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+REGISTRY_ENV = "VOICEBRIEF_FINGERPRINT_DB"
+REUSE_MODES = ("copy", "link")
+# Files up to this size are hashed whole.
+_WHOLE_FILE_BYTES = 1024 * 1024
+_SAMPLES = 16
+_SAMPLE_BYTES = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inputs (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    duration REAL,
+    options TEXT NOT NULL,
+    source TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inputs_fingerprint ON inputs (fingerprint, options);
+"""
+
+
+def fingerprint(path: Path) -> str:
+    """Size and sampled BLAKE2b digest of ``path``, e.g. ``"52428800:3f1c..."``."""
+    size = path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with path.open("rb") as handle:
+        if size <= _WHOLE_FILE_BYTES:
+            digest.update(handle.read())
+        else:
+            step = (size - _SAMPLE_BYTES) / (_SAMPLES - 1)
+            for index in range(_SAMPLES):
+                handle.seek(int(index * step))
+                digest.update(handle.read(_SAMPLE_BYTES))
+    return f"{size}:{digest.hexdigest()}"
+
+
+def registry_path(explicit: Path | str | None = None) -> Optional[Path]:
+    """``explicit``, else ``VOICEBRIEF_FINGERPRINT_DB``, else ``None`` (no registry)."""
+    value = explicit or os.environ.get(REGISTRY_ENV)
+    return Path(value).expanduser() if value else None
+
+
+@dataclass
+class RegisteredOutputs:
+    """Output files of one run, as stored in the registry."""
+
+    source: Path
+    transcripts: List[Path]
+    stitched: Optional[Path] = None
+    optimized: Optional[Path] = None
+    markdown: Optional[Path] = None
+    segments: Optional[Path] = None
+    captions: List[Path] = field(default_factory=list)
+    time_map: Optional[Dict[str, Any]] = None
+
+    def paths(self) -> Iterator[Path]:
+        yield from self.transcripts
+        for path in (self.stitched, self.optimized, self.markdown, self.segments):
+            if path is not None:
+                yield path
+        yield from self.captions
+
+    def exist(self) -> bool:
+        return all(path.is_file() for path in self.paths())
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "transcripts": [str(p.resolve()) for p in self.transcripts],
+                "stitched": _optional_str(self.stitched),
+                "optimized": _optional_str(self.optimized),
+                "markdown": _optional_str(self.markdown),
+                "segments": _optional_str(self.segments),
+                "captions": [str(p.resolve()) for p in self.captions],
+                "time_map": self.time_map,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, source: str, text: str) -> "RegisteredOutputs":
+        data = json.loads(text)
+        return cls(
+            source=Path(source),
+            transcripts=[Path(p) for p in data["transcripts"]],
+            stitched=_optional_path(data.get("stitched")),
+            optimized=_optional_path(data.get("optimized")),
+            markdown=_optional_path(data.get("markdown")),
+            segments=_optional_path(data.get("segments")),
+            captions=[Path(p) for p in data.get("captions", [])],
+            time_map=data.get("time_map"),
+        )
+
+    def place(self, source: Path, output_dir: Path, mode: str = "copy") -> "RegisteredOutputs":
+        """Copy (or hard-link) the outputs into ``output_dir``, named after ``source``.
+
+        The stem of the registered source in each file name is replaced by
+        the stem of ``source``. ``"link"`` saves the space of the copies and
+        falls back to copying when the file is on another file system;
+        voicebrief replaces rather than rewrites its outputs, so a later run
+        on the new source does not change the linked originals. Outputs
+        already in place are kept.
+        """
+        if mode not in REUSE_MODES:
+            raise ValueError(f"Reuse mode must be one of {', '.join(REUSE_MODES)}, got {mode!r}")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        stem = re.compile(rf"(?:(?<=_)|^){re.escape(self.source.stem)}(?=[_.])")
+
+        def renamed(name: str) -> str:
+            return stem.sub(lambda _: source.stem, name, count=1)
+
+        def placed(path: Path) -> Path:
+            target = output_dir / renamed(path.name)
+            if target.exists() and target.samefile(path):
+                return target
+            target.unlink(missing_ok=True)
+            if mode == "link":
+                try:
+                    os.link(path, target)
+                    return target
+                except OSError:
+                    pass
+            shutil.copy2(path, target)
+            return target
+
+        def placed_optional(path: Optional[Path]) -> Optional[Path]:
+            return placed(path) if path is not None else None
+
+        return RegisteredOutputs(
+            source=source,
+            transcripts=[placed(p) for p in self.transcripts],
+            stitched=placed_optional(self.stitched),
+            optimized=placed_optional(self.optimized),
+            markdown=placed_optional(self.markdown),
+            segments=placed_optional(self.segments),
+            captions=[placed(p) for p in self.captions],
+            time_map=self.time_map,
+        )
+
+
+def _optional_str(path: Optional[Path]) -> Optional[str]:
+    return str(path.resolve()) if path is not None else None
+
+
+def _optional_path(value: Optional[str]) -> Optional[Path]:
+    return Path(value) if value else None
+
+
+class FingerprintRegistry:
+    """Processed inputs in a SQLite database, shareable between processes.
+
+    ``options`` is a JSON-serialisable description of the settings that
+    change the outputs; an entry is only reused for the same options.
+    """
+
+    def __init__(self, path: Path | str, busy_timeout_seconds: float = 30.0):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path), timeout=busy_timeout_seconds, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=wal")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "FingerprintRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def register(
+        self, key: str, duration: Optional[float], options: Dict[str, Any], outputs: RegisteredOutputs
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO inputs (fingerprint, duration, options, source, outputs, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, duration, _options_key(options), str(outputs.source.resolve()), outputs.to_json(), time.time()),
+            )
+
+    def lookup(
+        self, key: str, duration: Optional[float], options: Dict[str, Any]
+    ) -> Optional[RegisteredOutputs]:
+        """Newest entry for ``key`` and ``options`` whose outputs all still exist.
+
+        Entries with a different probed duration (beyond 0.1 s) or with
+        missing outputs are skipped; the latter are removed.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, duration, source, outputs FROM inputs"
+                " WHERE fingerprint = ? AND options = ? ORDER BY created_at DESC",
+                (key, _options_key(options)),
+            ).fetchall()
+        for row in rows:
+            if (row["duration"] is None) != (duration is None):
+                continue
+            if duration is not None and abs(row["duration"] - duration) > 0.1:
+                continue
+            outputs = RegisteredOutputs.from_json(row["source"], row["outputs"])
+            if outputs.exist():
+                return outputs
+            with self._lock:
+                self._db.execute("DELETE FROM inputs WHERE id = ?", (row["id"],))
+        return None
+
+
+def _options_key(options: Dict[str, Any]) -> str:
+    return json.dumps(options, sort_keys=True, separators=(",", ":"))
@@ -7,17 +7,59 @@ provides a summary into a manageable report.
 @license: MIT
 """
 
-# from moviepy.editor import AudioFileClip
-from typing import List
-from openai import OpenAI, OpenAIError
+# Heavy third-party modules (openai, tiktoken, dotenv) are imported lazily
+# inside the functions that need them so CLI startup stays fast.
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, TYPE_CHECKING
 from pathlib import Path
-from dotenv import load_dotenv
-import tiktoken
+import time
 import os
 
-from voicebrief.data import Transcript
+from voicebrief.cancel import CancellableReader, CancellationToken, ProcessingCancelled, call_cancellable
+from voicebrief.captions import Segment, segments_from_response
+from voicebrief.data import AnyTranscript, LazyTranscript, Transcript
+from voicebrief.endpoints import EndpointConfig, chat_endpoint, load_env, transcription_endpoint
+from voicebrief.metrics import RunMetrics
+from voicebrief.profiling import span
 import logging
 
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from openai import OpenAI
+    from tiktoken import Encoding
+
+    from voicebrief.hedging import Hedger
+
+_FALLBACK_ENCODING = "cl100k_base"
+_WARMUP_ENCODINGS = ("cl100k_base", "o200k_base")
+# Upper bound of transcript tokens sent in one post-processing request.
+MAX_BATCH_TOKENS = 4000
+
+# System prompts of the post-processing tasks, shared with bulk mode
+# (voicebrief.batch), and the separators between their partial replies.
+SUMMARY_PROMPT = "You must create a summary of the provided text. Be concise and to the point."
+OPTIMIZE_PROMPT = """Please verify, optionally correct and organize the following text into
+a coherent and well-structured format with clear, distinct paragraphs. Each paragraph should have a logical
+flow and connection to the next, maintaining consistency and clarity throughout the text. Paragraphs should
+be delimted with an empty line."""
+MARKDOWN_PROMPT = """You are a professional transcription formatter. Convert the provided
+transcript into a well-formatted, human-readable markdown document with the highest possible fidelity
+to the original content.
+
+Guidelines:
+- Preserve ALL content - do not summarize or omit anything
+- Format as proper markdown with appropriate headings, lists, and emphasis
+- Organize content into logical sections with clear headings
+- Use proper markdown syntax for better readability
+- Correct obvious transcription errors while maintaining meaning
+- Add appropriate paragraph breaks for readability
+- Ensure smooth reading flow while staying faithful to the source"""
+OPTIMIZED_SEPARATOR = "\n\n"
+MARKDOWN_SEPARATOR = "\n\n---\n\n"
+# Request parameters for segment-level timestamps (Whisper only).
+_TIMESTAMP_PARAMS: Dict[str, Any] = {"response_format": "verbose_json", "timestamp_granularities": ["segment"]}
+
+T = TypeVar("T")
+
 
 def _compose_system_prompt(base_prompt: str, custom_instructions: str | None = None) -> str:
     """Append optional user instructions to the built-in system prompt."""
@@ -31,59 +73,190 @@ def _compose_system_prompt(base_prompt: str, custom_instructions: str | None = N
     )
 
 
-def _get_client() -> OpenAI:
-    """Create an OpenAI client on demand.
+def _get_client(endpoint: Optional[EndpointConfig] = None) -> "OpenAI":
+    """Return the OpenAI client for ``endpoint`` (default: the chat endpoint).
 
     Avoids importing credentials during module import so `--help` works cleanly.
+    Clients are shared per connection settings, so each distinct endpoint
+    keeps its own connection pool for the lifetime of the process.
     """
-    # Load from .env if present
-    load_dotenv()
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    endpoint = endpoint or chat_endpoint()
+    if not endpoint.api_key:
         raise RuntimeError(
             "OPENAI_API_KEY not set. Set it in environment or .env file."
         )
+    return _client_for(*endpoint.connection_key)
+
+
+@lru_cache(maxsize=None)
+def _client_for(
+    base_url: Optional[str],
+    api_key: Optional[str],
+    timeout: Optional[float],
+    extra_headers: Tuple[Tuple[str, str], ...],
+) -> "OpenAI":
+    from openai import OpenAI, OpenAIError
+
+    kwargs: Dict[str, Any] = {"api_key": api_key}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    if extra_headers:
+        kwargs["default_headers"] = dict(extra_headers)
     try:
-        logging.getLogger("voicebrief.gptapi").debug("Initializing OpenAI client")
-        return OpenAI(api_key=api_key)
+        logging.getLogger("voicebrief.gptapi").debug(
+            "Initializing OpenAI client (base_url=%s)", base_url or "default"
+        )
+        return OpenAI(**kwargs)
     except OpenAIError as e:
         raise RuntimeError(f"Failed to initialize OpenAI client: {e}")
 
 
 def _get_model() -> str:
-    """Get the OpenAI model to use from environment variable.
-    
-    Reads from OPENAI_MODEL environment variable with fallback to gpt-4o.
+    """Get the chat model used for post-processing.
+
+    Reads VOICEBRIEF_CHAT_MODEL, then OPENAI_MODEL, with fallback to gpt-4o.
     """
-    load_dotenv()
-    model = os.environ.get("OPENAI_MODEL", "gpt-4o")
-    return model
+    return chat_endpoint().model
 
 
-def _get_encoding(model: str):
+def tiktoken_cache_dir() -> Path:
+    """Directory where tiktoken stores its BPE files.
+
+    Precedence: ``TIKTOKEN_CACHE_DIR`` > ``VOICEBRIEF_TIKTOKEN_CACHE_DIR`` >
+    ``~/.cache/voicebrief/tiktoken``. The chosen directory is exported as
+    ``TIKTOKEN_CACHE_DIR`` so tiktoken reads from (and writes to) it.
+    """
+    load_env()
+    cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR") or os.environ.get(
+        "VOICEBRIEF_TIKTOKEN_CACHE_DIR"
+    )
+    path = Path(cache_dir).expanduser() if cache_dir else Path.home() / ".cache" / "voicebrief" / "tiktoken"
+    os.environ["TIKTOKEN_CACHE_DIR"] = str(path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str) -> "Encoding":
+    """Load a tiktoken encoding by name, memoized per process."""
+    import tiktoken
+
+    cache_dir = tiktoken_cache_dir()
+    try:
+        with span("tiktoken.load " + encoding_name, "tokenize"):
+            return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        raise RuntimeError(
+            f"Unable to load tiktoken encoding '{encoding_name}' (cache: {cache_dir}): {e}. "
+            "Run 'voicebrief warmup' on a machine with network access and copy the cache "
+            "directory, or point VOICEBRIEF_TIKTOKEN_CACHE_DIR at a pre-populated cache."
+        ) from e
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> "Encoding":
     """Get the tiktoken encoding for a model with fallback.
-    
+
     If the model is not recognized by tiktoken, falls back to cl100k_base
     which is used by GPT-4, GPT-3.5-turbo, and newer models.
     """
+    from tiktoken.model import encoding_name_for_model
+
     log = logging.getLogger("voicebrief.gptapi")
     try:
-        return tiktoken.encoding_for_model(model)
+        encoding_name = encoding_name_for_model(model)
     except KeyError:
         log.warning(
             "Model '%s' not recognized by tiktoken. Falling back to cl100k_base encoding "
             "(used by GPT-4 and newer models).", model
         )
-        return tiktoken.get_encoding("cl100k_base")
+        encoding_name = _FALLBACK_ENCODING
+    return _load_encoding(encoding_name)
 
 
-def speech_to_text(audio_path):
-    """Transcribe an audio file using OpenAI.
+def warmup(models: Iterable[str] = ()) -> Path:
+    """Pre-populate the tiktoken cache so later runs work offline.
+
+    Loads the encodings used by ``models`` (default: the configured model)
+    plus the common GPT-4/GPT-4o encodings, and returns the cache directory.
+    """
+    log = logging.getLogger("voicebrief.gptapi")
+    cache_dir = tiktoken_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for name in _WARMUP_ENCODINGS:
+        _load_encoding(name)
+        log.info("Cached tiktoken encoding %s", name)
+    for model in list(models) or [_get_model()]:
+        _get_encoding(model)
+        log.info("Cached tiktoken encoding for model %s", model)
+    return cache_dir
+
+
+def _chat_completion(
+    client: "OpenAI",
+    model: str,
+    system_prompt: str,
+    text: str,
+    task: str,
+    metrics: Optional[RunMetrics] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> str:
+    """Send a single system + user chat request and return the reply text.
+
+    Latency and token usage are recorded on ``metrics`` when given.
+    """
+    start = time.perf_counter()
+    with span("chat.completions", "http", task=task, model=model):
+        response = call_cancellable(
+            cancel_token,
+            client.chat.completions.create,
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text},
+            ],
+        )
+    if metrics is not None:
+        usage = getattr(response, "usage", None)
+        metrics.record_request(
+            task,
+            model,
+            time.perf_counter() - start,
+            getattr(usage, "prompt_tokens", 0) or 0,
+            getattr(usage, "completion_tokens", 0) or 0,
+        )
+    return response.choices[0].message.content or ""
+
+
+def speech_to_text(audio_path, cancel_token: Optional[CancellationToken] = None):
+    """Transcribe an audio file using the transcription endpoint.
 
     Uses a binary file handle (not Path) to avoid request parsing errors.
-    Tries Whisper first, then falls back to GPT-4o Mini Transcribe.
+    Tries the configured model (Whisper by default) first, then falls back to
+    the configured fallback model (GPT-4o Mini Transcribe by default).
     """
-    client = _get_client()
+    return _transcription_response(audio_path, cancel_token).text
+
+
+def speech_to_segments(
+    audio_path, cancel_token: Optional[CancellationToken] = None
+) -> Tuple[str, Optional[List[Segment]]]:
+    """Like :func:`speech_to_text`, but also return segment timestamps.
+
+    The primary model is asked for ``verbose_json`` with segment
+    granularity. The fallback model does not offer timestamps, so a
+    fallback response comes back with ``None`` segments.
+    """
+    response = _transcription_response(audio_path, cancel_token, timestamps=True)
+    return response.text, segments_from_response(response)
+
+
+def _transcription_response(
+    audio_path, cancel_token: Optional[CancellationToken] = None, timestamps: bool = False
+):
+    endpoint = transcription_endpoint()
+    client = _get_client(endpoint)
     audio_path = Path(audio_path)
     if not audio_path.exists() or audio_path.stat().st_size == 0:
         raise FileNotFoundError(f"Audio file not found or empty: {audio_path}")
@@ -92,210 +265,254 @@ def speech_to_text(audio_path):
     size = audio_path.stat().st_size
     log.debug("Preparing transcription upload: %s (size=%d bytes)", audio_path, size)
     with audio_path.open("rb") as f:
+        # Streaming through the reader stops an abandoned upload at the next chunk.
+        upload = CancellableReader(f, cancel_token) if cancel_token is not None else f
         try:
-            response = client.audio.transcriptions.create(
-                model="whisper-1", file=f
-            )
-            log.debug("Transcribed with model=whisper-1")
+            with span("audio.transcriptions", "http", model=endpoint.model, file=audio_path.name):
+                response = call_cancellable(
+                    cancel_token,
+                    client.audio.transcriptions.create,
+                    model=endpoint.model,
+                    file=upload,
+                    **_TIMESTAMP_PARAMS if timestamps else {},
+                )
+            log.debug("Transcribed with model=%s", endpoint.model)
+        except ProcessingCancelled:
+            raise
         except Exception as e:
+            if not endpoint.fallback_model:
+                raise
             # Retry with newer model if Whisper is unavailable/retired or on server error
-            log.warning("Primary transcription failed (%s). Falling back to gpt-4o-mini-transcribe.", type(e).__name__)
-            f.seek(0)
-            response = client.audio.transcriptions.create(
-                model="gpt-4o-mini-transcribe", file=f
+            log.warning(
+                "Primary transcription failed (%s). Falling back to %s.",
+                type(e).__name__,
+                endpoint.fallback_model,
             )
-            log.debug("Transcribed with model=gpt-4o-mini-transcribe (fallback)")
-    return response.text
-
-
-def summarize_text(text, custom_instructions: str | None = None):
+            f.seek(0)
+            with span(
+                "audio.transcriptions", "http", model=endpoint.fallback_model, file=audio_path.name
+            ):
+                response = call_cancellable(
+                    cancel_token,
+                    client.audio.transcriptions.create,
+                    model=endpoint.fallback_model,
+                    file=upload,
+                )
+            log.debug("Transcribed with model=%s (fallback)", endpoint.fallback_model)
+    return response
+
+
+def summarize_text(
+    text,
+    custom_instructions: str | None = None,
+    metrics: Optional[RunMetrics] = None,
+    cancel_token: Optional[CancellationToken] = None,
+):
     client = _get_client()
     model = _get_model()
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {
-                "role": "system",
-                "content": _compose_system_prompt(
-                    "You must create a summary of the provided text. "
-                    "Be concise and to the point.",
-                    custom_instructions,
-                ),
-            },
-            {"role": "user", "content": text},
-        ],
+    return _chat_completion(
+        client,
+        model,
+        _compose_system_prompt(SUMMARY_PROMPT, custom_instructions),
+        text,
+        "summary",
+        metrics,
+        cancel_token,
     )
 
-    return response.choices[0].message.content
+
+def transcription_output_path(audio_path: Path, destination_dir_path: Path | None = None) -> Path:
+    """``transcription_<audio stem>.txt`` in ``destination_dir_path`` (default: next to the audio)."""
+    audio_path = Path(audio_path)
+    destination_dir = Path(destination_dir_path) if destination_dir_path is not None else audio_path.parent
+    return (destination_dir / ("transcription_" + audio_path.name)).with_suffix(".txt")
 
 
-def transcribe_audio(audio_path: Path, destination_dir_path=None) -> Transcript:
+def _write_transcription(text: str, audio_path: Path, destination_dir_path: Path | None) -> Transcript:
+    transcript = Transcript.to_file(text, transcription_output_path(audio_path, destination_dir_path))
+    logging.getLogger("voicebrief.gptapi").info("Transcript written to: %s", transcript.text_path)
+    return transcript
 
-    if destination_dir_path is None:
-        destination_dir_path = audio_path.parent
 
-    destination_path = Path(destination_dir_path) / ("transcription_" + audio_path.name)
+def transcribe_audio(
+    audio_path: Path,
+    destination_dir_path=None,
+    cancel_token: Optional[CancellationToken] = None,
+    hedger: Optional["Hedger"] = None,
+) -> Transcript:
+    """Transcribe ``audio_path`` and write ``transcription_<name>.txt``.
 
+    With a ``hedger`` the request gets its deadline and, when it is slow, a
+    hedged duplicate (see :mod:`voicebrief.hedging`).
+    """
     audio_path = Path(audio_path)
+    text = _call_transcription(speech_to_text, audio_path, cancel_token, hedger)
+    return _write_transcription(text, audio_path, destination_dir_path)
 
-    text = speech_to_text(audio_path)
-    transcription_path = destination_path.with_suffix(".txt")
 
-    transcript = Transcript.to_file(text, transcription_path)
-    print(f"Transcript written to: {transcript.text_path}")
-    return transcript
+def transcribe_audio_segments(
+    audio_path: Path,
+    destination_dir_path=None,
+    cancel_token: Optional[CancellationToken] = None,
+    hedger: Optional["Hedger"] = None,
+) -> Tuple[Transcript, Optional[List[Segment]]]:
+    """:func:`transcribe_audio` that also returns chunk-relative segment timestamps.
+
+    The segments come from the same request as the text; they are ``None``
+    when the model that answered did not provide any.
+    """
+    audio_path = Path(audio_path)
+    text, segments = _call_transcription(speech_to_segments, audio_path, cancel_token, hedger)
+    return _write_transcription(text, audio_path, destination_dir_path), segments
+
+
+def _call_transcription(
+    fn: Callable[[Path, Optional[CancellationToken]], T],
+    audio_path: Path,
+    cancel_token: Optional[CancellationToken],
+    hedger: Optional["Hedger"],
+) -> T:
+    if hedger is None:
+        return fn(audio_path, cancel_token)
+    return hedger.call(
+        lambda token: fn(audio_path, token),
+        cost=audio_path.stat().st_size,
+        cancel_token=cancel_token,
+    )
+
+
+def token_batches(token_counts: Sequence[int], limit: int = MAX_BATCH_TOKENS) -> List[List[int]]:
+    """Group consecutive items into batches of at most ``limit`` tokens.
+
+    Returns the item indices of each batch. An item larger than ``limit`` is
+    sent on its own. Pure function shared by post-processing and the
+    planner, so estimates match the requests that are actually made.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    total = 0
+    for index, count in enumerate(token_counts):
+        if current and total + count > limit:
+            batches.append(current)
+            current, total = [], 0
+        current.append(index)
+        total += count
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _completions_in_batches(
+    client: "OpenAI",
+    model: str,
+    system_prompt: str,
+    transcripts: Sequence[AnyTranscript],
+    task: str,
+    metrics: Optional[RunMetrics] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> Iterator[str]:
+    """Yield one completion per batch of transcripts of at most ``MAX_BATCH_TOKENS``.
+
+    Transcripts are read one at a time (once to count tokens, once when
+    their batch is sent), so lazy transcripts are only held in memory while
+    their batch is assembled.
+    """
+    log = logging.getLogger("voicebrief.gptapi")
+    for text, tokens in request_texts(transcripts, model):
+        log.debug("Processing %s chunk (tokens=%d)", task, tokens)
+        yield _chat_completion(client, model, system_prompt, text, task, metrics, cancel_token)
+
+
+def request_texts(transcripts: Sequence[AnyTranscript], model: str) -> Iterator[Tuple[str, int]]:
+    """Yield ``(text, tokens)`` of each post-processing request for ``transcripts``.
+
+    Consecutive transcripts are joined up to ``MAX_BATCH_TOKENS``; see
+    :func:`token_batches`.
+    """
+    enc = _get_encoding(model)
+    token_counts = []
+    for transcript in transcripts:
+        with span("tiktoken.encode", "tokenize"):
+            token_counts.append(len(enc.encode(transcript.text)))
+
+    for batch in token_batches(token_counts):
+        yield " ".join(transcripts[index].text for index in batch), sum(token_counts[i] for i in batch)
+
+
+def optimized_output_path(transcripts: Sequence[AnyTranscript], destination_path: Path | None = None) -> Path:
+    """``optimized_<first transcript name>`` in ``destination_path`` (default: next to it)."""
+    first = transcripts[0].text_path
+    return Path(destination_path or first.parent) / ("optimized_" + first.name)
+
+
+def markdown_output_path(transcripts: Sequence[AnyTranscript], destination_path: Path | None = None) -> Path:
+    """``full_md_<first transcript stem>.md`` in ``destination_path`` (default: next to it)."""
+    first = transcripts[0].text_path
+    return Path(destination_path or first.parent) / ("full_md_" + first.stem + ".md")
+
+
+def summary_output_path(transcripts: Sequence[AnyTranscript], destination_path: Path | None = None) -> Path:
+    """``summary_<first transcript stem>.md`` in ``destination_path`` (default: next to it)."""
+    first = transcripts[0].text_path
+    return Path(destination_path or first.parent) / ("summary_" + first.stem + ".md")
+
+
+def _write_output(
+    parts: Iterable[str], separator: str, path: Path, lazy: bool
+) -> AnyTranscript:
+    """Write post-processing output; lazy outputs are streamed to disk as produced."""
+    if lazy:
+        return LazyTranscript.write_parts(parts, path, separator)
+    return Transcript.to_file(separator.join(parts), path)
 
 
 def generate_markdown_transcript(
-    transcripts: List[Transcript],
+    transcripts: Sequence[AnyTranscript],
     destination_path: Path | None = None,
     custom_instructions: str | None = None,
-) -> Transcript:
+    metrics: Optional[RunMetrics] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> AnyTranscript:
     """Generate a high-fidelity human-readable markdown transcript.
     
     Processes the transcript in chunks if necessary to ensure the best possible
     formatting and readability while preserving all content with maximum fidelity.
+    The result is a :class:`LazyTranscript` when the inputs are lazy.
     """
     client = _get_client()
     model = _get_model()
     log = logging.getLogger("voicebrief.gptapi")
-    enc = _get_encoding(model)
-    
-    text = ""
-    total_tokens = 0
-    responses = []
-    base_prompt = """You are a professional transcription formatter. Convert the provided
-transcript into a well-formatted, human-readable markdown document with the highest possible fidelity
-to the original content.
-
-Guidelines:
-- Preserve ALL content - do not summarize or omit anything
-- Format as proper markdown with appropriate headings, lists, and emphasis
-- Organize content into logical sections with clear headings
-- Use proper markdown syntax for better readability
-- Correct obvious transcription errors while maintaining meaning
-- Add appropriate paragraph breaks for readability
-- Ensure smooth reading flow while staying faithful to the source"""
     
-    for transcript in transcripts:
-        tokens = enc.encode(transcript.text)
-        if total_tokens + len(tokens) > 4000:
-            # Process accumulated text
-            log.debug("Processing markdown chunk (tokens=%d)", total_tokens)
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": _compose_system_prompt(
-                            base_prompt, custom_instructions
-                        ),
-                    },
-                    {"role": "user", "content": text},
-                ],
-            )
-            responses.append(response.choices[0].message.content)  # type: ignore
-            text = transcript.text
-            total_tokens = len(tokens)
-        else:
-            text += transcript.text + " "
-            total_tokens += len(tokens)
-
-    # Process any remaining text
-    if text:
-        log.debug("Processing final markdown chunk (tokens=%d)", total_tokens)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": _compose_system_prompt(base_prompt, custom_instructions),
-                },
-                {"role": "user", "content": text},
-            ],
-        )
-        responses.append(response.choices[0].message.content)  # type: ignore
-
-    text = "\n\n---\n\n".join(responses)  # type: ignore
-    
-    transcript_ = transcripts[0]
-    if destination_path is None:
-        destination_path = transcript_.text_path.parent / (
-            "full_md_" + transcript_.text_path.stem + ".md"
-        )
-    else:
-        destination_path = Path(destination_path) / (
-            "full_md_" + transcript_.text_path.stem + ".md"
-        )
+    system_prompt = _compose_system_prompt(MARKDOWN_PROMPT, custom_instructions)
+    destination_path = markdown_output_path(transcripts, destination_path)
 
-    markdown_transcript = Transcript.to_file(text, destination_path)
+    responses = _completions_in_batches(
+        client, model, system_prompt, transcripts, "markdown", metrics, cancel_token
+    )
+    markdown_transcript = _write_output(
+        responses, MARKDOWN_SEPARATOR, destination_path, isinstance(transcripts[0], LazyTranscript)
+    )
     log.info("Markdown transcript written to: %s", markdown_transcript.text_path)
     return markdown_transcript
 
 
 def optimize_transcriptions(
-    transcripts: List[Transcript],
+    transcripts: Sequence[AnyTranscript],
     destination_path: Path | None = None,
     custom_instructions: str | None = None,
-) -> Transcript:
+    metrics: Optional[RunMetrics] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> AnyTranscript:
     """Add the text of all transcript and then calculate the total token size of the text using the tiktoken library"""
     client = _get_client()
     model = _get_model()
-    # To get the tokeniser corresponding to a specific model in the OpenAI API:
-    enc = _get_encoding(model)
-    text = ""
-    total_tokens = 0
-    responses = []
-    base_prompt = """Please verify, optionally correct and organize the following text into
-a coherent and well-structured format with clear, distinct paragraphs. Each paragraph should have a logical
-flow and connection to the next, maintaining consistency and clarity throughout the text. Paragraphs should
-be delimted with an empty line."""
-    for transcript in transcripts:
-        tokens = enc.encode(transcript.text)
-        if total_tokens + len(tokens) > 4000:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": _compose_system_prompt(
-                            base_prompt, custom_instructions
-                        ),
-                    },
-                    {"role": "user", "content": text},
-                ],
-            )
-            responses.append(response.choices[0].message.content)  # type: ignore
-            text = transcript.text
-            total_tokens = len(tokens)
-        else:
-            text += transcript.text + " "
-            total_tokens += len(tokens)
-
-    if text:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": _compose_system_prompt(base_prompt, custom_instructions),
-                },
-                {"role": "user", "content": text},
-            ],
-        )
-        responses.append(response.choices[0].message.content)  # type: ignore
-
-    text = "\n\n".join(responses)  # type: ignore
-
-    transcript_ = transcripts[0]
-    if destination_path is None:
-        destination_path = transcript_.text_path.parent / (
-            "optimized_" + transcript_.text_path.name
-        )
-    else:
-        destination_path = Path(destination_path) / (
-            "optimized_" + transcript_.text_path.name
-        )
+    system_prompt = _compose_system_prompt(OPTIMIZE_PROMPT, custom_instructions)
+    destination_path = optimized_output_path(transcripts, destination_path)
 
-    optimized_transcript = Transcript.to_file(text, destination_path)
+    responses = _completions_in_batches(
+        client, model, system_prompt, transcripts, "optimize", metrics, cancel_token
+    )
+    optimized_transcript = _write_output(
+        responses, OPTIMIZED_SEPARATOR, destination_path, isinstance(transcripts[0], LazyTranscript)
+    )
     return optimized_transcript
@@ -3,22 +3,82 @@ from __future__ import annotations
 
 import logging
 import threading
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
-from voicebrief.app import run_voicebrief
+from voicebrief.jobs import Job, JobRunner, JobState
 from voicebrief.logging_utils import configure_logging
 
 
 @dataclass(slots=True)
 class _GuiConfig:
-    source: Optional[Path] = None
     destination: Optional[Path] = None
     force_video: bool = False
     auto_detect: bool = True
     custom_instructions: str = ""
     log_level: str = "INFO"
+    concurrency: int = 2
+
+
+_LOG_FLUSH_INTERVAL_MS = 100
+_LOG_MAX_LINES = 5000
+
+
+class _LogBatcher:
+    """Thread-safe queue of log lines flushed to the UI in batches.
+
+    At most ``max_lines`` lines are kept pending; older ones are dropped and
+    counted so a log storm between two flushes cannot grow memory.
+    """
+
+    def __init__(self, max_lines: int = _LOG_MAX_LINES):
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
+
+    def add(self, line: str) -> bool:
+        """Queue ``line``; return ``True`` when the caller must schedule a flush."""
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+            if self._flush_scheduled:
+                return False
+            self._flush_scheduled = True
+            return True
+
+    def drain(self) -> str:
+        """Return all pending text (with a note about dropped lines) and reset."""
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._flush_scheduled = False
+        if dropped:
+            lines.insert(0, f"... {dropped} log line(s) dropped ...\n")
+        return "".join(lines)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}m{secs:02d}s" if minutes else f"{secs}s"
+
+
+def _job_status_text(job: Job) -> str:
+    """Progress bar text for a queued job."""
+    if job.state is JobState.RUNNING:
+        text = f"{job.stage.capitalize()}..." if job.stage else "Starting..."
+        if job.stage == "transcription":
+            text = f"Transcribing {job.fraction:.0%}"
+            if job.eta_seconds is not None:
+                text += f" · ETA {_format_duration(job.eta_seconds)}"
+        return text
+    if job.state is JobState.FAILED:
+        return "Failed"
+    return job.state.value.capitalize()
 
 
 def launch_gui() -> None:
@@ -35,7 +95,7 @@ def launch_gui() -> None:
 
         gi.require_version("Gtk", "4.0")
         gi.require_version("Gdk", "4.0")
-        from gi.repository import Gdk, Gio, GLib, Gtk
+        from gi.repository import Gdk, Gio, GLib, Gtk, Pango
     except (ImportError, ValueError) as exc:  # pragma: no cover - environment specific
         raise RuntimeError(
             "GTK 4 runtime is required to use the Voicebrief GUI. "
@@ -57,46 +117,155 @@ def launch_gui() -> None:
     configure_logging("INFO")
 
     class GtkTextViewHandler(logging.Handler):
-        def __init__(self, buffer: Gtk.TextBuffer):
+        """Forward log records to a text buffer in time-based batches.
+
+        Records are coalesced and written at most every
+        ``_LOG_FLUSH_INTERVAL_MS``; the buffer keeps the last
+        ``_LOG_MAX_LINES`` lines.
+        """
+
+        def __init__(self, buffer: Gtk.TextBuffer, max_lines: int = _LOG_MAX_LINES):
             super().__init__()
             self._buffer = buffer
+            self._max_lines = max_lines
+            self._batcher = _LogBatcher(max_lines)
             self.setFormatter(
                 logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
             )
 
         def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - UI thread
-            message = self.format(record)
-            GLib.idle_add(self._append_message, message + "\n")
-
-        def _append_message(self, message: str) -> None:
-            self._buffer.insert(self._buffer.get_end_iter(), message)
+            try:
+                message = self.format(record)
+            except Exception:
+                self.handleError(record)
+                return
+            self.append_text(message + "\n")
+
+        def append_text(self, text: str) -> None:  # pragma: no cover - UI thread
+            """Queue ``text`` for the next flush; callable from any thread."""
+            if self._batcher.add(text):
+                GLib.timeout_add(_LOG_FLUSH_INTERVAL_MS, self._flush)
+
+        def _flush(self) -> bool:  # pragma: no cover - UI thread
+            text = self._batcher.drain()
+            if text:
+                self._buffer.insert(self._buffer.get_end_iter(), text)
+                excess = self._buffer.get_line_count() - self._max_lines
+                if excess > 0:
+                    start = self._buffer.get_start_iter()
+                    end = self._buffer.get_iter_at_line(excess)
+                    # PyGObject returns (valid, iter) for get_iter_at_line on GTK 4
+                    end = end[1] if isinstance(end, tuple) else end
+                    self._buffer.delete(start, end)
+            return False  # one-shot timeout
+
+    class JobRow(Gtk.ListBoxRow):  # pragma: no cover - UI
+        """One queued file with its own progress bar and cancel button."""
+
+        def __init__(self, source: Path, on_cancel):
+            super().__init__()
+            self.source = source
+            self.job: Optional[Job] = None
+
+            box = Gtk.Box(spacing=12)
+            box.set_margin_top(4)
+            box.set_margin_bottom(4)
+            box.set_margin_start(6)
+            box.set_margin_end(6)
+            name_label = Gtk.Label(label=source.name, xalign=0)
+            name_label.set_tooltip_text(str(source))
+            name_label.set_ellipsize(Pango.EllipsizeMode.END)
+            name_label.set_size_request(220, -1)
+            box.append(name_label)
+
+            self.progress_bar = Gtk.ProgressBar()
+            self.progress_bar.set_show_text(True)
+            self.progress_bar.set_text("Pending")
+            self.progress_bar.set_hexpand(True)
+            self.progress_bar.set_valign(Gtk.Align.CENTER)
+            box.append(self.progress_bar)
+
+            self.cancel_button = Gtk.Button(label="Remove")
+            self.cancel_button.connect("clicked", lambda _button: on_cancel(self))
+            box.append(self.cancel_button)
+            self.set_child(box)
+
+        @property
+        def finished(self) -> bool:
+            return self.job is not None and self.job.state.finished
+
+        def attach(self, job: Job) -> None:
+            self.job = job
+            self.cancel_button.set_label("Cancel")
+            self.refresh()
+
+        def refresh(self) -> None:
+            if self.job is None:
+                return
+            self.progress_bar.set_fraction(self.job.fraction)
+            self.progress_bar.set_text(_job_status_text(self.job))
+            if self.job.error:
+                self.set_tooltip_text(self.job.error)
+            self.cancel_button.set_sensitive(not self.job.state.finished)
 
     class VoicebriefWindow(Gtk.ApplicationWindow):  # pragma: no cover - UI
         def __init__(self, app: Gtk.Application):
             super().__init__(application=app, title="Voicebrief")
-            self.set_default_size(720, 500)
+            self.set_default_size(760, 640)
             self.set_margin_start(24)
             self.set_margin_end(24)
             self.set_margin_top(24)
             self.set_margin_bottom(24)
 
             self._config = _GuiConfig()
+            self._runner: Optional[JobRunner] = None
+            self._rows: List[JobRow] = []
+            self._rows_by_job: Dict[int, JobRow] = {}
 
             main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
             self.set_child(main_box)
 
-            # Source selector
-            self._source_entry = Gtk.Entry(placeholder_text="Select an audio or video file...")
-            self._source_entry.set_editable(False)
-            self._source_entry.set_hexpand(True)
-            source_button = Gtk.Button(label="Browse...")
-            source_button.connect("clicked", self._choose_source)
-
-            source_box = Gtk.Box(spacing=6)
-            source_box.set_hexpand(True)
-            source_box.append(self._source_entry)
-            source_box.append(source_button)
-            main_box.append(source_box)
+            # File queue (multi-select and drag-and-drop)
+            queue_frame = Gtk.Frame(label="Files")
+            queue_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+            queue_box.set_margin_top(6)
+            queue_box.set_margin_bottom(6)
+            queue_box.set_margin_start(6)
+            queue_box.set_margin_end(6)
+
+            queue_scroller = Gtk.ScrolledWindow()
+            queue_scroller.set_hexpand(True)
+            queue_scroller.set_min_content_height(160)
+            self._queue_list = Gtk.ListBox()
+            self._queue_list.set_selection_mode(Gtk.SelectionMode.NONE)
+            self._queue_list.set_placeholder(
+                Gtk.Label(label="Add audio or video files, or drop them here.")
+            )
+            queue_scroller.set_child(self._queue_list)
+            queue_box.append(queue_scroller)
+
+            drop_target = Gtk.DropTarget.new(Gdk.FileList, Gdk.DragAction.COPY)
+            drop_target.connect("drop", self._on_drop)
+            queue_scroller.add_controller(drop_target)
+
+            add_button = Gtk.Button(label="Add files...")
+            add_button.connect("clicked", self._choose_sources)
+            clear_button = Gtk.Button(label="Clear finished")
+            clear_button.connect("clicked", self._clear_finished)
+            self._jobs_spin = Gtk.SpinButton.new_with_range(1, 8, 1)
+            self._jobs_spin.set_value(self._config.concurrency)
+            self._jobs_spin.set_tooltip_text("Number of files processed at the same time")
+            queue_actions = Gtk.Box(spacing=6)
+            queue_actions.append(add_button)
+            queue_actions.append(clear_button)
+            spacer = Gtk.Box()
+            spacer.set_hexpand(True)
+            queue_actions.append(spacer)
+            queue_actions.append(Gtk.Label(label="Concurrent jobs"))
+            queue_actions.append(self._jobs_spin)
+            queue_box.append(queue_actions)
+            queue_frame.set_child(queue_box)
+            main_box.append(queue_frame)
 
             # Destination selector
             self._destination_entry = Gtk.Entry(placeholder_text="Optional destination directory...")
@@ -150,7 +319,7 @@ def launch_gui() -> None:
             instructions_frame.set_hexpand(True)
             instructions_scroller = Gtk.ScrolledWindow()
             instructions_scroller.set_hexpand(True)
-            instructions_scroller.set_min_content_height(110)
+            instructions_scroller.set_min_content_height(80)
             self._instructions_buffer = Gtk.TextBuffer()
             instructions_view = Gtk.TextView(buffer=self._instructions_buffer)
             instructions_view.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
@@ -159,11 +328,24 @@ def launch_gui() -> None:
             instructions_frame.set_child(instructions_scroller)
             main_box.append(instructions_frame)
 
-            # Run button
+            # Run / cancel buttons
             self._run_button = Gtk.Button(label="Start Processing")
             self._run_button.add_css_class("suggested-action")
+            self._run_button.set_hexpand(True)
             self._run_button.connect("clicked", self._start_processing)
-            main_box.append(self._run_button)
+            self._cancel_button = Gtk.Button(label="Cancel all")
+            self._cancel_button.add_css_class("destructive-action")
+            self._cancel_button.set_sensitive(False)
+            self._cancel_button.connect("clicked", self._cancel_processing)
+            buttons_box = Gtk.Box(spacing=6)
+            buttons_box.append(self._run_button)
+            buttons_box.append(self._cancel_button)
+            main_box.append(buttons_box)
+
+            self._progress_bar = Gtk.ProgressBar()
+            self._progress_bar.set_show_text(True)
+            self._progress_bar.set_text("Idle")
+            main_box.append(self._progress_bar)
 
             # Output log view
             log_frame = Gtk.Frame(label="Activity log")
@@ -185,28 +367,64 @@ def launch_gui() -> None:
             logging.getLogger().setLevel(logging.INFO)
             self.connect("destroy", self._on_destroy)
 
-        def _choose_source(self, _button: Gtk.Button) -> None:
+        def _choose_sources(self, _button: Gtk.Button) -> None:
             dialog = Gtk.FileDialog()
 
             def _on_open(dialog_ref: Gtk.FileDialog, result: Gio.AsyncResult) -> None:
                 try:
-                    file = dialog_ref.open_finish(result)
+                    files = dialog_ref.open_multiple_finish(result)
                 except GLib.Error as err:  # pragma: no cover - UI thread
                     if err.domain == Gtk.DialogError.quark():
                         return
                     self._show_error(err.message)
                     return
 
-                if file is None:
+                if files is None:
                     return
 
-                filename = file.get_path()
-                if filename:
-                    self._source_entry.set_text(filename)
-                    self._config.source = Path(filename)
+                for index in range(files.get_n_items()):
+                    filename = files.get_item(index).get_path()
+                    if filename:
+                        self._add_source(Path(filename))
 
-            dialog.set_title("Select audio or video file")
-            dialog.open(self, None, _on_open)
+            dialog.set_title("Select audio or video files")
+            dialog.open_multiple(self, None, _on_open)
+
+        def _on_drop(self, _target: Gtk.DropTarget, value, _x: float, _y: float) -> bool:
+            added = False
+            for file in value.get_files():
+                filename = file.get_path()
+                if filename and Path(filename).is_file():
+                    self._add_source(Path(filename))
+                    added = True
+            return added
+
+        def _add_source(self, source: Path) -> None:
+            pending = {row.source for row in self._rows if not row.finished}
+            if source in pending:
+                return
+            row = JobRow(source, self._cancel_row)
+            self._rows.append(row)
+            self._queue_list.append(row)
+            self._update_overall_progress()
+
+        def _remove_row(self, row: JobRow) -> None:
+            self._rows.remove(row)
+            if row.job is not None:
+                self._rows_by_job.pop(row.job.id, None)
+            self._queue_list.remove(row)
+
+        def _cancel_row(self, row: JobRow) -> None:
+            if row.job is None:
+                self._remove_row(row)
+                self._update_overall_progress()
+            elif self._runner is not None:
+                self._runner.cancel(row.job.id)
+
+        def _clear_finished(self, _button: Gtk.Button) -> None:
+            for row in [row for row in self._rows if row.finished]:
+                self._remove_row(row)
+            self._update_overall_progress()
 
         def _choose_destination(self, _button: Gtk.Button) -> None:
             dialog = Gtk.FileDialog()
@@ -232,16 +450,16 @@ def launch_gui() -> None:
             dialog.select_folder(self, None, _on_select)
 
         def _start_processing(self, _button: Gtk.Button) -> None:
-            if not self._config.source and not self._source_entry.get_text():
-                self._show_error("Select a source file before starting.")
+            pending = [row for row in self._rows if row.job is None]
+            if not pending:
+                self._show_error("Add at least one source file before starting.")
                 return
 
-            source_path = Path(self._source_entry.get_text())
-            if not source_path.exists():
-                self._show_error("Selected source file does not exist.")
+            missing = [row.source.name for row in pending if not row.source.exists()]
+            if missing:
+                self._show_error("Source file(s) not found: " + ", ".join(missing))
                 return
 
-            self._config.source = source_path
             if self._destination_entry.get_text():
                 self._config.destination = Path(self._destination_entry.get_text())
             else:
@@ -249,6 +467,7 @@ def launch_gui() -> None:
 
             self._config.force_video = self._force_video_switch.get_active()
             self._config.auto_detect = self._auto_detect_switch.get_active()
+            self._config.concurrency = self._jobs_spin.get_value_as_int()
             instruction_start = self._instructions_buffer.get_start_iter()
             instruction_end = self._instructions_buffer.get_end_iter()
             self._config.custom_instructions = self._instructions_buffer.get_text(
@@ -264,40 +483,91 @@ def launch_gui() -> None:
 
             logging.getLogger().setLevel(getattr(logging, log_level, logging.INFO))
 
-            self._run_button.set_sensitive(False)
-            self._append_status("Starting processing...\n")
-
-            def worker() -> None:
-                try:
-                    result = run_voicebrief(
-                        self._config.source,
-                        destination=self._config.destination,
-                        force_video=self._config.force_video,
-                        auto_detect_video=self._config.auto_detect,
-                        generate_markdown=False,
-                        generate_optimized=True,
-                        custom_instructions=self._config.custom_instructions or None,
+            runner = self._ensure_runner()
+            options = dict(
+                destination=self._config.destination,
+                force_video=self._config.force_video,
+                auto_detect_video=self._config.auto_detect,
+                generate_markdown=False,
+                generate_optimized=True,
+                custom_instructions=self._config.custom_instructions or None,
+                lazy_transcripts=True,  # keep memory flat across a day's recordings
+            )
+            self._append_status(
+                f"Queueing {len(pending)} file(s) on {runner.max_workers} concurrent job(s)...\n"
+            )
+            for row in pending:
+                job = runner.submit(row.source, **options)
+                self._rows_by_job[job.id] = row
+                row.attach(job)
+            self._cancel_button.set_sensitive(True)
+            self._update_overall_progress()
+
+        def _ensure_runner(self) -> JobRunner:
+            """Return the job runner, recreating it when idle to apply a new concurrency."""
+            wanted = self._config.concurrency
+            if self._runner is not None:
+                if self._runner.max_workers == wanted:
+                    return self._runner
+                if self._runner.active:
+                    self._append_status(
+                        "Jobs are still running; the new concurrency applies once the queue is idle.\n"
                     )
-                except Exception as exc:  # pragma: no cover - UI thread
-                    logging.getLogger("voicebrief.gui").exception("Processing failed")
-                    GLib.idle_add(self._show_error, str(exc))
-                else:  # pragma: no cover - UI thread
-                    output_files = []
-                    if result.optimized_transcript:
-                        output_files.append(f"Optimized transcript: {result.optimized_transcript.text_path}")
-                    if result.markdown_transcript:
-                        output_files.append(f"Markdown transcript: {result.markdown_transcript.text_path}")
-                    
-                    details = "Finished. " + "; ".join(output_files) + "\\n" if output_files else "Finished processing.\\n"
-                    GLib.idle_add(self._append_status, details)
-                    GLib.idle_add(self._show_message, "Done")
-                finally:  # pragma: no cover - UI thread
-                    GLib.idle_add(self._run_button.set_sensitive, True)
-
-            threading.Thread(target=worker, daemon=True).start()
+                    return self._runner
+                self._runner.shutdown(cancel=False)
+
+            def on_update(job: Job) -> None:
+                GLib.idle_add(self._show_job, job.id)
+
+            self._runner = JobRunner(max_workers=wanted, on_update=on_update)
+            return self._runner
+
+        def _cancel_processing(self, _button: Optional[Gtk.Button] = None) -> None:
+            if self._runner is not None and self._runner.active:
+                self._append_status("Cancelling all jobs...\n")
+                self._runner.cancel_all()
+            self._cancel_button.set_sensitive(False)
+
+        def _show_job(self, job_id: int) -> bool:
+            row = self._rows_by_job.get(job_id)
+            if row is None or row.job is None:
+                return False
+            row.refresh()
+            job = row.job
+            if job.state is JobState.DONE and job.result is not None:
+                outputs = [
+                    str(transcript.text_path)
+                    for transcript in (job.result.optimized_transcript, job.result.markdown_transcript)
+                    if transcript is not None
+                ]
+                details = "; ".join(outputs) if outputs else "no post-processed output"
+                self._append_status(f"Finished {job.source.name}: {details}\n")
+                job.result = None  # the row keeps its status text
+            elif job.state is JobState.FAILED:
+                self._append_status(f"Failed {job.source.name}: {job.error}\n")
+            elif job.state is JobState.CANCELLED:
+                self._append_status(f"Cancelled {job.source.name}\n")
+            self._update_overall_progress()
+            return False
+
+        def _update_overall_progress(self) -> None:
+            submitted = [row.job for row in self._rows if row.job is not None]
+            if not submitted:
+                self._progress_bar.set_fraction(0.0)
+                self._progress_bar.set_text(f"Idle · {len(self._rows)} file(s) queued" if self._rows else "Idle")
+                return
+            finished = sum(1 for job in submitted if job.state.finished)
+            failed = sum(1 for job in submitted if job.state is JobState.FAILED)
+            self._progress_bar.set_fraction(sum(job.fraction for job in submitted) / len(submitted))
+            summary = f"{finished}/{len(submitted)} file(s) finished"
+            if failed:
+                summary += f" · {failed} failed"
+            self._progress_bar.set_text(summary)
+            if finished == len(submitted):
+                self._cancel_button.set_sensitive(False)
 
         def _append_status(self, message: str) -> None:
-            self._log_buffer.insert(self._log_buffer.get_end_iter(), message)
+            self._log_handler.append_text(message)
 
         def _show_error(self, message: str) -> None:
             dialog = Gtk.MessageDialog(
@@ -310,18 +580,9 @@ def launch_gui() -> None:
             dialog.connect("response", lambda d, *_: d.destroy())
             dialog.present()
 
-        def _show_message(self, message: str) -> None:
-            dialog = Gtk.MessageDialog(
-                transient_for=self,
-                modal=True,
-                message_type=Gtk.MessageType.INFO,
-                buttons=Gtk.ButtonsType.OK,
-                text=message,
-            )
-            dialog.connect("response", lambda d, *_: d.destroy())
-            dialog.present()
-
         def _on_destroy(self, *_args) -> None:
+            if self._runner is not None:
+                self._runner.shutdown(cancel=True)
             logging.getLogger().removeHandler(self._log_handler)
 
     class VoicebriefApplication(Gtk.Application):  # pragma: no cover - UI
@@ -0,0 +1,221 @@
+"""Per-request deadlines and hedged requests for transcription calls.
+
+A hedge is a duplicate of a request that is still running after a latency
+percentile learned from recent requests. Whichever copy finishes first wins
+and the other is cancelled: a transcription still uploading stops at its
+next chunk and drops its connection, one already waiting for its response
+is abandoned and its result discarded. Hedges are capped at a fraction of the work
+sent so far, so a slow endpoint cannot double the bill.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Optional, TypeVar
+
+from voicebrief.cancel import CancellationToken, ProcessingCancelled, raise_if_cancelled
+from voicebrief.metrics import RunMetrics
+
+T = TypeVar("T")
+
+_CANCELLED = object()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request, including any hedge, runs past its deadline."""
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies in seconds (thread-safe)."""
+
+    def __init__(self, window: int = 100):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or ``None`` when it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(samples)))
+        return samples[rank - 1]
+
+
+_TRANSCRIPTION_LATENCY = LatencyTracker()
+
+
+def transcription_latency() -> LatencyTracker:
+    """Latencies of transcription requests, shared by all runs in the process."""
+    return _TRANSCRIPTION_LATENCY
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Deadline and hedging settings for transcription requests.
+
+    ``hedge_percentile`` of ``None`` disables hedging, so the policy only
+    enforces ``deadline_seconds``. ``max_extra_fraction`` caps the hedged
+    work at that fraction of the work sent, measured in uploaded bytes.
+    """
+
+    deadline_seconds: Optional[float] = None
+    hedge_percentile: Optional[float] = None
+    max_extra_fraction: float = 0.2
+    min_samples: int = 3
+    min_delay_seconds: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.deadline_seconds is not None and self.deadline_seconds <= 0:
+            raise ValueError("deadline_seconds must be positive")
+        if self.hedge_percentile is not None and not 0 < self.hedge_percentile <= 100:
+            raise ValueError("hedge_percentile must be in (0, 100]")
+        if self.max_extra_fraction < 0:
+            raise ValueError("max_extra_fraction must not be negative")
+
+    @property
+    def hedging(self) -> bool:
+        return self.hedge_percentile is not None and self.max_extra_fraction > 0
+
+
+class Hedger:
+    """Run requests with a deadline and, when the policy allows, a hedge.
+
+    One instance is used per run, so the spend cap applies to that run; the
+    latency ``tracker`` is usually shared across runs.
+    """
+
+    def __init__(
+        self,
+        policy: HedgePolicy,
+        tracker: Optional[LatencyTracker] = None,
+        metrics: Optional[RunMetrics] = None,
+    ):
+        self.policy = policy
+        self.tracker = tracker if tracker is not None else transcription_latency()
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._primary_cost = 0.0
+        self._extra_cost = 0.0
+        self._log = logging.getLogger("voicebrief.hedging")
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a request is hedged, or ``None`` if it is not."""
+        policy = self.policy
+        if not policy.hedging or len(self.tracker) < policy.min_samples:
+            return None
+        assert policy.hedge_percentile is not None
+        threshold = self.tracker.percentile(policy.hedge_percentile)
+        if threshold is None:
+            return None
+        return max(policy.min_delay_seconds, threshold)
+
+    def _reserve_hedge(self, cost: float) -> bool:
+        with self._lock:
+            if self._extra_cost + cost > self.policy.max_extra_fraction * self._primary_cost:
+                return False
+            self._extra_cost += cost
+            return True
+
+    def call(
+        self,
+        fn: Callable[[CancellationToken], T],
+        cost: float = 1.0,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> T:
+        """Return the result of the first attempt of ``fn`` that succeeds.
+
+        ``fn`` receives a token that is cancelled once the call is decided;
+        the losing attempt stops as soon as it checks the token (see
+        :class:`voicebrief.cancel.CancellableReader`), and the caller never
+        waits for it. ``cost`` is the
+        work of one attempt (e.g. bytes uploaded) for the spend cap. Raises
+        :class:`DeadlineExceeded` after ``deadline_seconds`` and the error of
+        the last attempt when all attempts fail.
+        """
+        raise_if_cancelled(cancel_token)
+        with self._lock:
+            self._primary_cost += cost
+        outcomes: "queue.Queue[Any]" = queue.Queue()
+        attempt_tokens: List[CancellationToken] = []
+
+        def launch(attempt: int) -> None:
+            token = CancellationToken()
+            attempt_tokens.append(token)
+            started = time.perf_counter()
+
+            def runner() -> None:
+                try:
+                    outcomes.put((attempt, True, fn(token), time.perf_counter() - started))
+                except BaseException as exc:  # reported to the calling thread
+                    outcomes.put((attempt, False, exc, time.perf_counter() - started))
+
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run, args=(runner,), name=f"voicebrief-attempt-{attempt}", daemon=True
+            ).start()
+
+        unregister = (
+            cancel_token.register(lambda: outcomes.put(_CANCELLED)) if cancel_token is not None else (lambda: None)
+        )
+        start = time.perf_counter()
+        deadline = start + self.policy.deadline_seconds if self.policy.deadline_seconds else None
+        delay = self.hedge_delay()
+        hedge_at = start + delay if delay is not None else None
+        running = 1
+        errors: List[BaseException] = []
+        try:
+            launch(0)
+            while True:
+                now = time.perf_counter()
+                waits = [moment - now for moment in (hedge_at, deadline) if moment is not None]
+                try:
+                    item = outcomes.get(timeout=max(0.0, min(waits)) if waits else None)
+                except queue.Empty:
+                    now = time.perf_counter()
+                    if deadline is not None and now >= deadline:
+                        raise DeadlineExceeded(
+                            f"Request did not finish within its deadline of {self.policy.deadline_seconds:g}s"
+                        )
+                    if hedge_at is not None and now >= hedge_at:
+                        hedge_at = None
+                        if self._reserve_hedge(cost):
+                            self._log.info("Request still running after %.1fs; sending a hedge", delay)
+                            if self.metrics is not None:
+                                self.metrics.record_hedge_issued()
+                            launch(1)
+                            running += 1
+                        else:
+                            self._log.debug("Hedge skipped: extra spend cap reached")
+                    continue
+                if item is _CANCELLED:
+                    raise ProcessingCancelled("Processing was cancelled")
+                attempt, ok, value, elapsed = item
+                if ok:
+                    self.tracker.record(elapsed)
+                    if attempt and self.metrics is not None:
+                        self.metrics.record_hedge_won()
+                    return value
+                errors.append(value)
+                running -= 1
+                if running == 0:
+                    # A failed primary is not hedged; retrying is the caller's decision.
+                    raise errors[-1]
+        finally:
+            unregister()
+            for token in attempt_tokens:
+                token.cancel()
@@ -0,0 +1,452 @@
+"""Shared job queue in SQLite for workers on several machines.
+
+Any number of ``voicebrief worker`` processes, on one host or on several
+hosts sharing a volume, claim recordings from the same database file. A
+claimed job is leased to its worker for ``lease_seconds``; the worker
+extends the lease with heartbeats while it runs. A job whose lease expires
+(the worker died or lost the volume) is claimed again by another worker.
+Failed jobs are retried with exponential backoff up to ``max_attempts``
+and are then dead-lettered (state ``failed``) with their last error.
+
+The database uses WAL journaling by default, which lets readers (status
+queries) run alongside the writer. SQLite's WAL index lives in shared
+memory, so every process must run on the same host. For workers on
+different hosts over NFS, open the queue with ``journal_mode="delete"``,
+which relies only on file locks.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from voicebrief.cancel import CancellationToken, ProcessingCancelled
+from voicebrief.jobs import JobState
+
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 30.0
+_JOURNAL_MODES = ("wal", "delete", "truncate", "persist")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (state, available_at);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class QueuedJob:
+    """A row of the ``jobs`` table."""
+
+    id: int
+    source: Path
+    options: Dict[str, Any]
+    state: JobState
+    attempts: int
+    max_attempts: int
+    worker: Optional[str] = None
+    lease_expires: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "QueuedJob":
+        return cls(
+            id=row["id"],
+            source=Path(row["source"]),
+            options=json.loads(row["options"]),
+            state=JobState(row["state"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            worker=row["worker"],
+            lease_expires=row["lease_expires"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+
+class JobQueue:
+    """Durable queue of ``run_voicebrief`` jobs in a SQLite database.
+
+    Every state change checks the worker that holds the lease, so a worker
+    whose lease was taken over cannot overwrite the new owner's outcome.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        journal_mode: str = "wal",
+        busy_timeout_seconds: float = 30.0,
+        retry_backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+    ):
+        if journal_mode.lower() not in _JOURNAL_MODES:
+            raise ValueError(f"journal_mode must be one of {', '.join(_JOURNAL_MODES)}, got {journal_mode!r}")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path), timeout=busy_timeout_seconds, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(f"PRAGMA journal_mode={journal_mode.lower()}")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._log = logging.getLogger("voicebrief.jobqueue")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def enqueue(
+        self,
+        source: Path | str,
+        options: Optional[Dict[str, Any]] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> int:
+        """Add ``source`` with JSON-serialisable ``run_voicebrief`` ``options``; returns the job id."""
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (source, options, max_attempts, available_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (str(source), json.dumps(options or {}), max_attempts, now, now),
+            )
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def claim(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[QueuedJob]:
+        """Lease the oldest available job to ``worker``, or return ``None``.
+
+        Jobs whose lease expired are available again; one that has used up
+        its attempts is dead-lettered instead of being claimed.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            while True:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_expires < ?) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (JobState.QUEUED.value, now, JobState.RUNNING.value, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["state"] == JobState.RUNNING.value:
+                    self._log.warning("Lease of job %d held by %s expired", row["id"], row["worker"])
+                    if row["attempts"] >= row["max_attempts"]:
+                        db.execute(
+                            "UPDATE jobs SET state = ?, error = ?, finished_at = ?, worker = NULL, "
+                            "lease_expires = NULL WHERE id = ?",
+                            (JobState.FAILED.value, f"Lease expired on {row['worker']}", now, row["id"]),
+                        )
+                        continue
+                db.execute(
+                    "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (JobState.RUNNING.value, worker, now + lease_seconds, now, row["id"]),
+                )
+                claimed = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                return QueuedJob.from_row(claimed)
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend the lease; returns ``False`` when ``worker`` no longer holds it."""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ?, heartbeat_at = ? WHERE id = ? AND worker = ? AND state = ?",
+                (now + lease_seconds, now, job_id, worker, JobState.RUNNING.value),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, finished_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND state = ?",
+                (JobState.DONE.value, json.dumps(result or {}), now, job_id, worker, JobState.RUNNING.value),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str, retryable: bool = True) -> Optional[JobState]:
+        """Record a failed attempt: requeue with backoff, or dead-letter it.
+
+        Returns the new state, or ``None`` when ``worker`` no longer holds the lease.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ? AND state = ?",
+                (job_id, worker, JobState.RUNNING.value),
+            ).fetchone()
+            if row is None:
+                return None
+            if retryable and row["attempts"] < row["max_attempts"]:
+                delay = self.retry_backoff_seconds * 2 ** (row["attempts"] - 1)
+                db.execute(
+                    "UPDATE jobs SET state = ?, available_at = ?, error = ?, worker = NULL, lease_expires = NULL "
+                    "WHERE id = ?",
+                    (JobState.QUEUED.value, now + delay, error, job_id),
+                )
+                return JobState.QUEUED
+            db.execute(
+                "UPDATE jobs SET state = ?, error = ?, finished_at = ?, lease_expires = NULL WHERE id = ?",
+                (JobState.FAILED.value, error, now, job_id),
+            )
+            return JobState.FAILED
+
+    def release(self, job_id: int, worker: str) -> bool:
+        """Give a claimed job back without counting the attempt (e.g. on shutdown)."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts - 1, worker = NULL, lease_expires = NULL, "
+                "available_at = ? WHERE id = ? AND worker = ? AND state = ?",
+                (JobState.QUEUED.value, time.time(), job_id, worker, JobState.RUNNING.value),
+            )
+        return cursor.rowcount == 1
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued job; running jobs see it at their next heartbeat."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, lease_expires = NULL WHERE id = ? AND state IN (?, ?)",
+                (JobState.CANCELLED.value, time.time(), job_id, JobState.QUEUED.value, JobState.RUNNING.value),
+            )
+        return cursor.rowcount == 1
+
+    def requeue_failed(self, job_id: Optional[int] = None) -> int:
+        """Move dead-lettered jobs (all, or ``job_id``) back to the queue with fresh attempts."""
+        query = "UPDATE jobs SET state = ?, attempts = 0, available_at = ?, worker = NULL WHERE state = ?"
+        params: List[Any] = [JobState.QUEUED.value, time.time(), JobState.FAILED.value]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+        with self._transaction() as db:
+            return db.execute(query, params).rowcount
+
+    def get(self, job_id: int) -> Optional[QueuedJob]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return QueuedJob.from_row(row) if row else None
+
+    def jobs(self, state: Optional[JobState] = None) -> List[QueuedJob]:
+        with self._lock:
+            if state is None:
+                rows = self._db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+            else:
+                rows = self._db.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state.value,)).fetchall()
+        return [QueuedJob.from_row(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state (every state is present)."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in JobState}
+        counts.update({row["state"]: row["n"] for row in rows})
+        return counts
+
+
+def result_summary(result: Any) -> Dict[str, Any]:
+    """JSON record of a :class:`~voicebrief.app.VoicebriefResult` for the queue."""
+
+    def path_of(transcript: Any) -> Optional[str]:
+        return str(transcript.text_path) if transcript is not None else None
+
+    return {
+        "transcripts": [str(t.text_path) for t in result.transcripts],
+        "stitched": path_of(result.stitched_transcript),
+        "optimized": path_of(result.optimized_transcript),
+        "markdown": path_of(result.markdown_transcript),
+        "segments": str(result.segments_path) if result.segments_path else None,
+        "captions": [str(path) for path in result.caption_paths],
+        "metrics": result.metrics.to_dict(),
+    }
+
+
+# Errors that another attempt cannot fix.
+_PERMANENT_ERRORS = (FileNotFoundError, NotADirectoryError, ValueError)
+
+
+class QueueWorker:
+    """Claim jobs from a :class:`JobQueue` and run them with ``run_voicebrief``.
+
+    ``concurrency`` jobs run at once in this process. While a job runs, a
+    heartbeat extends its lease every third of ``lease_seconds``; if the
+    lease is lost the run is cancelled, since another worker owns the job.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_seconds: float = 5.0,
+        run_options: Optional[Dict[str, Any]] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.run_options = run_options or {}
+        self._stop = threading.Event()
+        self._tokens: Dict[int, CancellationToken] = {}
+        self._tokens_lock = threading.Lock()
+        self._log = logging.getLogger("voicebrief.jobqueue")
+
+    def stop(self, cancel_running: bool = False) -> None:
+        """Stop claiming; with ``cancel_running`` running jobs are released to the queue."""
+        self._stop.set()
+        if cancel_running:
+            with self._tokens_lock:
+                tokens = list(self._tokens.values())
+            for token in tokens:
+                token.cancel()
+
+    def run(self, drain: bool = False) -> int:
+        """Process jobs until :meth:`stop`; with ``drain``, until the queue is empty.
+
+        Ctrl+C cancels the running jobs and returns them to the queue.
+        Returns the number of jobs this worker finished (done or failed).
+        """
+        finished = [0]
+        finished_lock = threading.Lock()
+
+        def loop(slot: int) -> None:
+            name = f"{self.worker_id}#{slot}" if self.concurrency > 1 else self.worker_id
+            while not self._stop.is_set():
+                try:
+                    job = self.queue.claim(name, self.lease_seconds)
+                except sqlite3.Error as exc:
+                    # A locked or briefly unavailable database must not end the slot.
+                    self._log.warning("Claiming a job failed: %s", exc)
+                    self._stop.wait(self.poll_seconds)
+                    continue
+                if job is None:
+                    if drain:
+                        return
+                    self._stop.wait(self.poll_seconds)
+                    continue
+                if self.process(job, name):
+                    with finished_lock:
+                        finished[0] += 1
+
+        threads = [
+            threading.Thread(target=loop, args=(slot,), name=f"voicebrief-worker-{slot}", daemon=True)
+            for slot in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self._log.info("Interrupted; returning running jobs to the queue")
+            self.stop(cancel_running=True)
+            for thread in threads:
+                thread.join()
+        return finished[0]
+
+    def process(self, job: QueuedJob, worker: str) -> bool:
+        """Run one claimed job; returns ``True`` when its outcome was recorded."""
+        from voicebrief.app import run_voicebrief  # Lazy import
+
+        token = CancellationToken()
+        lease_lost = threading.Event()
+        with self._tokens_lock:
+            self._tokens[job.id] = token
+        heartbeat_stop = threading.Event()
+
+        def heartbeat() -> None:
+            while not heartbeat_stop.wait(self.lease_seconds / 3):
+                try:
+                    alive = self.queue.heartbeat(job.id, worker, self.lease_seconds)
+                except sqlite3.Error as exc:
+                    self._log.warning("Heartbeat for job %d failed: %s", job.id, exc)
+                    continue
+                if not alive:
+                    self._log.warning("Job %d is no longer leased to %s; cancelling", job.id, worker)
+                    lease_lost.set()
+                    token.cancel()
+                    return
+
+        beat = threading.Thread(target=heartbeat, name=f"voicebrief-heartbeat-{job.id}", daemon=True)
+        beat.start()
+        self._log.info("Job %d (attempt %d/%d): %s", job.id, job.attempts, job.max_attempts, job.source)
+        try:
+            try:
+                options = {**self.run_options, **job.options}
+                result = run_voicebrief(job.source, cancel_token=token, **options)
+            except ProcessingCancelled:
+                if lease_lost.is_set():
+                    return False
+                self.queue.release(job.id, worker)
+                self._log.info("Job %d released back to the queue", job.id)
+                return False
+            except Exception as exc:
+                retryable = not isinstance(exc, _PERMANENT_ERRORS)
+                state = self.queue.fail(job.id, worker, f"{type(exc).__name__}: {exc}", retryable)
+                self._log.error("Job %d failed (%s): %s", job.id, state.value if state else "lease lost", exc)
+                return state is JobState.FAILED
+            else:
+                recorded = self.queue.complete(job.id, worker, result_summary(result))
+                self._log.info("Job %d done: %s", job.id, job.source)
+                return recorded
+        except sqlite3.Error as exc:
+            # The lease expires and another worker takes the job over.
+            self._log.warning("Recording the outcome of job %d failed: %s", job.id, exc)
+            return False
+        finally:
+            heartbeat_stop.set()
+            with self._tokens_lock:
+                self._tokens.pop(job.id, None)
@@ -0,0 +1,169 @@
+"""In-process job queue running several ``run_voicebrief`` jobs concurrently."""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from voicebrief.app import VoicebriefResult, run_voicebrief
+from voicebrief.cancel import CancellationToken, ProcessingCancelled
+from voicebrief.progress import ChunkTranscribed, ProgressEvent, StageStarted
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+
+@dataclass
+class Job:
+    """A single source file queued for processing."""
+
+    id: int
+    source: Path
+    options: Dict[str, Any]
+    state: JobState = JobState.QUEUED
+    stage: Optional[str] = None
+    fraction: float = 0.0
+    eta_seconds: Optional[float] = None
+    result: Optional[VoicebriefResult] = None
+    error: Optional[str] = None
+    token: CancellationToken = field(default_factory=CancellationToken, repr=False)
+
+
+JobCallback = Callable[[Job], None]
+
+
+class JobRunner:
+    """Process queued jobs on up to ``max_workers`` threads.
+
+    All jobs run in this process and therefore share the same API clients
+    (and connection pools). ``on_update`` is called from worker threads
+    whenever a job changes state or reports progress.
+    """
+
+    def __init__(self, max_workers: int = 2, on_update: Optional[JobCallback] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._on_update = on_update
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="voicebrief-job")
+        self._jobs: Dict[int, Job] = {}
+        self._futures: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("voicebrief.jobs")
+
+    @property
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, source: Path | str, **options: Any) -> Job:
+        """Queue ``source`` with ``run_voicebrief`` keyword ``options``."""
+        job = Job(next(self._ids), Path(source), options)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job)
+        self._notify(job)
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job; returns ``False`` if it already finished."""
+        job = self.get(job_id)
+        if job is None or job.state.finished:
+            return False
+        job.token.cancel()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self._set_state(job, JobState.CANCELLED)
+        return True
+
+    def discard(self, job_id: int) -> bool:
+        """Forget a finished job so long-running runners do not accumulate results."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.state.finished:
+                return False
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+        return True
+
+    def cancel_all(self) -> None:
+        for job in self.jobs:
+            self.cancel(job.id)
+
+    @property
+    def active(self) -> bool:
+        return any(not job.state.finished for job in self.jobs)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until every job submitted so far has finished."""
+        with self._lock:
+            futures = list(self._futures.values())
+        for future in futures:
+            if not future.cancelled():
+                future.exception(timeout=timeout)
+
+    def shutdown(self, cancel: bool = True, wait: bool = False) -> None:
+        if cancel:
+            self.cancel_all()
+        self._executor.shutdown(wait=wait, cancel_futures=cancel)
+
+    def _run(self, job: Job) -> None:
+        if job.token.cancelled:
+            self._set_state(job, JobState.CANCELLED)
+            return
+        self._set_state(job, JobState.RUNNING)
+
+        def on_progress(event: ProgressEvent) -> None:
+            if isinstance(event, StageStarted):
+                job.stage = event.stage
+            elif isinstance(event, ChunkTranscribed):
+                job.fraction = event.completed / max(1, event.total)
+                job.eta_seconds = event.eta_seconds
+            else:
+                return
+            self._notify(job)
+
+        try:
+            job.result = run_voicebrief(
+                job.source, cancel_token=job.token, progress=on_progress, **job.options
+            )
+        except ProcessingCancelled:
+            self._set_state(job, JobState.CANCELLED)
+        except Exception as exc:
+            self._log.exception("Job %d failed for %s", job.id, job.source)
+            job.error = str(exc)
+            self._set_state(job, JobState.FAILED)
+        else:
+            job.fraction = 1.0
+            self._set_state(job, JobState.DONE)
+
+    def _set_state(self, job: Job, state: JobState) -> None:
+        job.state = state
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        if self._on_update is None:
+            return
+        try:
+            self._on_update(job)
+        except Exception:
+            self._log.exception("Job update callback failed")
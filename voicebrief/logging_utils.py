@@ -2,16 +2,143 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
 import os
-from typing import Optional
+import queue
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional
 
 
 _CONFIGURED = False
+_LISTENER: Optional[QueueListener] = None
+_TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+_LOG_FORMATS = ("text", "json")
 
+# Set by run_voicebrief (and the threads it starts) so every record can be
+# attributed to a run, a source file and a chunk.
+_RUN_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("voicebrief_run_id", default=None)
+_FILE: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("voicebrief_file", default=None)
+_CHUNK: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("voicebrief_chunk", default=None)
 
-def configure_logging(level_str: Optional[str] = None) -> None:
-    global _CONFIGURED
+
+@contextmanager
+def log_context(
+    run_id: Optional[str] = None, file: Optional[str] = None, chunk: Optional[int] = None
+) -> Iterator[None]:
+    """Attach ``run_id``, ``file`` and ``chunk`` to records logged in the block.
+
+    Only the given fields change; the others keep their enclosing values.
+    """
+    run_token = _RUN_ID.set(run_id) if run_id is not None else None
+    file_token = _FILE.set(file) if file is not None else None
+    chunk_token = _CHUNK.set(chunk) if chunk is not None else None
+    try:
+        yield
+    finally:
+        if chunk_token is not None:
+            _CHUNK.reset(chunk_token)
+        if file_token is not None:
+            _FILE.reset(file_token)
+        if run_token is not None:
+            _RUN_ID.reset(run_token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto each record as ``run_id``, ``file`` and ``chunk``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = _RUN_ID.get()
+        record.file = _FILE.get()
+        record.chunk = _CHUNK.get()
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """The plain format, followed by the log context when one is set."""
+
+    def __init__(self) -> None:
+        super().__init__(_TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        context = [
+            f"{name}={value}"
+            for name, value in (
+                ("run", getattr(record, "run_id", None)),
+                ("file", getattr(record, "file", None)),
+                ("chunk", getattr(record, "chunk", None)),
+            )
+            if value is not None
+        ]
+        if not context:
+            return text
+        first, newline, rest = text.partition("\n")
+        return f"{first} | {' '.join(context)}{newline}{rest}"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the log context as separate fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "file": getattr(record, "file", None),
+            "chunk": getattr(record, "chunk", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """Queue handler that keeps records structured for the listener's formatter.
+
+    The stock handler formats the record before queueing it; this one only
+    resolves the message arguments and the traceback, which must happen on
+    the logging thread, and leaves the formatting to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging(
+    level_str: Optional[str] = None,
+    fmt: Optional[str] = None,
+    queued: Optional[bool] = None,
+) -> None:
+    """Configure the root logger once per process.
+
+    ``fmt`` is ``"text"`` (default) or ``"json"``. With ``queued`` the
+    handlers run on a background :class:`QueueListener`, so threads that
+    log only enqueue the record and never wait for stderr. Each falls back
+    to ``VOICEBRIEF_LOG_FORMAT`` and ``VOICEBRIEF_LOG_QUEUE``.
+    """
+    global _CONFIGURED, _LISTENER
     if _CONFIGURED:
         return
 
@@ -19,10 +146,31 @@ def configure_logging(level_str: Optional[str] = None) -> None:
     level_name = level_str or os.environ.get("VOICEBRIEF_LOG_LEVEL", "INFO")
     level_name = str(level_name).upper()
     level = getattr(logging, level_name, logging.INFO)
+    fmt = (fmt or os.environ.get("VOICEBRIEF_LOG_FORMAT") or "text").lower()
+    if fmt not in _LOG_FORMATS:
+        raise ValueError(f"Log format must be one of {', '.join(_LOG_FORMATS)}, got {fmt!r}")
+    if queued is None:
+        queued = _env_flag("VOICEBRIEF_LOG_QUEUE")
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    if queued:
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler: logging.Handler = _ContextQueueHandler(records)
+        _LISTENER = QueueListener(records, output, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+    else:
+        handler = output
+    # Filters on the handler run on the logging thread, where the context is set.
+    handler.addFilter(ContextFilter())
+    logging.basicConfig(level=level, handlers=[handler])
     _CONFIGURED = True
 
+
+def shutdown_logging() -> None:
+    """Stop the queue listener after writing every pending record."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
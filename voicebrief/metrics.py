@@ -0,0 +1,242 @@
+"""Structured timing and throughput metrics collected during a Voicebrief run."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """Wall time spent in a named pipeline stage."""
+
+    name: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class ChunkMetrics:
+    """Upload and transcription figures for a single audio chunk."""
+
+    path: Path
+    seconds: float
+    bytes_uploaded: int
+
+
+@dataclass(frozen=True)
+class RequestMetrics:
+    """Latency and token usage of a single post-processing request."""
+
+    task: str
+    model: str
+    seconds: float
+    tokens_in: int
+    tokens_out: int
+
+
+@dataclass
+class RunMetrics:
+    """Metrics for one ``run_voicebrief`` invocation.
+
+    Recording methods are thread-safe so chunks processed concurrently can
+    report into the same instance.
+    """
+
+    stages: List[StageMetrics] = field(default_factory=list)
+    chunks: List[ChunkMetrics] = field(default_factory=list)
+    requests: List[RequestMetrics] = field(default_factory=list)
+    audio_seconds: Optional[float] = None
+    # Duration of the audio actually uploaded, after preprocessing (silence removal, tempo).
+    processed_audio_seconds: Optional[float] = None
+    # Silence cut from the source before transcription.
+    removed_audio_seconds: float = 0.0
+    # Duplicate transcription requests sent for slow chunks, and how many finished first.
+    hedges_issued: int = 0
+    hedges_won: int = 0
+    wall_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it as stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.append(StageMetrics(name, seconds))
+
+    def record_chunk(self, path: Path, seconds: float, bytes_uploaded: int) -> None:
+        with self._lock:
+            self.chunks.append(ChunkMetrics(Path(path), seconds, bytes_uploaded))
+
+    def record_request(
+        self, task: str, model: str, seconds: float, tokens_in: int, tokens_out: int
+    ) -> None:
+        with self._lock:
+            self.requests.append(RequestMetrics(task, model, seconds, tokens_in, tokens_out))
+
+    def record_hedge_issued(self) -> None:
+        with self._lock:
+            self.hedges_issued += 1
+
+    def record_hedge_won(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    def stage_seconds(self, name: str) -> float:
+        """Total seconds recorded for stage ``name`` (0.0 when absent)."""
+        return sum(stage.seconds for stage in self.stages if stage.name == name)
+
+    @property
+    def bytes_uploaded(self) -> int:
+        return sum(chunk.bytes_uploaded for chunk in self.chunks)
+
+    @property
+    def tokens_in(self) -> int:
+        return sum(request.tokens_in for request in self.requests)
+
+    @property
+    def tokens_out(self) -> int:
+        return sum(request.tokens_out for request in self.requests)
+
+    @property
+    def realtime_factor(self) -> Optional[float]:
+        """Seconds of audio processed per second of wall time."""
+        if not self.audio_seconds or self.wall_seconds <= 0:
+            return None
+        return self.audio_seconds / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "audio_seconds": self.audio_seconds,
+            "processed_audio_seconds": self.processed_audio_seconds,
+            "removed_audio_seconds": self.removed_audio_seconds,
+            "realtime_factor": self.realtime_factor,
+            "bytes_uploaded": self.bytes_uploaded,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "hedges_issued": self.hedges_issued,
+            "hedges_won": self.hedges_won,
+            "stages": [{"name": s.name, "seconds": s.seconds} for s in self.stages],
+            "chunks": [
+                {"path": str(c.path), "seconds": c.seconds, "bytes_uploaded": c.bytes_uploaded}
+                for c in self.chunks
+            ],
+            "requests": [
+                {
+                    "task": r.task,
+                    "model": r.model,
+                    "seconds": r.seconds,
+                    "tokens_in": r.tokens_in,
+                    "tokens_out": r.tokens_out,
+                }
+                for r in self.requests
+            ],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "voicebrief") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+            full_name = f"{prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{full_name}{suffix} {value}")
+
+        metric("run_wall_seconds", "gauge", "Wall time of the run.", [((), self.wall_seconds)])
+        if self.audio_seconds is not None:
+            metric("run_audio_seconds", "gauge", "Seconds of audio processed.", [((), self.audio_seconds)])
+        if self.processed_audio_seconds is not None:
+            metric(
+                "run_processed_audio_seconds",
+                "gauge",
+                "Seconds of audio uploaded after preprocessing.",
+                [((), self.processed_audio_seconds)],
+            )
+        metric(
+            "run_removed_audio_seconds",
+            "gauge",
+            "Seconds of silence removed before transcription.",
+            [((), self.removed_audio_seconds)],
+        )
+        if self.realtime_factor is not None:
+            metric(
+                "run_realtime_factor",
+                "gauge",
+                "Audio seconds processed per wall second.",
+                [((), self.realtime_factor)],
+            )
+        metric("bytes_uploaded_total", "counter", "Audio bytes uploaded.", [((), self.bytes_uploaded)])
+        metric(
+            "tokens_total",
+            "counter",
+            "Tokens used by post-processing requests.",
+            [((("direction", "in"),), self.tokens_in), ((("direction", "out"),), self.tokens_out)],
+        )
+
+        metric(
+            "hedges_total",
+            "counter",
+            "Hedged transcription requests.",
+            [((("outcome", "issued"),), self.hedges_issued), ((("outcome", "won"),), self.hedges_won)],
+        )
+
+        stage_totals: Dict[str, float] = {}
+        for stage in self.stages:
+            stage_totals[stage.name] = stage_totals.get(stage.name, 0.0) + stage.seconds
+        metric(
+            "stage_seconds",
+            "gauge",
+            "Wall time per pipeline stage.",
+            [((("stage", name),), seconds) for name, seconds in stage_totals.items()],
+        )
+        metric(
+            "chunk_transcription_seconds",
+            "gauge",
+            "Upload and transcription time per chunk.",
+            [((("chunk", c.path.name),), c.seconds) for c in self.chunks],
+        )
+        metric(
+            "request_seconds",
+            "gauge",
+            "Latency per post-processing request.",
+            [((("task", r.task), ("index", i)), r.seconds) for i, r in enumerate(self.requests)],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path | str, fmt: Optional[str] = None) -> Path:
+        """Write the metrics to ``path`` as ``"json"`` or ``"prometheus"``.
+
+        When ``fmt`` is ``None`` the format is inferred from the suffix:
+        ``.prom`` selects Prometheus text, anything else JSON.
+        """
+        target = Path(path)
+        if fmt is None:
+            fmt = "prometheus" if target.suffix.lower() == ".prom" else "json"
+        if fmt == "json":
+            target.write_text(self.to_json() + "\n", encoding="utf-8")
+        elif fmt == "prometheus":
+            target.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        return target
+
+
+def _escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,288 @@
+"""Dry-run planning: estimate chunks, requests, tokens, time and cost of a run.
+
+Only ``ffprobe`` is executed; no audio is extracted or split and the API is
+never called. The figures use the same segmentation and token batching as a
+real run, applied to an assumed speech rate, so they are estimates.
+
+Prices (USD) can be set with ``VOICEBRIEF_PRICE_TRANSCRIBE_PER_MINUTE``,
+``VOICEBRIEF_PRICE_CHAT_INPUT_PER_MTOK`` and
+``VOICEBRIEF_PRICE_CHAT_OUTPUT_PER_MTOK``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from voicebrief.app import _VIDEO_EXTENSIONS
+from voicebrief.audio import (
+    MAX_CHUNK_SIZE_MB,
+    REENCODE_EXTENSIONS,
+    _calculate_segment_duration_seconds,
+    _estimate_segment_duration_seconds,
+    probe_duration_seconds,
+)
+from voicebrief.gptapi import MAX_BATCH_TOKENS, token_batches
+
+_AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".mp4a", ".aac", ".flac", ".ogg", ".oga", ".opus", ".wma"}
+# Extracted and range-encoded audio is a 128 kbit/s MP3.
+_EXTRACTED_BYTES_PER_SECOND = 128_000 // 8
+
+
+@dataclass(frozen=True)
+class PlanAssumptions:
+    """Rates used to turn audio duration into tokens, time and money."""
+
+    transcript_tokens_per_minute: float = 200.0  # ~150 spoken words per minute
+    prompt_tokens_per_request: int = 150
+    output_ratio: float = 1.0  # optimize/markdown rewrite rather than summarize
+    transcription_realtime_factor: float = 25.0
+    extraction_realtime_factor: float = 50.0
+    output_tokens_per_second: float = 60.0
+    request_overhead_seconds: float = 1.0
+    price_transcribe_per_minute: float = 0.006
+    price_input_per_mtok: float = 2.50
+    price_output_per_mtok: float = 10.00
+
+    @classmethod
+    def from_env(cls) -> "PlanAssumptions":
+        prices: Dict[str, Any] = {}
+        for name, env in (
+            ("price_transcribe_per_minute", "VOICEBRIEF_PRICE_TRANSCRIBE_PER_MINUTE"),
+            ("price_input_per_mtok", "VOICEBRIEF_PRICE_CHAT_INPUT_PER_MTOK"),
+            ("price_output_per_mtok", "VOICEBRIEF_PRICE_CHAT_OUTPUT_PER_MTOK"),
+        ):
+            text = os.environ.get(env, "").strip()
+            if text:
+                try:
+                    prices[name] = float(text)
+                except ValueError:
+                    raise ValueError(f"{env} must be a number, got {text!r}")
+        return cls(**prices)
+
+
+@dataclass
+class FilePlan:
+    """Estimate for one media file."""
+
+    path: Path
+    audio_seconds: float = 0.0
+    video: bool = False
+    audio_bytes: int = 0
+    chunks: int = 0
+    transcription_requests: int = 0
+    chat_requests: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    seconds: float = 0.0
+    cost: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class Plan:
+    """Per-file estimates plus totals for a set of files."""
+
+    files: List[FilePlan] = field(default_factory=list)
+    jobs: int = 1
+
+    @property
+    def planned(self) -> List[FilePlan]:
+        return [f for f in self.files if f.error is None]
+
+    @property
+    def audio_seconds(self) -> float:
+        return sum(f.audio_seconds for f in self.planned)
+
+    @property
+    def chunks(self) -> int:
+        return sum(f.chunks for f in self.planned)
+
+    @property
+    def requests(self) -> int:
+        return sum(f.transcription_requests + f.chat_requests for f in self.planned)
+
+    @property
+    def tokens_in(self) -> int:
+        return sum(f.tokens_in for f in self.planned)
+
+    @property
+    def tokens_out(self) -> int:
+        return sum(f.tokens_out for f in self.planned)
+
+    @property
+    def cost(self) -> float:
+        return sum(f.cost for f in self.planned)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Elapsed time with ``jobs`` files processed concurrently."""
+        durations = [f.seconds for f in self.planned]
+        if not durations:
+            return 0.0
+        return max(sum(durations) / max(1, self.jobs), max(durations))
+
+    def to_dict(self) -> Dict[str, Any]:
+        files = []
+        for f in self.files:
+            entry = {key: getattr(f, key) for key in f.__dataclass_fields__}
+            entry["path"] = str(f.path)
+            files.append(entry)
+        return {
+            "files": files,
+            "total": {
+                "files": len(self.planned),
+                "failed": len(self.files) - len(self.planned),
+                "audio_minutes": round(self.audio_seconds / 60, 2),
+                "chunks": self.chunks,
+                "requests": self.requests,
+                "tokens_in": self.tokens_in,
+                "tokens_out": self.tokens_out,
+                "jobs": self.jobs,
+                "wall_seconds": round(self.wall_seconds, 1),
+                "cost_usd": round(self.cost, 4),
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_table(self) -> str:
+        header = (
+            f"{'file':<40} {'audio min':>9} {'chunks':>6} {'req':>5} {'tok in':>9} {'tok out':>9} "
+            f"{'time':>9} {'cost $':>8}"
+        )
+        lines = [header, "-" * len(header)]
+        for f in self.files:
+            name = f.path.name if len(f.path.name) <= 40 else "..." + f.path.name[-37:]
+            if f.error is not None:
+                lines.append(f"{name:<40} error: {f.error}")
+                continue
+            lines.append(
+                f"{name:<40} {f.audio_seconds / 60:>9.1f} {f.chunks:>6} "
+                f"{f.transcription_requests + f.chat_requests:>5} {f.tokens_in:>9} {f.tokens_out:>9} "
+                f"{_format_hms(f.seconds):>9} {f.cost:>8.2f}"
+            )
+        lines.append("-" * len(header))
+        lines.append(
+            f"{f'TOTAL ({len(self.planned)} files)':<40} {self.audio_seconds / 60:>9.1f} {self.chunks:>6} "
+            f"{self.requests:>5} {self.tokens_in:>9} {self.tokens_out:>9} "
+            f"{_format_hms(self.wall_seconds):>9} {self.cost:>8.2f}"
+        )
+        lines.append(f"Time assumes {self.jobs} concurrent job(s); tokens and cost are estimates.")
+        return "\n".join(lines)
+
+
+def _format_hms(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def discover_media(paths: Iterable[Path | str]) -> List[Path]:
+    """Expand directories (recursively) into the media files they contain."""
+    media_extensions = _AUDIO_EXTENSIONS | _VIDEO_EXTENSIONS
+    found: List[Path] = []
+    for entry in paths:
+        path = Path(entry).expanduser()
+        if path.is_dir():
+            found.extend(
+                sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in media_extensions)
+            )
+        elif path.exists():
+            found.append(path)
+        else:
+            raise FileNotFoundError(f"File {path} does not exist")
+    return found
+
+
+def estimate_post_processing(
+    chunk_tokens: Sequence[int], assumptions: PlanAssumptions
+) -> tuple[int, int, int]:
+    """Requests, input and output tokens of one post-processing task."""
+    batches = token_batches(chunk_tokens, MAX_BATCH_TOKENS)
+    transcript_tokens = sum(chunk_tokens)
+    tokens_in = transcript_tokens + len(batches) * assumptions.prompt_tokens_per_request
+    tokens_out = int(transcript_tokens * assumptions.output_ratio)
+    return len(batches), tokens_in, tokens_out
+
+
+def plan_file(
+    path: Path,
+    assumptions: PlanAssumptions,
+    force_video: bool = False,
+    auto_detect_video: bool = True,
+    post_processing: int = 0,
+) -> FilePlan:
+    """Estimate one file; ``post_processing`` is the number of chat tasks (optimize, markdown)."""
+    plan = FilePlan(path=path)
+    plan.video = force_video or (auto_detect_video and path.suffix.lower() in _VIDEO_EXTENSIONS)
+    try:
+        plan.audio_seconds = probe_duration_seconds(path)
+    except (OSError, RuntimeError, ValueError) as exc:
+        plan.error = str(exc).strip().splitlines()[-1] if str(exc).strip() else type(exc).__name__
+        return plan
+
+    max_bytes = MAX_CHUNK_SIZE_MB * 1024 * 1024
+    reencoded = plan.video or path.suffix.lower() in REENCODE_EXTENSIONS
+    if reencoded:
+        plan.audio_bytes = int(plan.audio_seconds * _EXTRACTED_BYTES_PER_SECOND)
+    else:
+        plan.audio_bytes = path.stat().st_size
+
+    if plan.audio_bytes < max_bytes:
+        chunk_seconds = [plan.audio_seconds]
+    else:
+        if reencoded:
+            segment = _calculate_segment_duration_seconds(plan.audio_bytes, plan.audio_seconds, max_bytes)
+        else:
+            segment = _estimate_segment_duration_seconds(path, max_bytes, plan.audio_seconds)
+        count = math.ceil(plan.audio_seconds / segment)
+        chunk_seconds = [float(segment)] * (count - 1) + [plan.audio_seconds - segment * (count - 1)]
+    plan.chunks = plan.transcription_requests = len(chunk_seconds)
+
+    chunk_tokens = [
+        int(seconds / 60 * assumptions.transcript_tokens_per_minute) for seconds in chunk_seconds
+    ]
+    requests, tokens_in, tokens_out = estimate_post_processing(chunk_tokens, assumptions)
+    plan.chat_requests = requests * post_processing
+    plan.tokens_in = tokens_in * post_processing
+    plan.tokens_out = tokens_out * post_processing
+
+    plan.seconds = plan.audio_seconds / assumptions.transcription_realtime_factor
+    plan.seconds += plan.transcription_requests * assumptions.request_overhead_seconds
+    if plan.video:
+        plan.seconds += plan.audio_seconds / assumptions.extraction_realtime_factor
+    plan.seconds += plan.tokens_out / assumptions.output_tokens_per_second
+    plan.seconds += plan.chat_requests * assumptions.request_overhead_seconds
+
+    plan.cost = plan.audio_seconds / 60 * assumptions.price_transcribe_per_minute
+    plan.cost += plan.tokens_in / 1e6 * assumptions.price_input_per_mtok
+    plan.cost += plan.tokens_out / 1e6 * assumptions.price_output_per_mtok
+    return plan
+
+
+def plan_paths(
+    paths: Iterable[Path | str],
+    force_video: bool = False,
+    auto_detect_video: bool = True,
+    generate_optimized: bool = False,
+    generate_markdown: bool = False,
+    jobs: int = 1,
+    assumptions: Optional[PlanAssumptions] = None,
+) -> Plan:
+    """Estimate every media file in ``paths`` (files or directories)."""
+    log = logging.getLogger("voicebrief.planner")
+    assumptions = assumptions or PlanAssumptions.from_env()
+    post_processing = int(generate_optimized) + int(generate_markdown)
+    plan = Plan(jobs=max(1, jobs))
+    for path in discover_media(paths):
+        file_plan = plan_file(path, assumptions, force_video, auto_detect_video, post_processing)
+        if file_plan.error:
+            log.warning("Could not plan %s: %s", path, file_plan.error)
+        plan.files.append(file_plan)
+    return plan
@@ -0,0 +1,191 @@
+"""Audio preprocessing applied before partitioning.
+
+Each step writes a new file and returns the :class:`~voicebrief.timeline.TimeMap`
+from its output back to its input, so timestamps can be restored later.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from voicebrief.cancel import CancellationToken, ProcessingCancelled
+from voicebrief.process import run_process
+from voicebrief.timeline import TimeMap
+
+# atempo accepts factors in [0.5, 2.0] on every ffmpeg version; larger
+# changes are expressed as a chain of filters.
+_ATEMPO_MIN = 0.5
+_ATEMPO_MAX = 2.0
+DEFAULT_BITRATE = 128_000
+DEFAULT_SILENCE_THRESHOLD_DB = -35.0
+# Silence kept on each side of a cut so word onsets and endings survive.
+SILENCE_PADDING_SECONDS = 0.3
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def atempo_filter(speed: float) -> str:
+    """Return an ffmpeg audio filter changing the tempo by ``speed``."""
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    factors: List[float] = []
+    remaining = speed
+    while remaining > _ATEMPO_MAX:
+        factors.append(_ATEMPO_MAX)
+        remaining /= _ATEMPO_MAX
+    while remaining < _ATEMPO_MIN:
+        factors.append(_ATEMPO_MIN)
+        remaining /= _ATEMPO_MIN
+    factors.append(remaining)
+    return ",".join(f"atempo={factor:.6g}" for factor in factors)
+
+
+def encoder_bitrate(size_bytes: int, duration_seconds: Optional[float]) -> int:
+    """Bitrate for re-encoded audio: the source's average, capped at 128 kbit/s.
+
+    Re-encoding a low-bitrate recording at a higher rate would only add
+    upload bytes.
+    """
+    if not duration_seconds or duration_seconds <= 0:
+        return DEFAULT_BITRATE
+    average = int(size_bytes * 8 / duration_seconds)
+    return max(32_000, min(DEFAULT_BITRATE, average))
+
+
+def detect_silences(
+    audio_path: Path,
+    min_silence_seconds: float,
+    threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB,
+    duration_seconds: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> List[Tuple[float, float]]:
+    """Return ``(start, end)`` of silences of at least ``min_silence_seconds``.
+
+    Uses ffmpeg's ``silencedetect`` filter; nothing is written. A silence
+    running to the end of the file ends at ``duration_seconds`` (or is
+    dropped when the duration is unknown).
+    """
+    if min_silence_seconds <= 0:
+        raise ValueError("min_silence_seconds must be positive")
+    command = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(audio_path),
+        "-vn",
+        "-af",
+        f"silencedetect=noise={threshold_db:g}dB:duration={min_silence_seconds:g}",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = run_process(command, text=True, cancel_token=cancel_token)
+    if result.returncode != 0:
+        raise RuntimeError(f"Silence detection failed for {audio_path}: {result.stderr.strip()}")
+    return parse_silences(result.stderr, duration_seconds)
+
+
+def parse_silences(output: str, duration_seconds: Optional[float] = None) -> List[Tuple[float, float]]:
+    """Parse ``silencedetect`` log output into ``(start, end)`` pairs."""
+    silences: List[Tuple[float, float]] = []
+    start: Optional[float] = None
+    for line in output.splitlines():
+        started = _SILENCE_START.search(line)
+        if started:
+            start = max(0.0, float(started.group(1)))
+            continue
+        ended = _SILENCE_END.search(line)
+        if ended and start is not None:
+            silences.append((start, float(ended.group(1))))
+            start = None
+    if start is not None and duration_seconds is not None and duration_seconds > start:
+        silences.append((start, duration_seconds))
+    return silences
+
+
+def kept_ranges(
+    silences: Sequence[Tuple[float, float]],
+    duration_seconds: float,
+    padding: float = SILENCE_PADDING_SECONDS,
+) -> List[Tuple[float, float]]:
+    """Ranges of the original audio left after cutting ``silences``.
+
+    ``padding`` seconds of each silence are kept next to the speech around
+    it, so only ``end - start - 2 * padding`` is removed per silence.
+    """
+    ranges: List[Tuple[float, float]] = []
+    position = 0.0
+    for start, end in sorted(silences):
+        cut_start = start + padding if start > 0 else 0.0
+        cut_end = end - padding if end < duration_seconds else duration_seconds
+        if cut_end <= cut_start or cut_start < position:
+            continue
+        if cut_start > position:
+            ranges.append((position, cut_start))
+        position = cut_end
+    if position < duration_seconds:
+        ranges.append((position, duration_seconds))
+    return ranges
+
+
+def _select_filter(ranges: Sequence[Tuple[float, float]]) -> str:
+    terms = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in ranges)
+    return f"aselect='{terms}',asetpts=N/SR/TB"
+
+
+def render(
+    audio_path: Path,
+    output_path: Path,
+    keep: Optional[Sequence[Tuple[float, float]]] = None,
+    speed: float = 1.0,
+    bitrate: int = DEFAULT_BITRATE,
+    cancel_token: Optional[CancellationToken] = None,
+) -> Tuple[Path, TimeMap]:
+    """Encode ``audio_path`` as MP3, keeping only ``keep`` ranges and changing the tempo.
+
+    Both edits run in a single ffmpeg pass. Returns the output path and the
+    map from the output timeline back to ``audio_path``.
+    """
+    filters: List[str] = []
+    time_map = TimeMap.identity()
+    if keep is not None:
+        if not keep:
+            raise ValueError(f"Nothing left to transcribe in {audio_path} after removing silence")
+        filters.append(_select_filter(keep))
+        time_map = time_map.then(TimeMap.from_kept_ranges(keep))
+    if speed != 1.0:
+        filters.append(atempo_filter(speed))
+        time_map = time_map.then(TimeMap.tempo(speed))
+
+    log = logging.getLogger("voicebrief.preprocess")
+    command = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        str(audio_path),
+        "-vn",
+    ]
+    if filters:
+        command += ["-filter:a", ",".join(filters)]
+    command += [
+        "-c:a",
+        "libmp3lame",
+        "-b:a",
+        str(bitrate),
+        str(output_path),
+    ]
+    log.debug("Running ffmpeg: %s", " ".join(command))
+    try:
+        result = run_process(command, cancel_token=cancel_token)
+    except ProcessingCancelled:
+        output_path.unlink(missing_ok=True)
+        raise
+    if result.returncode != 0:
+        err = result.stderr.decode("utf-8", errors="replace")
+        log.error("ffmpeg failed (code %s): %s", result.returncode, err)
+        raise RuntimeError(f"Error preprocessing {audio_path}: {err}")
+    return output_path, time_map
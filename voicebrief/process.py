@@ -0,0 +1,39 @@
+"""Helpers for running external tools such as ffmpeg and ffprobe."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Optional, Sequence
+
+from voicebrief.cancel import CancellationToken, ProcessingCancelled
+from voicebrief.profiling import span
+
+
+def run_process(
+    command: Sequence[str],
+    text: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+) -> subprocess.CompletedProcess:
+    """Run ``command`` capturing stdout and stderr.
+
+    The call is recorded as a ``subprocess`` span on the profiling timeline.
+    When ``cancel_token`` is cancelled the child process is killed and
+    :class:`ProcessingCancelled` is raised.
+    """
+    argv = [str(part) for part in command]
+    with span(Path(argv[0]).name, "subprocess", command=" ".join(argv)):
+        if cancel_token is None:
+            return subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+
+        cancel_token.raise_if_cancelled()
+        with subprocess.Popen(
+            argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text
+        ) as process:
+            unregister = cancel_token.register(process.kill)
+            try:
+                stdout, stderr = process.communicate()
+            finally:
+                unregister()
+        if cancel_token.cancelled:
+            raise ProcessingCancelled(f"Cancelled while running {Path(argv[0]).name}")
+        return subprocess.CompletedProcess(argv, process.returncode, stdout, stderr)
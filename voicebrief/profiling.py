@@ -0,0 +1,165 @@
+"""Profiling support: cProfile statistics plus a Chrome trace-event timeline.
+
+Spans are recorded through :func:`span`, which is a no-op unless a
+:class:`ProfileSession` is active in the current context; threads that run
+in a copy of the run's context (as voicebrief's worker threads do) record
+on the same timeline, concurrent runs without profiling record nothing.
+Only one session can run per process. The timeline is written in the Chrome
+trace-event JSON format and can be opened directly in Perfetto
+(https://ui.perfetto.dev) or ``chrome://tracing``.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_ACTIVE_RECORDER: ContextVar[Optional["TraceRecorder"]] = ContextVar("voicebrief_trace_recorder", default=None)
+# cProfile cannot run two profilers at once (Python 3.12+ refuses the second).
+_SESSION_LOCK = threading.Lock()
+
+
+class TraceRecorder:
+    """Collect complete ("X") trace events from any thread."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a span given ``time.perf_counter`` start and end values."""
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event: Dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1_000_000,
+            "dur": (end - start) * 1_000_000,
+            "pid": self._pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = {key: _jsonable(value) for key, value in args.items()}
+        with self._lock:
+            self._events.append(event)
+            self._thread_names.setdefault(tid, thread.name)
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._thread_names.items()
+            ]
+            events = list(self._events)
+        metadata.append(
+            {"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "voicebrief"}}
+        )
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> Path:
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
+
+
+@contextmanager
+def span(name: str, category: str = "app", **args: Any) -> Iterator[None]:
+    """Record the enclosed block on the active timeline, if any."""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_span(name, category, start, time.perf_counter(), args)
+
+
+class ProfileSession:
+    """Run cProfile and a trace timeline between :meth:`start` and :meth:`stop`.
+
+    cProfile only observes the thread that started the session; work done on
+    other threads shows up on the trace timeline instead. Starting a second
+    session while one is running raises :class:`RuntimeError`.
+    """
+
+    def __init__(self, output_dir: Path, stem: str):
+        self.stats_path = Path(output_dir) / f"profile_{stem}.pstats"
+        self.trace_path = Path(output_dir) / f"profile_{stem}.trace.json"
+        self.recorder = TraceRecorder()
+        self._profiler = cProfile.Profile()
+        self._token: Optional[Token[Optional[TraceRecorder]]] = None
+
+    @property
+    def outputs(self) -> List[Path]:
+        return [self.stats_path, self.trace_path]
+
+    def start(self) -> None:
+        if not _SESSION_LOCK.acquire(blocking=False):
+            raise RuntimeError("Another run is already being profiled in this process; profile one run at a time")
+        try:
+            self._profiler.enable()
+        except BaseException:
+            # e.g. another profiler (a debugger, a test runner plugin) is active.
+            _SESSION_LOCK.release()
+            raise
+        self._token = _ACTIVE_RECORDER.set(self.recorder)
+
+    def stop(self) -> None:
+        self._profiler.disable()
+        if self._token is not None:
+            _ACTIVE_RECORDER.reset(self._token)
+            self._token = None
+        _SESSION_LOCK.release()
+        self._profiler.dump_stats(str(self.stats_path))
+        self.recorder.write(self.trace_path)
+
+    def __enter__(self) -> "ProfileSession":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def summary(self, limit: int = 20) -> str:
+        """Return the top ``limit`` functions by cumulative time."""
+        stream = io.StringIO()
+        stats = pstats.Stats(str(self.stats_path), stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
@@ -0,0 +1,132 @@
+"""Typed progress events emitted by ``run_voicebrief``.
+
+Callers pass ``progress=callback`` to :func:`voicebrief.app.run_voicebrief`
+or consume :func:`voicebrief.app.iter_progress` to render progress,
+throughput and ETA without parsing log output.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+@dataclass(frozen=True)
+class StageStarted:
+    stage: str
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class StageFinished:
+    stage: str
+    seconds: float
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class ChunkStarted:
+    """A chunk is about to be uploaded for transcription (``index`` is 1-based)."""
+
+    index: int
+    total: int
+    path: Path
+    size_bytes: int
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class ChunkTranscribed:
+    """A chunk finished transcribing; ``eta_seconds`` covers the remaining chunks."""
+
+    index: int
+    total: int
+    path: Path
+    bytes_uploaded: int
+    total_bytes_uploaded: int
+    completed: int
+    eta_seconds: Optional[float]
+    elapsed_seconds: float
+
+
+@dataclass(frozen=True)
+class RunFinished:
+    elapsed_seconds: float
+    result: Any = None
+
+
+ProgressEvent = Union[StageStarted, StageFinished, ChunkStarted, ChunkTranscribed, RunFinished]
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+class ProgressReporter:
+    """Build progress events with timing and ETA, and deliver them to a callback.
+
+    Safe to use from several threads. Exceptions raised by the callback are
+    logged and never interrupt the run.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self._callback = callback
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._chunk_total = 0
+        self._bytes_total = 0
+        self._bytes_done = 0
+        self._chunks_done = 0
+        self._transcription_start: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def emit(self, event: ProgressEvent) -> None:
+        if self._callback is None:
+            return
+        try:
+            self._callback(event)
+        except Exception:
+            logging.getLogger("voicebrief.progress").exception("Progress callback failed")
+
+    def stage_started(self, stage: str) -> None:
+        self.emit(StageStarted(stage, self.elapsed))
+
+    def stage_finished(self, stage: str, seconds: float) -> None:
+        self.emit(StageFinished(stage, seconds, self.elapsed))
+
+    def chunks_planned(self, sizes: list[int]) -> None:
+        with self._lock:
+            self._chunk_total = len(sizes)
+            self._bytes_total = sum(sizes)
+            self._bytes_done = 0
+            self._chunks_done = 0
+            self._transcription_start = time.perf_counter()
+
+    def chunk_started(self, index: int, path: Path, size_bytes: int) -> None:
+        self.emit(ChunkStarted(index, self._chunk_total, path, size_bytes, self.elapsed))
+
+    def chunk_transcribed(self, index: int, path: Path, size_bytes: int) -> None:
+        with self._lock:
+            self._bytes_done += size_bytes
+            self._chunks_done += 1
+            done, completed = self._bytes_done, self._chunks_done
+            eta = self._eta_locked()
+        self.emit(
+            ChunkTranscribed(
+                index, self._chunk_total, path, size_bytes, done, completed, eta, self.elapsed
+            )
+        )
+
+    def run_finished(self, result: Any) -> None:
+        self.emit(RunFinished(self.elapsed, result))
+
+    def _eta_locked(self) -> Optional[float]:
+        """Estimate remaining transcription time from the observed byte rate."""
+        if self._transcription_start is None or self._bytes_done <= 0:
+            return None
+        spent = time.perf_counter() - self._transcription_start
+        remaining = max(0, self._bytes_total - self._bytes_done)
+        return remaining * spent / self._bytes_done
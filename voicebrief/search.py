@@ -0,0 +1,235 @@
+"""Full-text search over produced transcripts in a SQLite FTS5 index.
+
+A run given an index (``search_index`` or ``VOICEBRIEF_SEARCH_INDEX``)
+adds every transcript as it is written: chunk transcripts with the offset
+of the chunk in the source recording, and the stitched, optimized and
+markdown outputs of the whole recording. Outputs produced without an index
+can be added later with :meth:`SearchIndex.index_directory`. Rewriting a
+file replaces its entry, so the index never holds stale copies.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from voicebrief.data import AnyTranscript, on_transcript_written
+
+SEARCH_INDEX_ENV = "VOICEBRIEF_SEARCH_INDEX"
+KINDS = ("transcript", "optimized", "markdown")
+# Output names produced by gptapi, by kind.
+_PATTERNS = {"transcript": "transcription_*.txt", "optimized": "optimized_*", "markdown": "full_md_*.md"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    source TEXT,
+    kind TEXT NOT NULL,
+    chunk_offset REAL,
+    mtime REAL NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Start of the chunk being transcribed, in seconds of the source recording.
+_CHUNK_OFFSET: ContextVar[Optional[float]] = ContextVar("voicebrief_chunk_offset", default=None)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    path: Path
+    source: Optional[str]
+    kind: str
+    chunk_offset: Optional[float]
+    snippet: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["path"] = str(self.path)
+        return data
+
+
+def search_index_path(explicit: Path | str | None = None) -> Optional[Path]:
+    """``explicit``, else ``VOICEBRIEF_SEARCH_INDEX``, else ``None`` (no index)."""
+    value = explicit or os.environ.get(SEARCH_INDEX_ENV)
+    return Path(value).expanduser() if value else None
+
+
+def transcript_kind(path: Path) -> str:
+    """Kind of output from its file name; anything unrecognised is a transcript."""
+    if path.name.startswith("optimized_"):
+        return "optimized"
+    if path.name.startswith("full_md_"):
+        return "markdown"
+    return "transcript"
+
+
+def match_expression(query: str) -> str:
+    """FTS5 expression matching every word of ``query``; ``word*`` matches a prefix."""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query is empty")
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Index of transcript files, safe to share between threads and processes.
+
+    Uses WAL journaling like :class:`voicebrief.jobqueue.JobQueue`, so
+    searches run while a run is adding its outputs.
+    """
+
+    def __init__(self, path: Path | str, busy_timeout_seconds: float = 30.0):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path), timeout=busy_timeout_seconds, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=wal")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add(
+        self,
+        path: Path,
+        text: str,
+        source: Optional[str] = None,
+        chunk_offset: Optional[float] = None,
+        kind: Optional[str] = None,
+    ) -> None:
+        """Index ``text`` as the contents of ``path``, replacing an earlier entry."""
+        path = Path(path).resolve()
+        mtime = path.stat().st_mtime if path.exists() else time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete(str(path))
+                cursor = self._db.execute(
+                    "INSERT INTO documents (path, source, kind, chunk_offset, mtime, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (str(path), source, kind or transcript_kind(path), chunk_offset, mtime, time.time()),
+                )
+                self._db.execute("INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text))
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def remove(self, path: Path) -> bool:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            removed = self._delete(str(Path(path).resolve()))
+            self._db.execute("COMMIT")
+        return removed
+
+    def _delete(self, path: str) -> bool:
+        row = self._db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return False
+        self._db.execute("DELETE FROM documents_fts WHERE rowid = ?", (row["id"],))
+        self._db.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+        return True
+
+    def index_directory(self, root: Path) -> int:
+        """Add the outputs under ``root`` that are new or changed; return how many were added.
+
+        Entries whose files no longer exist are removed.
+        """
+        with self._lock:
+            known = {row["path"]: row["mtime"] for row in self._db.execute("SELECT path, mtime FROM documents")}
+        added = 0
+        for kind, pattern in _PATTERNS.items():
+            for path in sorted(Path(root).expanduser().rglob(pattern)):
+                path = path.resolve()
+                if not path.is_file() or known.get(str(path)) == path.stat().st_mtime:
+                    continue
+                self.add(path, path.read_text(encoding="utf-8", errors="replace"), kind=kind)
+                added += 1
+        for stale in known:
+            if not Path(stale).exists():
+                self.remove(Path(stale))
+        return added
+
+    def search(
+        self, query: str, limit: int = 20, kind: Optional[str] = None, raw: bool = False
+    ) -> List[SearchHit]:
+        """Best matches first (BM25). ``raw`` passes ``query`` to FTS5 unchanged."""
+        sql = (
+            "SELECT d.path, d.source, d.kind, d.chunk_offset,"
+            " snippet(documents_fts, 0, '[', ']', '…', 12) AS snippet, bm25(documents_fts) AS score"
+            " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+            " WHERE documents_fts MATCH ?"
+        )
+        params: List[Any] = [query if raw else match_expression(query)]
+        if kind is not None:
+            sql += " AND d.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            SearchHit(Path(r["path"]), r["source"], r["kind"], r["chunk_offset"], r["snippet"], -r["score"])
+            for r in rows
+        ]
+
+
+@contextmanager
+def chunk_offset(seconds: Optional[float]) -> Iterator[None]:
+    """Record transcripts written in the block as starting ``seconds`` into the source."""
+    token = _CHUNK_OFFSET.set(seconds)
+    try:
+        yield
+    finally:
+        _CHUNK_OFFSET.reset(token)
+
+
+@contextmanager
+def index_transcripts(index: SearchIndex, source: Path) -> Iterator[None]:
+    """Add every transcript written in the block to ``index`` under ``source``.
+
+    Indexing errors are logged and do not fail the run.
+    """
+    log = logging.getLogger("voicebrief.search")
+
+    def hook(transcript: AnyTranscript) -> None:
+        try:
+            index.add(transcript.text_path, transcript.text, source=str(source), chunk_offset=_CHUNK_OFFSET.get())
+        except (OSError, sqlite3.Error) as exc:
+            log.warning("Could not index %s: %s", transcript.text_path, exc)
+
+    with on_transcript_written(hook):
+        yield
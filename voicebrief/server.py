@@ -0,0 +1,308 @@
+"""Local HTTP service running ``run_voicebrief`` jobs on a warm worker pool.
+
+Start it with ``voicebrief serve``. Imports, ``.env`` loading, the tokenizer
+and the API clients are set up once, so submitted jobs start without the
+cost of a CLI invocation. All bodies are JSON.
+
+=========================  ==================================================
+Endpoint                   Meaning
+=========================  ==================================================
+``POST /jobs``             Submit ``{"path": ..., "options": {...}}``; options
+                           are ``run_voicebrief`` keyword arguments
+``GET /jobs``              All known jobs with their status
+``GET /jobs/<id>``         State, stage, progress fraction and ETA
+``GET /jobs/<id>/result``  Output paths of a finished job
+``GET /jobs/<id>/metrics`` Run metrics (``?format=prometheus`` for text)
+``DELETE /jobs/<id>``      Cancel a job
+``GET /metrics``           Service metrics in the Prometheus text format
+``GET /health``            Liveness check
+=========================  ==================================================
+
+When a token is configured, requests must send ``Authorization: Bearer <token>``.
+"""
+from __future__ import annotations
+
+import hmac
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from voicebrief.app import run_voicebrief
+from voicebrief.hedging import HedgePolicy
+from voicebrief.jobqueue import result_summary
+from voicebrief.jobs import Job, JobRunner, JobState
+
+DEFAULT_PORT = 8765
+# run_voicebrief arguments that the service supplies itself or that are not JSON;
+# profiling is per process, so concurrent jobs cannot each profile.
+_RESERVED_OPTIONS = {"source_path", "logger", "cancel_token", "progress", "workspace", "profile"}
+_JOB_OPTIONS = set(inspect.signature(run_voicebrief).parameters) - _RESERVED_OPTIONS
+
+
+class VoicebriefService:
+    """Job submission, status and metrics on top of a :class:`JobRunner`.
+
+    Only the most recent ``max_finished_jobs`` finished jobs are kept, so a
+    service running for weeks does not accumulate results.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = 1000):
+        self.runner = JobRunner(max_workers=max_workers, on_update=self._on_update)
+        self.max_finished_jobs = max_finished_jobs
+        self.started = time.time()
+        self._finished: Deque[int] = deque()
+        self._finished_ids: Set[int] = set()
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {
+            "audio_seconds": 0.0,
+            "wall_seconds": 0.0,
+            "bytes_uploaded": 0,
+            "tokens_in": 0,
+            "tokens_out": 0,
+        }
+        self._completed: Dict[str, int] = {state.value: 0 for state in JobState if state.finished}
+        self._log = logging.getLogger("voicebrief.server")
+
+    def warm(self) -> None:
+        """Load configuration, the tokenizer and the API clients before the first job."""
+        from voicebrief.endpoints import chat_endpoint, load_env, transcription_endpoint
+        from voicebrief.gptapi import _get_client, warmup
+
+        load_env()
+        try:
+            warmup()
+        except Exception as exc:  # the first job retries and reports it
+            self._log.warning("Tokenizer warm-up failed: %s", exc)
+        for endpoint in (transcription_endpoint(), chat_endpoint()):
+            try:
+                _get_client(endpoint)
+            except RuntimeError as exc:
+                self._log.warning("Could not create API client: %s", exc)
+
+    def submit(self, payload: Dict[str, Any]) -> Job:
+        """Validate a ``POST /jobs`` body and queue the job; raises ``ValueError``."""
+        path = payload.get("path")
+        if not isinstance(path, str) or not path:
+            raise ValueError('"path" must be a file path')
+        options = payload.get("options", {})
+        if not isinstance(options, dict):
+            raise ValueError('"options" must be an object')
+        unknown = set(options) - _JOB_OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+        source = Path(path).expanduser()
+        if not source.is_file():
+            raise ValueError(f"File {source} does not exist")
+        options = dict(options)
+        if isinstance(options.get("hedging"), dict):
+            options["hedging"] = HedgePolicy(**options["hedging"])
+        # A long-running process keeps transcripts on disk rather than in memory.
+        options.setdefault("lazy_transcripts", True)
+        return self.runner.submit(source, **options)
+
+    def _on_update(self, job: Job) -> None:
+        if not job.state.finished:
+            return
+        with self._lock:
+            # A job that finishes quickly is reported again by ``submit``.
+            if job.id in self._finished_ids:
+                return
+            self._finished_ids.add(job.id)
+            self._completed[job.state.value] += 1
+            if job.state is JobState.DONE and job.result is not None:
+                metrics = job.result.metrics
+                self._totals["audio_seconds"] += metrics.audio_seconds or 0.0
+                self._totals["wall_seconds"] += metrics.wall_seconds
+                self._totals["bytes_uploaded"] += metrics.bytes_uploaded
+                self._totals["tokens_in"] += metrics.tokens_in
+                self._totals["tokens_out"] += metrics.tokens_out
+            self._finished.append(job.id)
+            expired = []
+            while len(self._finished) > self.max_finished_jobs:
+                expired.append(self._finished.popleft())
+                self._finished_ids.discard(expired[-1])
+        for job_id in expired:
+            self.runner.discard(job_id)
+
+    @staticmethod
+    def status(job: Job) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "path": str(job.source),
+            "state": job.state.value,
+            "stage": job.stage,
+            "fraction": job.fraction,
+            "eta_seconds": job.eta_seconds,
+            "error": job.error,
+        }
+
+    def prometheus(self, prefix: str = "voicebrief_service") -> str:
+        jobs = self.runner.jobs
+        with self._lock:
+            totals = dict(self._totals)
+            completed = dict(self._completed)
+        lines = [
+            f"# HELP {prefix}_uptime_seconds Seconds since the service started.",
+            f"# TYPE {prefix}_uptime_seconds gauge",
+            f"{prefix}_uptime_seconds {time.time() - self.started}",
+            f"# HELP {prefix}_jobs Jobs currently queued or running.",
+            f"# TYPE {prefix}_jobs gauge",
+        ]
+        for state in (JobState.QUEUED, JobState.RUNNING):
+            lines.append(f'{prefix}_jobs{{state="{state.value}"}} {sum(job.state is state for job in jobs)}')
+        lines += [
+            f"# HELP {prefix}_jobs_finished_total Jobs finished since the service started.",
+            f"# TYPE {prefix}_jobs_finished_total counter",
+        ]
+        lines += [f'{prefix}_jobs_finished_total{{state="{state}"}} {count}' for state, count in completed.items()]
+        for name, help_text in (
+            ("audio_seconds", "Seconds of audio in completed jobs."),
+            ("wall_seconds", "Wall time of completed jobs."),
+            ("bytes_uploaded", "Audio bytes uploaded by completed jobs."),
+            ("tokens_in", "Post-processing input tokens of completed jobs."),
+            ("tokens_out", "Post-processing output tokens of completed jobs."),
+        ):
+            lines += [
+                f"# HELP {prefix}_{name}_total {help_text}",
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {totals[name]}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def shutdown(self) -> None:
+        self.runner.shutdown(cancel=True, wait=True)
+
+
+class VoicebriefHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: VoicebriefService, token: Optional[str] = None):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.token = token
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: VoicebriefHTTPServer
+    server_version = "voicebrief"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.getLogger("voicebrief.server").debug("%s - " + format, self.address_string(), *args)
+
+    def _send(self, status: HTTPStatus, body: Any, content_type: str = "application/json") -> None:
+        data = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, {"error": message})
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        supplied = self.headers.get("Authorization", "")
+        if hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+            return True
+        self._error(HTTPStatus.UNAUTHORIZED, "Missing or invalid bearer token")
+        return False
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.server.service.runner.get(int(job_id)) if job_id.isdigit() else None
+        if job is None:
+            self._error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+        return job
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        service = self.server.service
+        if parts == ["health"]:
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        elif parts == ["metrics"]:
+            self._send(HTTPStatus.OK, service.prometheus(), "text/plain; version=0.0.4")
+        elif parts == ["jobs"]:
+            self._send(HTTPStatus.OK, [service.status(job) for job in service.runner.jobs])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job(parts[1])
+            if job is not None:
+                self._send(HTTPStatus.OK, service.status(job))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] in ("result", "metrics"):
+            job = self._job(parts[1])
+            if job is None:
+                return
+            if job.state is not JobState.DONE or job.result is None:
+                self._send(HTTPStatus.CONFLICT, {**service.status(job), "error": job.error or "Job is not done"})
+            elif parts[2] == "result":
+                self._send(HTTPStatus.OK, result_summary(job.result))
+            elif parse_qs(url.query).get("format") == ["prometheus"]:
+                self._send(HTTPStatus.OK, job.result.metrics.to_prometheus(), "text/plain; version=0.0.4")
+            else:
+                self._send(HTTPStatus.OK, job.result.metrics.to_dict())
+        else:
+            self._error(HTTPStatus.NOT_FOUND, f"No such endpoint: {url.path}")
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._error(HTTPStatus.NOT_FOUND, f"No such endpoint: {self.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Body must be a JSON object")
+            job = self.server.service.submit(payload)
+        except (ValueError, TypeError) as exc:
+            self._error(HTTPStatus.BAD_REQUEST, str(exc))
+            return
+        self._send(HTTPStatus.ACCEPTED, {**self.server.service.status(job), "url": f"/jobs/{job.id}"})
+
+    def do_DELETE(self) -> None:
+        if not self._authorized():
+            return
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._error(HTTPStatus.NOT_FOUND, f"No such endpoint: {self.path}")
+            return
+        job = self._job(parts[1])
+        if job is not None:
+            cancelled = self.server.service.runner.cancel(job.id)
+            self._send(HTTPStatus.ACCEPTED if cancelled else HTTPStatus.CONFLICT, self.server.service.status(job))
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    workers: int = 2,
+    token: Optional[str] = None,
+    warm: bool = True,
+) -> None:
+    """Run the service until interrupted; running jobs are cancelled on exit."""
+    log = logging.getLogger("voicebrief.server")
+    service = VoicebriefService(max_workers=workers)
+    if warm:
+        service.warm()
+    httpd = VoicebriefHTTPServer((host, port), service, token)
+    log.info("Serving on http://%s:%d with %d worker(s)", host, httpd.server_address[1], workers)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Shutting down")
+    finally:
+        httpd.server_close()
+        service.shutdown()
@@ -0,0 +1,126 @@
+"""Merge transcripts of overlapping audio chunks without duplicated words.
+
+Neighbouring chunks share a few seconds of audio, so the end of one
+transcript and the start of the next contain the same words. The words
+near a cut are often garbled, because the cut can fall mid-word. The
+stitcher aligns the tail of each transcript with the head of the next
+(on normalised words), keeps the text up to the end of the matched run
+from the first transcript, and continues the next transcript after it.
+
+Only words that can lie in the shared audio are compared: the window is
+derived from the overlap duration (:func:`seam_window`), which keeps a
+phrase repeated elsewhere in the speech out of the search. Inside it the
+longest matching run wins, and of equally long runs the one nearest to
+the cut. Runs shorter than three words are too likely to be a common
+phrase ("over the") to be trusted; without a seam the transcripts are
+joined whole, which repeats a few words rather than losing any.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# Upper bound on speech rate; conversational speech is ~2.5-3 words per second.
+MAX_WORDS_PER_SECOND = 4.0
+# Words cut in half at either end of the overlap.
+CUT_WORDS = 2
+# Words inspected on each side of a seam when the overlap is not known:
+# seam_window(2.0), a typical overlap.
+DEFAULT_WINDOW_WORDS = 10
+# Shortest run of matching words accepted as the overlap.
+DEFAULT_MIN_MATCH_WORDS = 3
+
+_WORD = re.compile(r"\S+")
+_STRIP = re.compile(r"[^\w']+")
+
+
+def _normalise(word: str) -> str:
+    return _STRIP.sub("", word.lower())
+
+
+def _words(text: str) -> List[Tuple[str, int, int]]:
+    """``(normalised word, start, end)`` for every whitespace-separated token."""
+    return [(_normalise(m.group()), m.start(), m.end()) for m in _WORD.finditer(text)]
+
+
+def seam_window(overlap_seconds: float) -> int:
+    """Most words ``overlap_seconds`` of shared audio can hold on one side of a seam."""
+    return math.ceil(overlap_seconds * MAX_WORDS_PER_SECOND) + CUT_WORDS
+
+
+def find_seam(
+    left: str,
+    right: str,
+    window_words: int = DEFAULT_WINDOW_WORDS,
+    min_match_words: int = DEFAULT_MIN_MATCH_WORDS,
+) -> Optional[Tuple[int, int]]:
+    """Locate the duplicated words between ``left`` and ``right``.
+
+    Returns ``(left_end, right_start)`` character offsets: ``left[:left_end]``
+    followed by ``right[right_start:]`` contains the overlap once. Returns
+    ``None`` when no run of at least ``min_match_words`` words is shared.
+
+    The run must end within the last ``window_words`` words of ``left`` and
+    start within the first ``window_words`` of ``right``. Of several such
+    runs the longest is taken; ties go to the one with the fewest words
+    between it and the cut.
+    """
+    left_words = _words(left)[-window_words:] if window_words > 0 else []
+    all_right_words = _words(right)
+    right_words = all_right_words[:window_words] if window_words > 0 else []
+    a = [w for w, _, _ in left_words]
+    b = [w for w, _, _ in right_words]
+    best: Optional[Tuple[int, int, int, int]] = None  # (-size, distance, a start, b start)
+    for i in range(len(a)):
+        for j in range(len(b)):
+            if a[i] != b[j] or (i > 0 and j > 0 and a[i - 1] == b[j - 1]):
+                continue  # no match, or not the start of a maximal run
+            size = 1
+            while i + size < len(a) and j + size < len(b) and a[i + size] == b[j + size]:
+                size += 1
+            if size < min_match_words or not any(a[i:i + size]):
+                continue
+            candidate = (-size, (len(a) - i - size) + j, i, j)
+            if best is None or candidate < best:
+                best = candidate
+    if best is None:
+        return None
+    negative_size, _, i, j = best
+    left_end = left_words[i - negative_size - 1][2]
+    right_next = j - negative_size
+    # The text after the run may lie beyond the window.
+    right_start = all_right_words[right_next][1] if right_next < len(all_right_words) else len(right)
+    return left_end, right_start
+
+
+def stitch_pieces(
+    texts: Sequence[str],
+    window_words: int = DEFAULT_WINDOW_WORDS,
+    min_match_words: int = DEFAULT_MIN_MATCH_WORDS,
+) -> List[str]:
+    """Trim each transcript so that joining the pieces with a space reads once.
+
+    Piece ``i`` is ``texts[i]`` without the words it shares with
+    ``texts[i - 1]`` and without its own garbled tail past the seam with
+    ``texts[i + 1]``. Transcripts without a detectable overlap are kept whole.
+    """
+    starts = [0] * len(texts)
+    ends = [len(text) for text in texts]
+    for index in range(len(texts) - 1):
+        seam = find_seam(texts[index], texts[index + 1], window_words, min_match_words)
+        if seam is None:
+            continue
+        left_end, right_start = seam
+        ends[index] = max(starts[index], left_end)
+        starts[index + 1] = right_start
+    return [text[start:end].strip() for text, start, end in zip(texts, starts, ends)]
+
+
+def stitch(
+    texts: Sequence[str],
+    window_words: int = DEFAULT_WINDOW_WORDS,
+    min_match_words: int = DEFAULT_MIN_MATCH_WORDS,
+) -> str:
+    """Join transcripts of overlapping chunks, keeping each shared passage once."""
+    return " ".join(piece for piece in stitch_pieces(texts, window_words, min_match_words) if piece)
@@ -0,0 +1,143 @@
+"""Map timestamps on preprocessed audio back to the original recording.
+
+Preprocessing stages that change the timeline (tempo changes, cut
+silences) each produce a :class:`TimeMap`. Maps are chained with
+:meth:`TimeMap.then`, so timestamps reported for the audio that was
+actually transcribed can be converted to positions in the source file.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class TimeSegment:
+    """Linear piece of a map: processed ``[start, end)`` -> original.
+
+    ``original = original_start + (t - start) * rate``, where ``rate`` is
+    original seconds per processed second (the speed factor for tempo
+    changes, 1.0 for plain cuts).
+    """
+
+    start: float
+    end: float
+    original_start: float
+    rate: float = 1.0
+
+    @property
+    def original_end(self) -> float:
+        if math.isinf(self.end):
+            return math.inf
+        return self.original_start + (self.end - self.start) * self.rate
+
+    def to_original(self, t: float) -> float:
+        return self.original_start + (t - self.start) * self.rate
+
+
+class TimeMap:
+    """Piecewise-linear map from processed time to original time (seconds)."""
+
+    __slots__ = ("segments", "_starts")
+
+    def __init__(self, segments: Optional[Sequence[TimeSegment]] = None):
+        segments = list(segments) if segments else [TimeSegment(0.0, math.inf, 0.0)]
+        for previous, current in zip(segments, segments[1:]):
+            if current.start != previous.end:
+                raise ValueError("TimeMap segments must be contiguous and sorted")
+        self.segments: Tuple[TimeSegment, ...] = tuple(segments)
+        self._starts = [segment.start for segment in self.segments]
+
+    @classmethod
+    def identity(cls) -> "TimeMap":
+        return cls()
+
+    @classmethod
+    def tempo(cls, speed: float) -> "TimeMap":
+        """Map for audio played ``speed`` times faster than the original."""
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        return cls([TimeSegment(0.0, math.inf, 0.0, speed)])
+
+    @classmethod
+    def from_kept_ranges(cls, ranges: Iterable[Tuple[float, float]]) -> "TimeMap":
+        """Map for audio made by concatenating the original ``(start, end)`` ranges."""
+        segments: List[TimeSegment] = []
+        position = 0.0
+        for original_start, original_end in ranges:
+            length = original_end - original_start
+            if length <= 0:
+                continue
+            segments.append(TimeSegment(position, position + length, original_start))
+            position += length
+        if not segments:
+            return cls()
+        last = segments[-1]
+        # Timestamps slightly past the end (encoder padding) keep the last offset.
+        segments[-1] = TimeSegment(last.start, math.inf, last.original_start, last.rate)
+        return cls(segments)
+
+    @property
+    def is_identity(self) -> bool:
+        return self.segments == (TimeSegment(0.0, math.inf, 0.0),)
+
+    def to_original(self, t: float) -> float:
+        index = max(0, bisect.bisect_right(self._starts, t) - 1)
+        return self.segments[index].to_original(t)
+
+    def map_range(self, start: float, end: float) -> Tuple[float, float]:
+        return self.to_original(start), self.to_original(end)
+
+    def then(self, later: "TimeMap") -> "TimeMap":
+        """Compose with the map of a stage applied after this one.
+
+        ``later`` maps its output to this stage's output; the result maps the
+        final output straight to the original timeline.
+        """
+        if self.is_identity:
+            return later
+        if later.is_identity:
+            return self
+        composed: List[TimeSegment] = []
+        for outer in later.segments:
+            t = outer.start
+            while t < outer.end:
+                middle = outer.to_original(t)
+                inner = self.segments[max(0, bisect.bisect_right(self._starts, middle) - 1)]
+                # processed time at which ``inner`` (on the middle timeline) ends
+                if math.isinf(inner.end):
+                    piece_end = outer.end
+                else:
+                    piece_end = min(outer.end, outer.start + (inner.end - outer.original_start) / outer.rate)
+                if piece_end <= t:  # guard against float rounding at boundaries
+                    piece_end = outer.end if math.isinf(inner.end) else math.nextafter(t, math.inf)
+                composed.append(TimeSegment(t, piece_end, inner.to_original(middle), inner.rate * outer.rate))
+                t = piece_end
+        return TimeMap(composed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segments": [
+                [s.start, None if math.isinf(s.end) else s.end, s.original_start, s.rate]
+                for s in self.segments
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimeMap":
+        return cls(
+            [
+                TimeSegment(start, math.inf if end is None else end, original_start, rate)
+                for start, end, original_start, rate in data["segments"]
+            ]
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimeMap):
+            return NotImplemented
+        return self.segments == other.segments
+
+    def __repr__(self) -> str:
+        return f"TimeMap({list(self.segments)!r})"
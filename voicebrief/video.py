@@ -8,6 +8,8 @@ Voicebrief - Converts video / audio conversations to text and subsequently provi
 from pathlib import Path
 import logging
 
+from voicebrief.profiling import span
+
 
 def video_to_audio(video_path: Path, audio_path: Path | None = None) -> Path:
 
@@ -36,22 +38,26 @@ def video_to_audio(video_path: Path, audio_path: Path | None = None) -> Path:
 
     log = logging.getLogger("voicebrief.video")
     log.debug("Loading video: %s", video_path)
-    video_clip = VideoFileClip(str(video_path))
+    with span("moviepy.load", "media", path=str(video_path)):
+        video_clip = VideoFileClip(str(video_path))
     audio_clip = video_clip.audio
     if audio_clip is None:
         raise RuntimeError(
             f"No audio track detected in video: {video_path}. Try providing an input with audio."
         )
     log.debug("Writing extracted WAV to: %s", audio_path)
-    audio_clip.write_audiofile(str(audio_path))
+    with span("moviepy.write_audiofile", "io", path=str(audio_path)):
+        audio_clip.write_audiofile(str(audio_path))
 
     # Load your audio file
     log.debug("Converting WAV to MP3")
-    audio = AudioSegment.from_file(str(audio_path))
+    with span("pydub.load", "media", path=str(audio_path)):
+        audio = AudioSegment.from_file(str(audio_path))
 
     # Export as MP3
     mp3_path = Path(audio_path).with_suffix(".mp3")
-    audio.export(str(mp3_path), format="mp3", bitrate="128k")
+    with span("pydub.export", "io", path=str(mp3_path)):
+        audio.export(str(mp3_path), format="mp3", bitrate="128k")
     log.debug("MP3 written to: %s", mp3_path)
 
     return mp3_path
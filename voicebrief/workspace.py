@@ -0,0 +1,170 @@
+"""Scratch workspace for intermediate files (extracted audio, chunks).
+
+Each run gets its own directory below a configurable root, so intermediates
+can live on fast local storage (tmpfs, local SSD) instead of next to the
+source on a network share. The workspace enforces a per-run and a global
+disk budget and is removed when the run ends, unless it failed and
+``keep_on_failure`` is set.
+
+==========================================  ==================================
+Variable                                    Meaning
+==========================================  ==================================
+``VOICEBRIEF_SCRATCH_DIR``                  Root directory (default: system temp dir)
+``VOICEBRIEF_SCRATCH_RUN_BUDGET_MB``        Maximum size of one run's workspace
+``VOICEBRIEF_SCRATCH_BUDGET_MB``            Maximum size of everything under the root
+``VOICEBRIEF_KEEP_SCRATCH_ON_FAILURE``      Keep the workspace of failed runs (``1``/``true``)
+==========================================  ==================================
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from voicebrief.cancel import ProcessingCancelled
+
+_MB = 1024 * 1024
+
+
+class ScratchBudgetExceeded(RuntimeError):
+    """Raised when a run would exceed its per-run or the global scratch budget."""
+
+
+@dataclass(frozen=True)
+class WorkspaceConfig:
+    """Location, budgets and retention policy for scratch workspaces."""
+
+    root: Path
+    run_budget_bytes: Optional[int] = None
+    global_budget_bytes: Optional[int] = None
+    keep_on_failure: bool = False
+
+
+def default_scratch_root() -> Path:
+    return Path(tempfile.gettempdir()) / "voicebrief"
+
+
+def workspace_config() -> WorkspaceConfig:
+    """Workspace settings from the environment (see module docstring)."""
+    root = os.environ.get("VOICEBRIEF_SCRATCH_DIR")
+    return WorkspaceConfig(
+        root=Path(root).expanduser() if root else default_scratch_root(),
+        run_budget_bytes=_budget_from_env("VOICEBRIEF_SCRATCH_RUN_BUDGET_MB"),
+        global_budget_bytes=_budget_from_env("VOICEBRIEF_SCRATCH_BUDGET_MB"),
+        keep_on_failure=os.environ.get("VOICEBRIEF_KEEP_SCRATCH_ON_FAILURE", "").strip().lower()
+        in ("1", "true", "yes", "on"),
+    )
+
+
+def _budget_from_env(name: str) -> Optional[int]:
+    text = os.environ.get(name, "").strip()
+    if not text:
+        return None
+    try:
+        megabytes = float(text)
+    except ValueError:
+        raise ValueError(f"{name} must be a number of megabytes, got {text!r}")
+    if megabytes <= 0:
+        raise ValueError(f"{name} must be positive, got {text!r}")
+    return int(megabytes * _MB)
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of the regular files below ``path``."""
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except FileNotFoundError:  # removed concurrently
+                continue
+    return total
+
+
+class Workspace:
+    """Per-run scratch directory with disk budgets.
+
+    Call :meth:`reserve` with an estimate before writing large files; it
+    raises :class:`ScratchBudgetExceeded` instead of letting a stage fill
+    the disk. Reservations of concurrent workspaces in this process count
+    towards the global budget until they are released.
+    """
+
+    _reservations: Dict[int, int] = {}
+    _reservations_lock = threading.Lock()
+
+    def __init__(self, config: WorkspaceConfig, name: str = "run"):
+        self.config = config
+        config.root.mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix=f"{_safe_name(name)}-", dir=config.root))
+        self._log = logging.getLogger("voicebrief.workspace")
+        self._closed = False
+        self._log.debug("Created scratch workspace %s", self.path)
+
+    def usage(self) -> int:
+        return directory_size(self.path)
+
+    def reserve(self, nbytes: int, purpose: str = "intermediate files") -> None:
+        """Check that ``nbytes`` more fit in both budgets and hold them for this run."""
+        usage = self.usage()
+        run_budget = self.config.run_budget_bytes
+        if run_budget is not None and usage + nbytes > run_budget:
+            raise ScratchBudgetExceeded(
+                f"Scratch budget exceeded for {purpose}: needs {nbytes / _MB:.1f} MB, "
+                f"run uses {usage / _MB:.1f} of {run_budget / _MB:.1f} MB ({self.path})"
+            )
+        with self._reservations_lock:
+            global_budget = self.config.global_budget_bytes
+            if global_budget is not None:
+                others = sum(v for k, v in self._reservations.items() if k != id(self))
+                total = directory_size(self.config.root) + others
+                if total + nbytes > global_budget:
+                    raise ScratchBudgetExceeded(
+                        f"Global scratch budget exceeded for {purpose}: needs {nbytes / _MB:.1f} MB, "
+                        f"{total / _MB:.1f} of {global_budget / _MB:.1f} MB in use under {self.config.root}"
+                    )
+            self._reservations[id(self)] = nbytes
+
+    def check(self) -> None:
+        """Raise if what was actually written exceeds the per-run budget."""
+        self._release()
+        run_budget = self.config.run_budget_bytes
+        usage = self.usage()
+        if run_budget is not None and usage > run_budget:
+            raise ScratchBudgetExceeded(
+                f"Scratch workspace {self.path} uses {usage / _MB:.1f} MB, "
+                f"above the run budget of {run_budget / _MB:.1f} MB"
+            )
+
+    def close(self, success: bool = True) -> None:
+        """Remove the workspace; failed runs keep it when ``keep_on_failure`` is set."""
+        if self._closed:
+            return
+        self._closed = True
+        self._release()
+        if not success and self.config.keep_on_failure:
+            self._log.warning("Keeping scratch workspace of failed run for inspection: %s", self.path)
+            return
+        self._log.debug("Removing scratch workspace %s (%d bytes)", self.path, self.usage())
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _release(self) -> None:
+        with self._reservations_lock:
+            self._reservations.pop(id(self), None)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # A cancelled run is not a failure worth inspecting.
+        self.close(success=exc_type is None or issubclass(exc_type, ProcessingCancelled))
+
+
+def _safe_name(name: str) -> str:
+    cleaned = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return cleaned[:40] or "run"